@@ -0,0 +1,92 @@
+import hashlib
+import logging
+from typing import Dict, Optional, Tuple
+
+from django.core.cache import caches
+from django.core.files.base import File
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'analysis'
+KEY_PREFIX = 'resume-analysis'
+
+
+def hash_upload(uploaded_file) -> str:
+    """sha256 of an uploaded file, read chunk by chunk; the file is rewound afterwards"""
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+class _HashingFile(File):
+    """An upload whose chunks feed a sha256 digest as storage reads them"""
+
+    def __init__(self, uploaded_file):
+        super().__init__(uploaded_file, uploaded_file.name)
+        self.digest = hashlib.sha256()
+        self.hashed_bytes = 0
+
+    def chunks(self, chunk_size=None):
+        for chunk in self.file.chunks(chunk_size):
+            self.digest.update(chunk)
+            self.hashed_bytes += len(chunk)
+            yield chunk
+
+
+def save_upload(field, uploaded_file) -> Tuple[str, str]:
+    """
+    Write ``uploaded_file`` to ``field``'s storage under its ``upload_to``
+    and return ``(stored name, sha256)``. The bytes are hashed as they are
+    written, so the upload is read once; it is rewound afterwards.
+    """
+    content = _HashingFile(uploaded_file)
+    name = field.storage.save(field.generate_filename(None, uploaded_file.name), content,
+                              max_length=field.max_length)
+    uploaded_file.seek(0)
+    if content.hashed_bytes != uploaded_file.size:
+        # A storage backend that reads the file rather than its chunks
+        return name, hash_upload(uploaded_file)
+    return name, content.digest.hexdigest()
+
+
+def normalize_job_description(job_description: Optional[str]) -> str:
+    """Case and whitespace differences do not change the analysis, so they share a key"""
+    return ' '.join((job_description or '').lower().split())
+
+
+def job_description_hash(job_description: Optional[str]) -> str:
+    return hashlib.sha256(normalize_job_description(job_description).encode()).hexdigest()
+
+
+def analysis_cache_key(model_version: str, content_hash: str, job_description: Optional[str]) -> str:
+    """
+    Cache key for one completed analysis. The model version is part of the
+    key, so installing new artifacts invalidates every entry at once.
+    """
+    return f"{KEY_PREFIX}:{model_version}:{content_hash}:{job_description_hash(job_description)}"
+
+
+def get_analysis_cache():
+    """The bounded 'analysis' cache alias, or the default cache if it is not configured"""
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def get_cached_analysis(key: str) -> Optional[Dict]:
+    try:
+        return get_analysis_cache().get(key)
+    except Exception:
+        logger.exception("Analysis cache lookup failed")
+        return None
+
+
+def store_cached_analysis(key: str, fields: Dict):
+    try:
+        get_analysis_cache().set(key, fields)
+    except Exception:
+        logger.exception("Analysis cache write failed")
@@ -0,0 +1,77 @@
+import re
+from collections import Counter
+from functools import cached_property
+from typing import List, Set, Union
+
+from .section_segmenter import SectionIndex, segment_sections
+
+_URL_RE = re.compile(r'http\S+\s')
+_HANDLE_RE = re.compile(r'@\S+')
+_HASHTAG_RE = re.compile(r'#\S+\s')
+_WHITESPACE_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\b\w+\b')
+_ALPHA_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+
+def clean_text(text: str) -> str:
+    text = _URL_RE.sub(' ', text)
+    text = _HANDLE_RE.sub(' ', text)
+    text = _HASHTAG_RE.sub(' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
+    return text.lower().strip()
+
+
+class AnalysisContext:
+    """
+    Per-document view shared by every analysis stage.
+
+    Each derived form of the text (cleaned, lowercased, token lists, sets,
+    counts, section index) is computed on first access and reused, so one
+    ``analyze_resume_complete`` call does each O(n) pass at most once.
+    """
+
+    def __init__(self, text: str):
+        self.text = text or ''
+
+    @classmethod
+    def of(cls, value: Union[str, 'AnalysisContext', None]) -> 'AnalysisContext':
+        if isinstance(value, AnalysisContext):
+            return value
+        return cls(value or '')
+
+    def __bool__(self) -> bool:
+        return bool(self.text)
+
+    @cached_property
+    def cleaned(self) -> str:
+        return clean_text(self.text)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def word_tokens(self) -> List[str]:
+        """``\\b\\w+\\b`` tokens of the cleaned (lowercase) text"""
+        return _WORD_RE.findall(self.cleaned)
+
+    @cached_property
+    def word_set(self) -> Set[str]:
+        return set(self.word_tokens)
+
+    @cached_property
+    def alpha_tokens(self) -> List[str]:
+        """Alphabetic tokens of three or more letters from the lowercased text"""
+        return _ALPHA_WORD_RE.findall(self.lower)
+
+    @cached_property
+    def alpha_set(self) -> Set[str]:
+        return set(self.alpha_tokens)
+
+    @cached_property
+    def alpha_counts(self) -> Counter:
+        return Counter(self.alpha_tokens)
+
+    @cached_property
+    def sections(self) -> SectionIndex:
+        return segment_sections(self.text)
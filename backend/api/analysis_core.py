@@ -1,19 +1,21 @@
-import os
 import json
-import tempfile
 from django.http import JsonResponse
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
-from .models import ResumeAnalysis
+from .models import AnalysisJob, ResumeAnalysis
 from .serializers import ResumeAnalysisSerializer
-from .dummy import JobMatchingSystem
+from .model_registry import get_model_registry
+from .analysis_cache import analysis_cache_key, get_cached_analysis, hash_upload, save_upload, store_cached_analysis
+from .analysis_context import AnalysisContext
+from .spans import record_spans, span
+from .extraction_cache import extract_resume_text_cached
+from .text_extraction import ExtractedText, sniff_mime
 import re
-import textstat
-from nltk.corpus import stopwords
-from collections import Counter
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+# Percent complete reported once the model's own stages finish
+MODEL_STAGE_PROGRESS = {'parsed': 50, 'roles_predicted': 65}
 
 
 class ResumeAnalysisView(APIView):
@@ -26,88 +28,232 @@ class ResumeAnalysisView(APIView):
         
         if not resume_file:
             return JsonResponse({'error': 'No resume file provided'}, status=400)
+        # Decided by content, not by the file name
+        mime = sniff_mime(resume_file)
+        if mime is None:
+            return JsonResponse({'error': 'Unsupported file type'}, status=400)
         
-        # Save file to temporary location
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            for chunk in resume_file.chunks():
-                tmp_file.write(chunk)
-            tmp_path = tmp_file.name
-        
+        file_field = ResumeAnalysis._meta.get_field('resume_file')
+        stored_name = None
+        resume_analysis = None
         try:
-            resume_text = ""
-            if resume_file.name.endswith('.pdf'):
-                import PyPDF2
-                pdf_reader = PyPDF2.PdfReader(tmp_path)
-                for page in pdf_reader.pages:
-                    resume_text += page.extract_text() or ''
-            elif resume_file.name.endswith('.docx'):
-                import docx
-                doc = docx.Document(tmp_path)
-                resume_text = "\n".join([para.text for para in doc.paragraphs])
-            elif resume_file.name.endswith('.txt'):
-                with open(tmp_path, 'r', encoding='utf-8') as f:
-                    resume_text = f.read()
-            else:
-                os.unlink(tmp_path)
-                return JsonResponse({'error': 'Unsupported file type'}, status=400)
-            
-            if not resume_text.strip():
-                os.unlink(tmp_path)
-                return JsonResponse({'error': 'Could not extract text from resume'}, status=400)
-            
-            # Perform enhanced analysis
-            jms_system = JobMatchingSystem()
-            analysis_results = jms_system.analyze_resume_complete(
-                resume_text,
-                job_description=job_description if job_description.strip() else None
-            )
-            
-            # Calculate enhanced ATS score
-            parsed_info = analysis_results.get('parsed_resume', {})
-            ats_result = calculate_enhanced_ats_score(parsed_info, job_description, resume_text)
-            
-            # Prepare additional data for storage
-            keywords_analysis = analysis_results.get('keywords_analysis', {})
-            detailed_role_analysis = analysis_results.get('detailed_role_analysis', [])
-            optimization_tips = analysis_results.get('optimization_tips', [])
+            if request.data.get('async') in TRUE_VALUES or request.query_params.get('async') in TRUE_VALUES:
+                # Job mode: store the upload, queue it for the analysis workers, return at once
+                from .analysis_jobs import analysis_job_data, enqueue_analysis
+                stored_name, content_hash = save_upload(file_field, resume_file)
+                job = enqueue_analysis(request.user, stored_name, content_hash, mime, job_description)
+                # The job now references the upload
+                stored_name = None
+                return JsonResponse(analysis_job_data(job), status=202)
             
-            # Save results to database
-            resume_analysis = ResumeAnalysis.objects.create(
-                user=request.user,
-                resume_file=resume_file,
-                job_description=job_description if job_description.strip() else None,
-                parsed_data=parsed_info,
-                analysis_results=analysis_results,
-                ats_score=ats_result['score'],
-                matched_keywords=keywords_analysis.get('present_keywords', []),
-                missing_keywords=keywords_analysis.get('missing_keywords', []),
-                recommendations=optimization_tips,
-                education=json.dumps(parsed_info.get('education', []))
-            )
-            
-            os.unlink(tmp_path)
-            
-            # Prepare enhanced response
-            response_data = ResumeAnalysisSerializer(resume_analysis).data
-            response_data.update({
-                'ats_breakdown': ats_result.get('breakdown', {}),
-                'keywords_analysis': keywords_analysis,
-                'detailed_role_analysis': detailed_role_analysis,
-                'optimization_tips': optimization_tips,
-                'similarity_scores': analysis_results.get('similarity_scores', {}),
-                'role_predictions': analysis_results.get('role_predictions', {}),
-                'analysis_summary': analysis_results.get('analysis_summary', '')
-            })
-            
-            return JsonResponse(response_data, status=201)
+            with record_spans() as spans:
+                with span('upload_store'):
+                    # Written to storage once, hashed on the way; extraction
+                    # then reads the upload buffer itself
+                    stored_name, content_hash = save_upload(file_field, resume_file)
+                resume_analysis, cached = run_resume_analysis(
+                    request.user, resume_file, stored_name, content_hash, job_description, mime=mime
+                )
+            record_timings(resume_analysis, spans)
+            return JsonResponse(analysis_response_data(resume_analysis, cached), status=201)
             
+        except UnreadableResume as e:
+            return JsonResponse({'error': str(e)}, status=400)
         except Exception as e:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
             return JsonResponse({'error': str(e)}, status=500)
+        finally:
+            if stored_name and resume_analysis is None:
+                # No analysis row references the stored upload
+                file_field.storage.delete(stored_name)
+
+
+class UnreadableResume(ValueError):
+    """No text could be extracted from an upload"""
+
+
+def run_resume_analysis(user, source, stored_name, content_hash, job_description, mime=None, progress=None):
+    """
+    Analyse an upload already saved as ``stored_name``, reading its text from
+    ``source`` (the upload buffer or the stored file), and create its
+    ResumeAnalysis row. Returns ``(row, served from the analysis cache)``.
+    
+    Stages are timed on the caller's ``record_spans()``; ``progress(stage,
+    percent, partial)`` is called as the work advances, with the partial
+    result of each completed stage (``extracted``, ``parsed``,
+    ``roles_predicted``, ``ats_scored``) or None. Raises UnreadableResume
+    when the file cannot be parsed or yields no text.
+    """
+    report = progress or (lambda stage, percent, partial=None: None)
+    job_description = job_description or ''
+    
+    # Identical bytes + job description + model version => identical analysis
+    registry = get_model_registry()
+    with span('model_load'):
+        jms_system = registry.get_system()
+    with span('cache_lookup'):
+        cache_key = analysis_cache_key(registry.model_version, content_hash, job_description)
+        fields = get_cached_analysis(cache_key)
+    cached = fields is not None
+    
+    if not cached:
+        report('text_extraction', 10)
+        with span('text_extraction'):
+            extracted = extract_upload_text(source, content_hash, mime=mime)
+        report('extracted', 25, extracted.summary())
+        report('analysis', 30)
+        fields = analyze_resume_text(jms_system, extracted.text, job_description, user=user, progress=report)
+        # Stored with the results so cache hits report it too
+        fields['analysis_results']['text_extraction'] = extracted.summary()
+        if cacheable_analysis(fields):
+            store_cached_analysis(cache_key, fields)
+    
+    # Save results to database
+    report('saving', 90)
+    with span('db_write'):
+        resume_analysis = ResumeAnalysis.objects.create(
+            user=user,
+            resume_file=stored_name,
+            job_description=job_description if job_description.strip() else None,
+            model_version=registry.model_version,
+            content_hash=content_hash,
+            **fields
+        )
+    return resume_analysis, cached
+
+
+def cacheable_analysis(fields) -> bool:
+    """Whether an analysis is this file's complete result, fit to serve any user from the cache"""
+    # Role predictions borrowed from the user's near-duplicate are not this
+    # file's own, and the cache key has no user in it
+    if 'role_predictions' in fields['analysis_results'].get('reused_stages', []):
+        return False
+    # A parse cut short by the extraction time budget would be served until the entry expires
+    return not fields['parsed_data'].get('extraction_warnings')
 
 
-def calculate_enhanced_ats_score(parsed_info, job_description, resume_text):
+def record_timings(resume_analysis, spans):
+    """Timings of this unit of work (a cache hit records only the stages it ran)"""
+    resume_analysis.processing_time = round(spans.elapsed, 4)
+    resume_analysis.stage_timings = spans.as_ms()
+    resume_analysis.save(update_fields=['processing_time', 'stage_timings'])
+
+
+def analysis_response_data(resume_analysis, cached):
+    """The analyze endpoint's response body for a saved analysis"""
+    analysis_results = resume_analysis.analysis_results or {}
+    response_data = ResumeAnalysisSerializer(resume_analysis).data
+    response_data.update({
+        'ats_breakdown': resume_analysis.ats_breakdown,
+        'keywords_analysis': analysis_results.get('keywords_analysis', {}),
+        'detailed_role_analysis': analysis_results.get('detailed_role_analysis', []),
+        'optimization_tips': resume_analysis.recommendations,
+        'similarity_scores': analysis_results.get('similarity_scores', {}),
+        'role_predictions': analysis_results.get('role_predictions', {}),
+        'analysis_summary': analysis_results.get('analysis_summary', ''),
+        'text_extraction': analysis_results.get('text_extraction', {}),
+        'cached': cached
+    })
+    return response_data
+
+
+def analyze_resume_text(jms_system, resume_text, job_description, user=None, progress=None):
+    """
+    Run the full analysis and ATS scoring for one resume. Returns the
+    ResumeAnalysis field values, which are also what the analysis cache stores.
+    ``progress`` is called as in ``run_resume_analysis``.
+    
+    For a ``user`` with earlier analyses under the same model version, role
+    predictions of a near-identical resume and the parsed values of unchanged
+    sections are reused rather than recomputed.
+    """
+    # The vector and similarity stacks load on the first analysis, not at URLConf import
+    from .candidate_search import resume_vector_fields
+    from .near_duplicate import reusable_results, signature_fields, simhash
+    
+    report = progress or (lambda stage, percent, partial=None: None)
+    resume_ctx = AnalysisContext(resume_text)
+    with span('reuse_lookup'):
+        signature = simhash(resume_ctx)
+        fingerprints = jms_system.section_fingerprints(resume_ctx)
+        reuse = {}
+        if user is not None:
+            reuse = reusable_results(user, signature, fingerprints, jms_system.model_version)
+    
+    analysis_results = jms_system.analyze_resume_complete(
+        resume_ctx,
+        job_description=job_description if job_description.strip() else None,
+        reuse=reuse,
+        on_stage=lambda stage, partial: report(stage, MODEL_STAGE_PROGRESS[stage], partial),
+    )
+    if reuse:
+        # Recorded without the source analysis id: cached results are shared across users
+        analysis_results['reused_stages'] = sorted(
+            [key for key in reuse if key != 'parsed_fields']
+            + [f"parsed:{field}" for field in reuse.get('parsed_fields', {})]
+        )
+    
+    # Calculate enhanced ATS score
+    parsed_info = analysis_results.get('parsed_resume', {})
+    with span('ats_scoring'):
+        ats_result = calculate_enhanced_ats_score(
+            parsed_info, job_description, resume_text,
+            similarity=analysis_results.get('similarity_scores', {}).get('tfidf_similarity')
+        )
+    report('ats_scored', 80, {'ats_score': ats_result['score'], 'ats_breakdown': ats_result.get('breakdown', {})})
+    with span('vectorize'):
+        vector_fields = resume_vector_fields(jms_system, resume_ctx)
+    
+    keywords_analysis = analysis_results.get('keywords_analysis', {})
+    return {
+        'parsed_data': parsed_info,
+        'analysis_results': analysis_results,
+        'ats_score': ats_result['score'],
+        'ats_breakdown': ats_result.get('breakdown', {}),
+        'matched_keywords': keywords_analysis.get('present_keywords', []),
+        'missing_keywords': keywords_analysis.get('missing_keywords', []),
+        'recommendations': analysis_results.get('optimization_tips', []),
+        'education': json.dumps(parsed_info.get('education', [])),
+        **vector_fields,
+        'section_fingerprints': fingerprints,
+        **signature_fields(signature),
+    }
+
+
+def extract_upload_text(source, content_hash, mime=None) -> ExtractedText:
+    """
+    Text of an uploaded resume through the extraction cache, within the
+    RESUME_MAX_PAGES / RESUME_MAX_CHARS budget. Raises ValueError for
+    unsupported content and UnreadableResume when the file cannot be parsed
+    (a corrupt PDF or DOCX) or yields no text.
+    """
+    if mime is None:
+        mime = sniff_mime(source)
+    if mime is None:
+        raise ValueError('Unsupported file type')
+    try:
+        extracted = extract_resume_text_cached(source, content_hash, mime=mime)
+    except Exception as e:
+        raise UnreadableResume(f'Could not read resume: {e}') from e
+    if not extracted.text.strip():
+        raise UnreadableResume('Could not extract text from resume')
+    return extracted
+
+
+def read_uploaded_resume(resume_file):
+    """
+    Plain text of an uploaded PDF, DOCX or TXT resume (see extract_upload_text).
+    Raises ValueError for unsupported file types and UnreadableResume for
+    unreadable ones.
+    """
+    return extract_upload_text(resume_file, hash_upload(resume_file)).text
+
+
+def calculate_enhanced_ats_score(parsed_info, job_description, resume_text, similarity=None):
+    """
+    Score a parsed resume out of 100. ``similarity`` is the 0-100 TF-IDF
+    similarity already computed by the analysis; it is derived from the
+    shared corpus-fitted vectorizer when not supplied.
+    """
     score = 0
     breakdown = {}
     recommendations = []
@@ -234,10 +380,9 @@ def calculate_enhanced_ats_score(parsed_info, job_description, resume_text):
     jd_matching_score = 0
     if job_description:
         try:
-            vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-            tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            jd_matching_score = min(similarity * 10, 10)
+            if similarity is None:
+                similarity = get_model_registry().get_system()._tfidf_similarity(resume_text, job_description)
+            jd_matching_score = min(similarity / 10, 10)
             
             if jd_matching_score < 5:
                 recommendations.append("Tailor your resume more closely to the job requirements")
@@ -267,6 +412,19 @@ def calculate_enhanced_ats_score(parsed_info, job_description, resume_text):
     }
 
 
+class AnalysisJobStatusView(APIView):
+    """Progress of a job-mode analysis, and the finished analysis once it succeeded"""
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, job_id):
+        from .analysis_jobs import analysis_job_data
+        
+        job = AnalysisJob.objects.filter(pk=job_id, user=request.user).select_related('analysis').first()
+        if job is None:
+            return JsonResponse({'error': 'Job not found'}, status=404)
+        return JsonResponse(analysis_job_data(job))
+
+
 class UserResumeAnalysesView(APIView):
     permission_classes = [IsAuthenticated]
     
@@ -0,0 +1,243 @@
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.db import close_old_connections
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+from .analysis_core import UnreadableResume, analysis_response_data, record_timings, run_resume_analysis
+from .models import AnalysisJob, AnalysisJobEvent, ResumeAnalysis
+from .spans import record_spans
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_JOB_TIMEOUT = 600
+DEFAULT_MAX_ATTEMPTS = 2
+DEFAULT_EVENTS_RETENTION = 60
+# Queued jobs a worker tries to claim per poll before concluding others got them
+CLAIM_CANDIDATES = 5
+# Workers look for abandoned jobs every this many polls
+STALE_SWEEP_POLLS = 30
+DEFAULT_STREAM_TOKEN_MAX_AGE = 600
+STREAM_TOKEN_SALT = 'api.analysis_job_events'
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_analysis(user, stored_name: str, content_hash: str, mime: Optional[str],
+                     job_description: str) -> AnalysisJob:
+    """Queue an upload already saved as ``stored_name`` for the analysis workers"""
+    return AnalysisJob.objects.create(
+        user=user,
+        resume_file=stored_name,
+        content_hash=content_hash,
+        mime=mime or '',
+        job_description=job_description if job_description and job_description.strip() else None,
+        stage='queued',
+    )
+
+
+def stream_token(job: AnalysisJob) -> str:
+    """
+    Signed token that opens the progress stream of this one job for its
+    owner. EventSource cannot send an Authorization header, so the stream
+    URL carries this instead of the account's access token.
+    """
+    return signing.dumps({'job': str(job.pk), 'user': job.user_id}, salt=STREAM_TOKEN_SALT, compress=True)
+
+
+def stream_token_user_id(token: str, job_id) -> Optional[int]:
+    """Owner id from a valid, unexpired stream token for ``job_id``; None otherwise"""
+    max_age = getattr(settings, 'ANALYSIS_STREAM_TOKEN_MAX_AGE', DEFAULT_STREAM_TOKEN_MAX_AGE)
+    try:
+        claims = signing.loads(token, salt=STREAM_TOKEN_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
+    return claims['user'] if claims.get('job') == str(job_id) else None
+
+
+def analysis_job_data(job: AnalysisJob) -> Dict:
+    """Status payload for a job; succeeded jobs include the analysis response under ``result``"""
+    data = {
+        'job_id': str(job.id),
+        'status': job.status,
+        'stage': job.stage,
+        'progress': job.progress,
+        'error': job.error or None,
+        'status_url': reverse('resume_analysis_job', args=[job.id]),
+        'events_url': f"{reverse('resume_analysis_job_events', args=[job.id])}?token={stream_token(job)}",
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if job.status == AnalysisJob.STATUS_QUEUED:
+        data['queue_position'] = AnalysisJob.objects.filter(
+            status=AnalysisJob.STATUS_QUEUED, created_at__lte=job.created_at
+        ).count()
+    if job.status == AnalysisJob.STATUS_SUCCEEDED and job.analysis is not None:
+        data['analysis_id'] = job.analysis_id
+        data['result'] = analysis_response_data(job.analysis, job.cached)
+    return data
+
+
+def claim_next_job(worker: str) -> Optional[AnalysisJob]:
+    """
+    Claim the oldest queued job for ``worker``. A claim is an UPDATE
+    conditional on the row still being queued, so two workers can never
+    both win a job on any database backend; the loser moves on to the
+    next candidate.
+    """
+    candidates = (AnalysisJob.objects.filter(status=AnalysisJob.STATUS_QUEUED)
+                  .order_by('created_at').values_list('pk', flat=True)[:CLAIM_CANDIDATES])
+    for job_id in list(candidates):
+        now = timezone.now()
+        claimed = AnalysisJob.objects.filter(pk=job_id, status=AnalysisJob.STATUS_QUEUED).update(
+            status=AnalysisJob.STATUS_RUNNING, worker=worker, stage='starting', progress=0,
+            attempts=F('attempts') + 1, started_at=now, updated_at=now,
+        )
+        if claimed:
+            # Progress of an abandoned earlier attempt no longer applies
+            AnalysisJobEvent.objects.filter(job_id=job_id).delete()
+            return AnalysisJob.objects.select_related('user').get(pk=job_id)
+    return None
+
+
+def _update_running(job: AnalysisJob, **changes) -> bool:
+    """Update ``job`` only while this worker still owns it (it may have been requeued as stale)"""
+    return bool(AnalysisJob.objects.filter(
+        pk=job.pk, status=AnalysisJob.STATUS_RUNNING, worker=job.worker
+    ).update(updated_at=timezone.now(), **changes))
+
+
+def report_progress(job: AnalysisJob, stage: str, percent: int, partial: Dict = None):
+    """Record a progress step, and the partial result it carries, for the job's progress stream"""
+    if _update_running(job, stage=stage, progress=percent):
+        AnalysisJobEvent.objects.create(job_id=job.pk, stage=stage, progress=percent, data=partial or {})
+
+
+def _release_upload(name: str):
+    """Delete a job's stored upload once no analysis row references it"""
+    if name and not ResumeAnalysis.objects.filter(resume_file=name).exists():
+        AnalysisJob._meta.get_field('resume_file').storage.delete(name)
+
+
+def fail_job(job: AnalysisJob, message: str):
+    if _update_running(job, status=AnalysisJob.STATUS_FAILED, stage='failed', error=message,
+                       finished_at=timezone.now(), resume_file=''):
+        _release_upload(job.resume_file.name)
+
+
+def requeue_job(job: AnalysisJob) -> bool:
+    """Hand a claimed job back to the queue without counting the attempt, e.g. when its worker is stopped"""
+    return _update_running(job, status=AnalysisJob.STATUS_QUEUED, stage='requeued', worker='', progress=0,
+                           attempts=F('attempts') - 1, started_at=None)
+
+
+def run_job(job: AnalysisJob):
+    """Run one claimed job through the same pipeline as the synchronous endpoint"""
+    storage = AnalysisJob._meta.get_field('resume_file').storage
+    try:
+        with record_spans() as spans, storage.open(job.resume_file.name, 'rb') as source:
+            resume_analysis, cached = run_resume_analysis(
+                job.user, source, job.resume_file.name, job.content_hash, job.job_description,
+                mime=job.mime or None,
+                progress=lambda stage, percent, partial=None: report_progress(job, stage, percent, partial),
+            )
+        record_timings(resume_analysis, spans)
+    except UnreadableResume as e:
+        fail_job(job, str(e))
+        return
+    except Exception as e:
+        logger.exception("Analysis job %s failed", job.pk)
+        fail_job(job, str(e))
+        return
+    except KeyboardInterrupt:
+        # The worker is stopping: another one picks the job up now, not after the stale timeout
+        requeue_job(job)
+        logger.warning("Requeued analysis job %s on interrupt", job.pk)
+        raise
+
+    if not _update_running(job, status=AnalysisJob.STATUS_SUCCEEDED, stage='done', progress=100,
+                           analysis=resume_analysis, cached=cached, finished_at=timezone.now()):
+        logger.warning("Analysis job %s finished after it was requeued; keeping analysis %s",
+                       job.pk, resume_analysis.pk)
+
+
+def requeue_stale_jobs(timeout: float = None, max_attempts: int = None) -> int:
+    """
+    Running jobs with no progress for ``timeout`` seconds belong to a worker
+    that died: queue them again, or fail them after ``max_attempts``.
+    Returns the number of jobs handled.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'ANALYSIS_JOB_TIMEOUT', DEFAULT_JOB_TIMEOUT)
+    if max_attempts is None:
+        max_attempts = getattr(settings, 'ANALYSIS_JOB_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+    stale = AnalysisJob.objects.filter(status=AnalysisJob.STATUS_RUNNING,
+                                       updated_at__lt=timezone.now() - timedelta(seconds=timeout))
+    requeued = stale.filter(attempts__lt=max_attempts).update(
+        status=AnalysisJob.STATUS_QUEUED, stage='requeued', worker='', updated_at=timezone.now()
+    )
+    failed = 0
+    for job in stale.filter(attempts__gte=max_attempts):
+        fail_job(job, 'The analysis worker stopped responding')
+        failed += 1
+    if requeued or failed:
+        logger.warning("Requeued %d and failed %d abandoned analysis jobs", requeued, failed)
+    return requeued + failed
+
+
+def prune_job_events(retention: float = None) -> int:
+    """
+    Delete the progress events of jobs finished more than ``retention``
+    seconds ago. Events hold partial resume data, and a finished job's
+    status carries its full result or error; the delay only lets open
+    progress streams read the last events. Returns the number deleted.
+    """
+    if retention is None:
+        retention = getattr(settings, 'ANALYSIS_EVENTS_RETENTION', DEFAULT_EVENTS_RETENTION)
+    deleted, _ = AnalysisJobEvent.objects.filter(
+        job__status__in=(AnalysisJob.STATUS_SUCCEEDED, AnalysisJob.STATUS_FAILED),
+        job__finished_at__lt=timezone.now() - timedelta(seconds=retention),
+    ).delete()
+    return deleted
+
+
+def run_worker(name: str = None, poll_interval: float = None, burst: bool = False) -> int:
+    """
+    Claim and run queued jobs until interrupted, sleeping ``poll_interval``
+    seconds while the queue is empty. With ``burst`` the worker exits once
+    the queue is empty instead. Returns the number of jobs run.
+    """
+    name = name or worker_name()
+    if poll_interval is None:
+        poll_interval = getattr(settings, 'ANALYSIS_JOB_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)
+    ran = 0
+    polls = 0
+    while True:
+        # What the request cycle does for views: drop connections that went away
+        close_old_connections()
+        if polls % STALE_SWEEP_POLLS == 0:
+            requeue_stale_jobs()
+            prune_job_events()
+        polls += 1
+
+        job = claim_next_job(name)
+        if job is None:
+            if burst:
+                return ran
+            time.sleep(poll_interval)
+            continue
+        logger.info("Worker %s running analysis job %s", name, job.pk)
+        run_job(job)
+        ran += 1
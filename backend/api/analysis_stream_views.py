@@ -0,0 +1,129 @@
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .analysis_jobs import analysis_job_data, stream_token_user_id
+from .models import AnalysisJob, AnalysisJobEvent
+
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_HEARTBEAT = 15.0
+DEFAULT_MAX_DURATION = 300.0
+# Reconnect delay suggested to EventSource clients, in milliseconds
+RETRY_MS = 1000
+FINISHED = (AnalysisJob.STATUS_SUCCEEDED, AnalysisJob.STATUS_FAILED)
+
+
+def sse_message(event: str, data: Dict, event_id: int = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def stream_user(request, job_id):
+    """
+    The user of the request: the JWT user from the Authorization header as
+    for the other endpoints, the owner named by a ``?token=`` stream token
+    for this job (``events_url`` of the job status; EventSource cannot set
+    headers), else the session user. None when unauthenticated.
+    """
+    authenticator = JWTAuthentication()
+    header = authenticator.get_header(request)
+    raw_token = authenticator.get_raw_token(header) if header else None
+    if raw_token:
+        try:
+            return authenticator.get_user(authenticator.get_validated_token(raw_token))
+        except AuthenticationFailed:
+            return None
+    if 'token' in request.GET:
+        user_id = stream_token_user_id(request.GET['token'], job_id)
+        return User.objects.filter(pk=user_id, is_active=True).first() if user_id is not None else None
+    return request.user if request.user.is_authenticated else None
+
+
+def _poll(job_id, after: int) -> Tuple[Optional[AnalysisJob], List[AnalysisJobEvent]]:
+    # The job is read before its events: once it reads as finished, every event is already stored
+    job = AnalysisJob.objects.filter(pk=job_id).select_related('analysis').first()
+    events = list(AnalysisJobEvent.objects.filter(job_id=job_id, id__gt=after).order_by('id'))
+    return job, events
+
+
+async def job_event_stream(job: AnalysisJob, last_event_id: int = 0):
+    """
+    Server-sent events for one job: a ``status`` snapshot, then one event per
+    completed stage (``extracted``, ``parsed``, ``roles_predicted``,
+    ``ats_scored``, ...) with its partial result under ``result``, and
+    finally ``done`` with the full analysis or ``failed``. Only events after
+    ``last_event_id`` are sent, so a reconnecting client resumes where it
+    left off.
+    """
+    poll_interval = getattr(settings, 'ANALYSIS_EVENTS_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)
+    heartbeat = getattr(settings, 'ANALYSIS_EVENTS_HEARTBEAT', DEFAULT_HEARTBEAT)
+    deadline = time.monotonic() + getattr(settings, 'ANALYSIS_EVENTS_MAX_DURATION', DEFAULT_MAX_DURATION)
+
+    yield f"retry: {RETRY_MS}\n\n"
+    if job.status not in FINISHED:
+        yield sse_message('status', await sync_to_async(analysis_job_data)(job))
+    last_sent = time.monotonic()
+    while True:
+        job, events = await sync_to_async(_poll)(job.pk, last_event_id)
+        for event in events:
+            data = {'stage': event.stage, 'progress': event.progress, 'result': event.data}
+            yield sse_message(event.stage, data, event.id)
+            last_event_id = event.id
+        if events:
+            last_sent = time.monotonic()
+
+        if job is None:
+            yield sse_message('failed', {'error': 'Job not found'})
+            return
+        if job.status in FINISHED:
+            final = 'done' if job.status == AnalysisJob.STATUS_SUCCEEDED else 'failed'
+            yield sse_message(final, await sync_to_async(analysis_job_data)(job))
+            return
+        if time.monotonic() >= deadline:
+            # The client reconnects with Last-Event-ID and picks up from here
+            return
+        if time.monotonic() - last_sent >= heartbeat:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+        await asyncio.sleep(poll_interval)
+
+
+@require_GET
+async def analysis_job_events(request, job_id):
+    """
+    Progress of a job-mode analysis as a ``text/event-stream``, so clients get
+    each stage's result (the ATS score well before the analysis is saved)
+    without polling the status endpoint. Runs as an async view: serve the
+    project through backend/asgi.py so a stream does not hold a worker thread.
+    """
+    user = await sync_to_async(stream_user)(request, job_id)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided'}, status=401)
+    job = await AnalysisJob.objects.filter(pk=job_id, user=user).select_related('analysis').afirst()
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or '0'
+    try:
+        last_event_id = int(last_event_id)
+    except ValueError:
+        last_event_id = 0
+
+    response = StreamingHttpResponse(job_event_stream(job, last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keeps nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
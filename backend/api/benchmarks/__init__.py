@@ -0,0 +1,6 @@
+from .compare import compare_reports
+from .corpus import SyntheticResumeCorpus, write_corpus
+from .runner import TARGETS, BenchmarkRunner, benchmark_report
+
+__all__ = ['SyntheticResumeCorpus', 'write_corpus', 'BenchmarkRunner', 'benchmark_report',
+           'compare_reports', 'TARGETS']
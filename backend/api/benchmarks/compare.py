@@ -0,0 +1,50 @@
+from typing import Dict, List, NamedTuple
+
+COMPARED_STATS = ('p50', 'p95')
+DEFAULT_THRESHOLD = 0.15
+# Differences under this many milliseconds are timer noise, whatever the ratio
+MIN_DELTA_MS = 0.5
+
+
+class Regression(NamedTuple):
+    target: str
+    stat: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def change(self) -> float:
+        return (self.current_ms - self.baseline_ms) / self.baseline_ms if self.baseline_ms else float('inf')
+
+    def __str__(self):
+        return (f"{self.target} {self.stat}: {self.baseline_ms:.3f} ms -> {self.current_ms:.3f} ms "
+                f"({self.change:+.1%})")
+
+
+def compare_reports(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> Dict:
+    """
+    Compare two ``benchmark_report`` dicts target by target.
+
+    A target regresses when its p50 or p95 grew by more than ``threshold``
+    (a fraction, 0.15 = 15%). Targets present in only one report are listed
+    but never counted as regressions.
+    """
+    base_results, current_results = baseline.get('results', {}), current.get('results', {})
+    regressions: List[Regression] = []
+    rows = []
+    for target in sorted(set(base_results) & set(current_results)):
+        before, after = base_results[target], current_results[target]
+        row = {'target': target, 'stats': {}}
+        for stat in COMPARED_STATS:
+            if stat not in before or stat not in after:
+                continue
+            row['stats'][stat] = (before[stat], after[stat])
+            if after[stat] - before[stat] > MIN_DELTA_MS and after[stat] > before[stat] * (1 + threshold):
+                regressions.append(Regression(target, stat, before[stat], after[stat]))
+        rows.append(row)
+    return {
+        'rows': rows,
+        'regressions': regressions,
+        'missing': sorted(set(base_results) - set(current_results)),
+        'new': sorted(set(current_results) - set(base_results)),
+    }
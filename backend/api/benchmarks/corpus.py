@@ -0,0 +1,230 @@
+import random
+from typing import Dict, Iterator, List, NamedTuple, Sequence
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Rahul', 'Sneha', 'Omkar', 'Ananya', 'Kiran', 'Harish', 'Maria', 'James',
+               'Chen', 'Fatima', 'Lucas', 'Aisha', 'Noah', 'Elena', 'Vikram', 'Meera', 'Daniel', 'Sofia']
+LAST_NAMES = ['Sharma', 'Jadhav', 'Kangule', 'Patel', 'Iyer', 'Garcia', 'Smith', 'Wang', 'Khan', 'Rossi',
+              'Deshmukh', 'Nair', 'Kumar', 'Brown', 'Silva', 'Fernandes', 'Mehta', 'Lee', 'Novak', 'Singh']
+CITIES = [('Pune', 'Maharashtra'), ('Bengaluru', 'Karnataka'), ('Hyderabad', 'Telangana'), ('Mumbai', 'Maharashtra'),
+          ('Chennai', 'Tamil Nadu'), ('Austin', 'Texas'), ('Seattle', 'Washington'), ('Berlin', 'Berlin')]
+ROLES = ['Software Engineer', 'Backend Developer', 'Frontend Developer', 'Data Analyst', 'Machine Learning Engineer',
+         'DevOps Engineer', 'Full Stack Developer', 'Data Scientist', 'Business Analyst', 'Product Manager']
+SENIORITY = ['', 'Junior ', 'Senior ', 'Lead ', 'Associate ']
+COMPANIES = ['Acme Technologies', 'Globex Solutions', 'Initech Inc', 'Umbrella Corp', 'Stark Technologies',
+             'Wayne Solutions', 'Hooli Inc', 'Vandelay Ltd', 'Soylent Corp', 'Cyberdyne Technologies']
+DEGREES = ['B.Tech in Computer Science', 'Bachelor of Engineering in Information Technology',
+           'M.Tech in Data Science', 'Master of Computer Applications', 'Bachelor of Science in Statistics']
+INSTITUTIONS = ['Pune University', 'College of Engineering Pune', 'Indian Institute of Technology Bombay',
+                'Vellore Institute of Technology', 'State University of New York', 'Technical University of Munich']
+SKILLS = ['Python', 'Java', 'JavaScript', 'C++', 'SQL', 'React', 'Angular', 'Node.js', 'Django', 'Flask',
+          'Pandas', 'NumPy', 'Scikit-learn', 'TensorFlow', 'PyTorch', 'PostgreSQL', 'MongoDB', 'Redis',
+          'AWS', 'Azure', 'Docker', 'Kubernetes', 'Terraform', 'Jenkins', 'Git', 'JIRA', 'Tableau',
+          'Power BI', 'Excel', 'Figma', 'Machine Learning', 'REST APIs', 'Microservices', 'Agile']
+VERBS = ['Built', 'Designed', 'Led', 'Implemented', 'Optimised', 'Migrated', 'Automated', 'Developed',
+         'Reduced', 'Scaled', 'Delivered', 'Introduced']
+OBJECTS = ['a payments API serving two million requests per day', 'the CI/CD pipeline for twelve services',
+           'a real-time analytics dashboard for operations', 'the data warehouse ingestion jobs',
+           'an internal design system used by five teams', 'the recommendation model training pipeline',
+           'query latency by 40% through indexing and caching', 'the monolith into containerised microservices',
+           'on-call runbooks and alerting for production systems', 'an A/B testing framework for the web app']
+PROJECT_NAMES = ['Ledger', 'TrailMap', 'SkillGraph', 'PulseBoard', 'DocuSense', 'ShopStream', 'MediTrack', 'CodeLens']
+LANGUAGES = ['English', 'Hindi', 'Marathi', 'Tamil', 'Spanish', 'French', 'German']
+HOBBIES = ['chess', 'hiking', 'photography', 'cycling', 'reading', 'cooking', 'open source']
+CERTIFICATIONS = ['AWS Certified Solutions Architect - Associate', 'Google Professional Data Engineer',
+                  'Certified Kubernetes Administrator (CKA)', 'Microsoft Certified: Azure Fundamentals']
+ACHIEVEMENTS = ['Winner of the national Smart India Hackathon 2022', 'Awarded employee of the quarter for platform reliability',
+                'Recognized for mentoring six interns through production launches', 'Won first prize in an inter-college coding competition']
+
+SECTIONS = ('summary', 'experience', 'education', 'projects', 'skills', 'certifications',
+            'achievements', 'languages', 'hobbies')
+FORMATS = ('txt', 'docx', 'pdf')
+
+
+class SyntheticResume(NamedTuple):
+    name: str
+    format: str
+    payload: bytes
+    text: str
+    data: Dict
+
+
+class SyntheticResumeCorpus:
+    """
+    Deterministic generator of realistic resumes for benchmarking.
+
+    ``size`` scales the amount of content (roles, bullets per role, projects);
+    ``sections`` restricts which optional sections may appear and
+    ``section_probability`` how often each one does. The same seed always
+    yields the same corpus so results are comparable across runs.
+
+    Resume dicts use the ``ResumeGenerator`` input format, so DOCX and PDF
+    renderings come from the same code path users download from.
+    """
+
+    def __init__(self, seed: int = 0, size: float = 1.0, sections: Sequence[str] = SECTIONS,
+                 section_probability: float = 0.85):
+        unknown = set(sections) - set(SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+        self.seed = seed
+        self.size = max(size, 0.1)
+        self.sections = tuple(sections)
+        self.section_probability = section_probability
+
+    def _scaled(self, rng: random.Random, low: int, high: int) -> int:
+        return max(1, round(rng.randint(low, high) * self.size))
+
+    def _include(self, rng: random.Random, section: str) -> bool:
+        return section in self.sections and rng.random() < self.section_probability
+
+    def resume_data(self, index: int) -> Dict:
+        rng = random.Random(f"{self.seed}:{index}")
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        city, state = rng.choice(CITIES)
+        role = rng.choice(ROLES)
+        skills = rng.sample(SKILLS, k=min(len(SKILLS), self._scaled(rng, 6, 14)))
+
+        data = {
+            'full_name': f"{first} {last}",
+            'job_role': role,
+            'email': f"{first.lower()}.{last.lower()}{index}@example.com",
+            'phone': f"+91 9{rng.randint(100000000, 999999999)}",
+            'location': f"{city}, {state}",
+            'linkedin_url': f"linkedin.com/in/{first.lower()}-{last.lower()}-{index}",
+            'github_url': f"github.com/{first.lower()}{last.lower()}{index}",
+            'skills': [{'name': skill, 'level': rng.choice(['Intermediate', 'Advanced'])} for skill in skills],
+            'experiences': [],
+            'educations': [],
+            'projects': [],
+            'languages': [],
+            'hobbies': [],
+            'certifications': [],
+            'achievements': [],
+        }
+        if self._include(rng, 'summary'):
+            years = rng.randint(1, 12)
+            data['summary'] = (
+                f"{role} with {years} years of experience building reliable software with "
+                f"{', '.join(skills[:3])}. Comfortable owning features end to end, from design "
+                f"reviews to production monitoring, and mentoring newer engineers."
+            )
+        if self._include(rng, 'experience'):
+            end_year = 2025
+            for _ in range(self._scaled(rng, 1, 4)):
+                start_year = end_year - rng.randint(1, 4)
+                data['experiences'].append({
+                    'job_title': f"{rng.choice(SENIORITY)}{rng.choice(ROLES)}",
+                    'company': rng.choice(COMPANIES),
+                    'location': rng.choice(CITIES)[0],
+                    'duration': f"{start_year} - {'Present' if end_year == 2025 else end_year}",
+                    'responsibilities': [f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+                                         for _ in range(self._scaled(rng, 2, 5))],
+                })
+                end_year = start_year
+        if self._include(rng, 'education'):
+            for _ in range(rng.randint(1, 2)):
+                start = rng.randint(2008, 2019)
+                data['educations'].append({
+                    'degree': rng.choice(DEGREES),
+                    'institution': rng.choice(INSTITUTIONS),
+                    'year': f"{start} - {start + 4}",
+                    'grade': f"CGPA: {rng.uniform(6.5, 9.8):.1f}",
+                })
+        if self._include(rng, 'projects'):
+            for _ in range(self._scaled(rng, 1, 3)):
+                title = rng.choice(PROJECT_NAMES)
+                stack = ', '.join(rng.sample(skills, k=min(3, len(skills))))
+                data['projects'].append({
+                    'title': title,
+                    'description': f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {stack}.",
+                    'tech_stack': stack,
+                    'github_link': f"https://github.com/{first.lower()}{index}/{title.lower()}",
+                })
+        if self._include(rng, 'languages'):
+            data['languages'] = rng.sample(LANGUAGES, k=rng.randint(1, 3))
+        if self._include(rng, 'hobbies'):
+            data['hobbies'] = rng.sample(HOBBIES, k=rng.randint(1, 3))
+        if self._include(rng, 'certifications'):
+            data['certifications'] = rng.sample(CERTIFICATIONS, k=rng.randint(1, 2))
+        if self._include(rng, 'achievements'):
+            data['achievements'] = rng.sample(ACHIEVEMENTS, k=rng.randint(1, 2))
+        return data
+
+    def resume_text(self, data: Dict) -> str:
+        """Plain-text rendering laid out the way extracted resumes usually read"""
+        lines = [data['full_name'], data['job_role'],
+                 f"{data['email']} | {data['phone']}", data['location'],
+                 data['linkedin_url'], data['github_url'], '']
+        if data.get('summary'):
+            lines += ['Summary', data['summary'], '']
+        if data['experiences']:
+            lines.append('Experience')
+            for exp in data['experiences']:
+                lines += [exp['job_title'], exp['company'], exp['location'], exp['duration']]
+                lines += [f"- {item}" for item in exp['responsibilities']]
+                lines.append('')
+        if data['educations']:
+            lines.append('Education')
+            for edu in data['educations']:
+                lines += [edu['degree'], edu['institution'], edu['year'], edu['grade'], '']
+        if data['projects']:
+            lines.append('Projects')
+            for project in data['projects']:
+                lines += [project['title'], project['description'], project['github_link'], '']
+        if 'skills' in self.sections:
+            lines += ['Skills', ', '.join(skill['name'] for skill in data['skills']), '']
+        for header, key in (('Certifications', 'certifications'), ('Achievements', 'achievements'),
+                            ('Languages', 'languages'), ('Hobbies', 'hobbies')):
+            if data[key]:
+                lines += [header] + list(data[key]) + ['']
+        return '\n'.join(lines).strip() + '\n'
+
+    def job_description(self, index: int) -> str:
+        rng = random.Random(f"{self.seed}:jd:{index}")
+        role = rng.choice(ROLES)
+        required = rng.sample(SKILLS, k=6)
+        return (
+            f"We are hiring a {rng.choice(SENIORITY)}{role} to join {rng.choice(COMPANIES)}. "
+            f"You will work with {', '.join(required[:4])} and {required[4]} to design, build and operate "
+            f"production systems. Requirements: {rng.randint(2, 8)}+ years of experience, strong "
+            f"{required[0]} and {required[5]} skills, clear communication and ownership."
+        )
+
+    def resumes(self, count: int, formats: Sequence[str] = ('txt',)) -> Iterator[SyntheticResume]:
+        """``count`` resumes, cycling through ``formats`` (txt, docx, pdf)"""
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown formats: {', '.join(sorted(unknown))}")
+        for index in range(count):
+            fmt = formats[index % len(formats)]
+            data = self.resume_data(index)
+            text = self.resume_text(data)
+            slug = data['full_name'].lower().replace(' ', '_')
+            yield SyntheticResume(f"{slug}_{index}.{fmt}", fmt, self._render(data, text, fmt, index), text, data)
+
+    def _render(self, data: Dict, text: str, fmt: str, index: int) -> bytes:
+        if fmt == 'txt':
+            return text.encode('utf-8')
+
+        # Heavy document dependencies are only needed for DOCX/PDF corpora
+        from api.resume_generator import ResumeGenerator
+
+        generator = ResumeGenerator(dict(data))
+        template = (generator.generate_template1, generator.generate_template2, generator.generate_template3)[index % 3]()
+        buffer = template['docx'] if fmt == 'docx' else template['pdf']
+        return buffer.getvalue()
+
+
+def write_corpus(corpus: SyntheticResumeCorpus, directory: str, count: int,
+                 formats: Sequence[str] = ('txt',)) -> List[str]:
+    """Materialize a corpus on disk (e.g. for fit_similarity_vectorizer --corpus)"""
+    import os
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for resume in corpus.resumes(count, formats):
+        path = os.path.join(directory, resume.name)
+        with open(path, 'wb') as f:
+            f.write(resume.payload)
+        paths.append(path)
+    return paths
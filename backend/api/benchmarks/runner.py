@@ -0,0 +1,154 @@
+import logging
+import platform
+import tempfile
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Sequence
+
+from django.utils import timezone
+
+from ..metrics_views import summarize_timings
+from ..spans import record_spans
+from .corpus import SyntheticResume
+
+logger = logging.getLogger(__name__)
+
+TARGETS = ('parse_resume', 'calculate_similarity_scores', 'predict_job_roles',
+           'calculate_enhanced_ats_score', 'resume_analysis_view')
+
+
+def _summary(samples_ms: List[float]) -> Dict:
+    summary = summarize_timings(samples_ms)
+    total_seconds = sum(samples_ms) / 1000
+    summary['throughput_per_s'] = round(summary['count'] / total_seconds, 3) if total_seconds else None
+    return summary
+
+
+def _time_ms(fn: Callable, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000
+
+
+class BenchmarkRunner:
+    """
+    Times the analysis entry points over a synthetic corpus.
+
+    Every target runs ``repeat`` times per resume. ``parse_resume`` is also
+    broken down per extractor through the ``extract.*`` spans it records.
+    ``resume_analysis_view`` posts each document through the real view with
+    the analysis cache cleared, inside a transaction that is rolled back so
+    benchmark users and analyses never persist (and never feed near-duplicate
+    reuse into later samples).
+    """
+
+    def __init__(self, jms_system, resumes: Sequence[SyntheticResume], job_descriptions: Sequence[str],
+                 repeat: int = 1, targets: Sequence[str] = TARGETS):
+        unknown = set(targets) - set(TARGETS)
+        if unknown:
+            raise ValueError(f"Unknown targets: {', '.join(sorted(unknown))}")
+        self.jms_system = jms_system
+        self.resumes = list(resumes)
+        self.job_descriptions = list(job_descriptions)
+        self.repeat = max(repeat, 1)
+        self.targets = tuple(targets)
+
+    def _pairs(self):
+        for _ in range(self.repeat):
+            for i, resume in enumerate(self.resumes):
+                yield resume, self.job_descriptions[i % len(self.job_descriptions)]
+
+    def run(self) -> Dict:
+        results = {}
+        for target in self.targets:
+            logger.info("Benchmarking %s over %d resumes", target, len(self.resumes))
+            results.update(getattr(self, f'_bench_{target}')())
+        return results
+
+    def _bench_parse_resume(self) -> Dict:
+        totals, extractors = [], defaultdict(list)
+        for resume, _ in self._pairs():
+            with record_spans() as spans:
+                self.jms_system.parse_resume(resume.text)
+            totals.append(spans.elapsed * 1000)
+            for name, ms in spans.as_ms().items():
+                if name.startswith('extract.'):
+                    extractors[name].append(ms)
+        results = {'parse_resume': _summary(totals)}
+        for name in sorted(extractors):
+            results[f'parse_resume.{name}'] = _summary(extractors[name])
+        return results
+
+    def _bench_calculate_similarity_scores(self) -> Dict:
+        samples = [_time_ms(self.jms_system.calculate_similarity_scores, resume.text, jd)
+                   for resume, jd in self._pairs()]
+        return {'calculate_similarity_scores': _summary(samples)}
+
+    def _bench_predict_job_roles(self) -> Dict:
+        samples = [_time_ms(self.jms_system.predict_job_roles, resume.text) for resume, _ in self._pairs()]
+        return {'predict_job_roles': _summary(samples)}
+
+    def _bench_calculate_enhanced_ats_score(self) -> Dict:
+        from ..analysis_core import calculate_enhanced_ats_score
+
+        parsed = {resume.name: self.jms_system.parse_resume(resume.text) for resume in self.resumes}
+        samples = [_time_ms(calculate_enhanced_ats_score, parsed[resume.name], jd, resume.text)
+                   for resume, jd in self._pairs()]
+        return {'calculate_enhanced_ats_score': _summary(samples)}
+
+    def _bench_resume_analysis_view(self) -> Dict:
+        from django.contrib.auth import get_user_model
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.db import transaction
+        from django.test import override_settings
+        from rest_framework.test import APIRequestFactory, force_authenticate
+
+        from ..analysis_cache import get_analysis_cache
+        from ..analysis_core import ResumeAnalysisView
+
+        factory = APIRequestFactory()
+        view = ResumeAnalysisView.as_view()
+        samples, by_format, failures = [], defaultdict(list), 0
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            for resume, jd in self._pairs():
+                with transaction.atomic():
+                    user = get_user_model().objects.create_user(username=f'benchmark-{time.monotonic_ns()}')
+                    request = factory.post('/api/resume/analyze/', {
+                        'resume': SimpleUploadedFile(resume.name, resume.payload),
+                        'job_description': jd,
+                    }, format='multipart')
+                    force_authenticate(request, user=user)
+                    get_analysis_cache().clear()
+
+                    start = time.perf_counter()
+                    response = view(request)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    transaction.set_rollback(True)
+
+                if response.status_code != 201:
+                    failures += 1
+                    logger.warning("%s: view returned %s", resume.name, response.status_code)
+                    continue
+                samples.append(elapsed)
+                by_format[resume.format].append(elapsed)
+
+        if not samples:
+            return {'resume_analysis_view': {'count': 0, 'failures': failures}}
+        results = {'resume_analysis_view': {**_summary(samples), 'failures': failures}}
+        for fmt in sorted(by_format):
+            results[f'resume_analysis_view.{fmt}'] = _summary(by_format[fmt])
+        return results
+
+
+def benchmark_report(results: Dict, **meta) -> Dict:
+    """Wrap ``BenchmarkRunner.run()`` output with the context needed to compare runs"""
+    return {
+        'meta': {
+            'created': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            **meta,
+        },
+        'results': results,
+    }
@@ -0,0 +1,217 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from .model_registry import get_job_matching_system
+from .models import ResumeAnalysis
+from .vector_index import SparseVectorIndex, sparse_from_json, sparse_to_json
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_OWNERS = 32
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def resume_vector_fields(system, resume_text) -> Dict:
+    """``tfidf_vector`` / ``vector_version`` values to store on a ResumeAnalysis"""
+    from sklearn.preprocessing import normalize
+
+    vector = system.vectorize([resume_text])
+    if vector is None:
+        return {'tfidf_vector': {}, 'vector_version': ''}
+    return {'tfidf_vector': sparse_to_json(normalize(vector)), 'vector_version': system.model_version}
+
+
+class CandidateIndex:
+    """
+    One owner's resume vectors stacked into a sparse matrix.
+
+    Kept up to date incrementally: rows with an id above ``watermark`` are
+    appended, deleted rows are dropped, and the result is snapshotted to
+    ``CANDIDATE_INDEX_DIR`` so a cold worker only reads the delta. Deletions
+    are looked for at most every ``CANDIDATE_INDEX_DELETE_CHECK_SECONDS``;
+    until then a deleted id can still be returned, and callers skip it.
+    """
+
+    def __init__(self, owner_id: int, model_version: str, vectors: SparseVectorIndex, watermark: int = 0):
+        self.owner_id = owner_id
+        self.model_version = model_version
+        self.vectors = vectors
+        self.watermark = watermark
+        self.deletes_checked_at: Optional[float] = None
+        self.lock = threading.Lock()
+
+    @property
+    def snapshot_path(self) -> str:
+        return snapshot_path(self.owner_id)
+
+    def refresh(self, system) -> bool:
+        rows = ResumeAnalysis.objects.filter(user_id=self.owner_id)
+        changed = False
+
+        # Deleted analyses: only list ids when the count says something went away
+        now = time.monotonic()
+        interval = getattr(settings, 'CANDIDATE_INDEX_DELETE_CHECK_SECONDS', 30)
+        if self.deletes_checked_at is None or now - self.deletes_checked_at >= interval:
+            self.deletes_checked_at = now
+            if rows.filter(id__lte=self.watermark).count() != len(self.vectors):
+                live = set(rows.filter(id__lte=self.watermark).values_list('id', flat=True))
+                self.vectors.remove([row_id for row_id in self.vectors.ids if row_id not in live])
+                changed = True
+
+        new_rows = list(rows.filter(id__gt=self.watermark).order_by('id')
+                        .values_list('id', 'tfidf_vector', 'vector_version'))
+        if new_rows:
+            stale = [row_id for row_id, _, version in new_rows if version != system.model_version]
+            fresh_vectors = self._backfill(system, stale) if stale else {}
+            items = []
+            for row_id, vector, version in new_rows:
+                # Rows without a vector are kept as empty rows so counts stay comparable
+                vector = fresh_vectors.get(row_id, vector) or {}
+                items.append((row_id, sparse_from_json(vector, self.vectors.dim)))
+            self.vectors.add_many(items)
+            self.watermark = new_rows[-1][0]
+            changed = True
+
+        if changed:
+            try:
+                self.vectors.save(self.snapshot_path, model_version=self.model_version, watermark=self.watermark)
+            except OSError:
+                logger.exception("Could not write candidate index snapshot for owner %s", self.owner_id)
+        return changed
+
+    def _backfill(self, system, row_ids: List[int]) -> Dict[int, Dict]:
+        """Vectorize analyses stored before vectors existed or under an older model"""
+        vectors = {}
+        stale_rows = ResumeAnalysis.objects.filter(id__in=row_ids).only('id', 'parsed_data')
+        to_update = []
+        for analysis in stale_rows.iterator():
+            fields = resume_vector_fields(system, (analysis.parsed_data or {}).get('full_text', ''))
+            analysis.tfidf_vector = fields['tfidf_vector']
+            analysis.vector_version = fields['vector_version']
+            vectors[analysis.id] = analysis.tfidf_vector
+            to_update.append(analysis)
+        ResumeAnalysis.objects.bulk_update(to_update, ['tfidf_vector', 'vector_version'], batch_size=500)
+        return vectors
+
+
+_indexes: "OrderedDict[int, CandidateIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def snapshot_path(owner_id: int) -> str:
+    return os.path.join(str(settings.CANDIDATE_INDEX_DIR), f"candidates_{owner_id}.npz")
+
+
+def get_candidate_index(owner_id: int, system=None) -> CandidateIndex:
+    system = system or get_job_matching_system()
+    dim = len(system.similarity_vectorizer.vocabulary_)
+
+    with _indexes_lock:
+        index = _indexes.get(owner_id)
+        if index is not None and index.model_version == system.model_version:
+            _indexes.move_to_end(owner_id)
+        else:
+            index = _load_snapshot(owner_id, system.model_version, dim) or \
+                CandidateIndex(owner_id, system.model_version, SparseVectorIndex(dim))
+            _indexes[owner_id] = index
+            while len(_indexes) > MAX_CACHED_OWNERS:
+                _indexes.popitem(last=False)
+
+    with index.lock:
+        index.refresh(system)
+    return index
+
+
+def _load_snapshot(owner_id: int, model_version: str, dim: int) -> Optional[CandidateIndex]:
+    path = snapshot_path(owner_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        vectors, meta = SparseVectorIndex.load(path)
+    except (OSError, ValueError, KeyError):
+        logger.warning("Ignoring unreadable candidate index snapshot %s", path)
+        return None
+    if meta.get('model_version') != model_version or vectors.dim != dim:
+        return None
+    return CandidateIndex(owner_id, model_version, vectors, int(meta.get('watermark', 0)))
+
+
+def _query_fingerprint(job_description: str) -> str:
+    normalized = ' '.join(job_description.lower().split())
+    return hashlib.sha256(normalized.encode()).hexdigest()[:16]
+
+
+def encode_cursor(score: float, row_id: int, job_description: str) -> str:
+    payload = json.dumps({'s': float(score), 'i': int(row_id), 'q': _query_fingerprint(job_description)})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, job_description: str) -> Tuple[float, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        score, row_id, query = float(payload['s']), int(payload['i']), payload['q']
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+    if query != _query_fingerprint(job_description):
+        raise InvalidCursor("Cursor belongs to a different job description")
+    return score, row_id
+
+
+def search_candidates(owner_id: int, job_description: str, limit: int = 20,
+                      cursor: str = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Best matching analyses owned by ``owner_id`` for one job description,
+    ordered by (TF-IDF similarity, id) descending. Returns a page and the
+    cursor for the next one (None on the last page).
+    """
+    from sklearn.preprocessing import normalize
+
+    system = get_job_matching_system()
+    index = get_candidate_index(owner_id, system)
+    with index.lock:
+        # A concurrent refresh() mutates index.vectors; the frozen copy keeps scores and ids aligned
+        vectors = index.vectors.frozen()
+    if not len(vectors):
+        return [], None
+
+    query = normalize(system.vectorize([job_description]))
+    scores = vectors.scores(query).astype(np.float32)
+    ids = vectors.id_array
+
+    candidates = np.arange(len(ids))
+    if cursor:
+        after_score, after_id = decode_cursor(cursor, job_description)
+        after_score = np.float32(after_score)
+        mask = (scores < after_score) | ((scores == after_score) & (ids < after_id))
+        candidates = candidates[mask]
+    if not len(candidates):
+        return [], None
+
+    # Partial selection of the page (keeping every row tied with the cut-off
+    # score so ids order ties exactly), then a full sort of just those rows
+    if len(candidates) > limit:
+        part = np.argpartition(-scores[candidates], limit - 1)[:limit]
+        threshold = scores[candidates[part]].min()
+        candidates = candidates[scores[candidates] >= threshold]
+    order = np.lexsort((-ids[candidates], -scores[candidates]))
+    page = candidates[order][:limit]
+
+    results = [{'analysis_id': int(ids[pos]), 'tfidf_similarity': round(float(scores[pos]) * 100, 2)} for pos in page]
+    next_cursor = None
+    if len(page) == limit:
+        last = page[-1]
+        next_cursor = encode_cursor(scores[last], ids[last], job_description)
+    return results, next_cursor
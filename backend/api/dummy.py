@@ -1,37 +1,114 @@
 import re
-import pickle
+import hashlib
+import logging
 import numpy as np
 from datetime import datetime
-from typing import Dict, List, Tuple, Any
+from typing import Callable, Dict, List, Tuple, Any
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import urllib.parse
+from .keyword_matcher import KeywordMatcher
+from .section_segmenter import SectionIndex, segment_sections
+from .analysis_context import AnalysisContext, clean_text
+from . import extraction_engine
+from .extraction_engine import extraction_budget
+from .model_arrays import linear_classifier
+from .role_keywords import RoleKeywordTable, get_role_keyword_table
+from .spans import span
+
+logger = logging.getLogger(__name__)
+
+# Fields of the experience/education patterns never cross a line break, since
+# they run over whole multi-line sections; an entry may still span lines.
+# Linear-time counterparts of those patterns: words are also matched
+# possessively and their count is bounded, so a long run of text without
+# newlines cannot backtrack.
+_SEP = r'[ \t]*+\n?[ \t]*+'
+_TITLE = r'((?:[A-Za-z&]++[ \t]++){0,6}?(?:Developer|Engineer|Analyst|Manager|Specialist|Intern|Executive))'
+_TITLE_NO_EXEC = r'((?:[A-Za-z&]++[ \t]++){0,6}?(?:Developer|Engineer|Analyst|Manager|Specialist|Intern))'
+_COMPANY = r'((?:[A-Za-z&.,]++[ \t]++){0,6}?(?:Company|Corp|Ltd|Inc|Solutions|Technologies))'
+_DURATION = r'(\d{4}[ \t]*+[-–][ \t]*+(?:\d{4}|Present))'
+_DEGREE = r'((?:[A-Za-z.]++[ \t]++){0,4}?(?:B\.?Tech|M\.?Tech|Bachelor|Master|PhD|Diploma|Certificate)[\w \t&]{1,80}+)'
+_DEGREE_NO_CERT = r'((?:[A-Za-z.]++[ \t]++){0,4}?(?:B\.?Tech|M\.?Tech|Bachelor|Master|PhD)[\w \t&]{1,80}+)'
+_INSTITUTION = r'((?:[A-Za-z,.-]++[ \t]++){0,6}?(?:College|University|Institute|School)[\w \t,.-]{0,80}+)'
+_INSTITUTION_NO_SCHOOL = r'((?:[A-Za-z,.-]++[ \t]++){0,6}?(?:College|University|Institute)[\w \t,.-]{0,80}+)'
+_YEAR = r'(\d{4}(?:[ \t-]*+(?:\d{4}|Present))?)'
+
+_PLACE = r'([A-Za-z \t]{1,40})'
+
+# (original pattern, linear-time pattern)
+EMAIL_PATTERN = (
+    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    r'(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]{1,64}+@[A-Za-z0-9.-]{1,255}\.[A-Z|a-z]{2,}\b',
+)
+LOCATION_PATTERNS = [
+    (r'([A-Za-z\s]+),\s*([A-Za-z\s]+)[-\s]*\d{6}',
+     r'(?<![A-Za-z \t])' + _PLACE + r',[ \t]*+' + _PLACE + r'[- \t]*\d{6}'),
+    (r'([A-Za-z\s]+),\s*([A-Za-z\s]+),\s*([A-Za-z\s]+)',
+     r'(?<![A-Za-z \t])' + _PLACE + r',[ \t]*+' + _PLACE + r',[ \t]*+' + _PLACE),
+    (r'([A-Za-z\s]+),\s*([A-Za-z\s]+)',
+     r'(?<![A-Za-z \t])' + _PLACE + r',[ \t]*+' + _PLACE),
+]
+EXPERIENCE_PATTERNS = [
+    (r'([A-Za-z \t&]*(?:Developer|Engineer|Analyst|Manager|Specialist|Intern|Executive))\s*\n?([A-Za-z \t&.,]+(?:Company|Corp|Ltd|Inc|Solutions|Technologies))\s*\n?([A-Za-z \t,]+)?\s*\n?(\d{4}[ \t]*[-–][ \t]*(?:\d{4}|Present))',
+     r'(?<![A-Za-z&])' + _TITLE + _SEP + _COMPANY + _SEP + r'([A-Za-z ,\t]{1,60}+)?' + _SEP + _DURATION),
+    (r'(\d{4}[ \t]*[-–][ \t]*(?:\d{4}|Present))\s*\n?([A-Za-z \t&]*(?:Developer|Engineer|Analyst|Manager|Specialist|Intern))\s*\n?([A-Za-z \t&.,]+(?:Company|Corp|Ltd|Inc|Solutions|Technologies))',
+     _DURATION + _SEP + _TITLE_NO_EXEC + _SEP + _COMPANY),
+]
+EDUCATION_PATTERNS = [
+    (r'([A-Za-z. \t]*(?:B\.?Tech|M\.?Tech|Bachelor|Master|PhD|Diploma|Certificate)[\w \t&]+)\s*\n?([A-Za-z \t,.-]*(?:College|University|Institute|School)[\w \t,.-]*)\s*\n?(\d{4}[ \t-]*(?:\d{4}|Present)?)\s*\n?(?:(?:GPA|CGPA|Score|Percentage)[:]*[ \t]*([\d.]+))?',
+     r'(?<![A-Za-z.])' + _DEGREE + _SEP + _INSTITUTION + _SEP + _YEAR
+     + r'(?:' + _SEP + r'(?:GPA|CGPA|Score|Percentage):*[ \t]*+([\d.]+))?'),
+    (r'(\d{4}[ \t-]*(?:\d{4}|Present)?)\s*\n?([A-Za-z. \t]*(?:B\.?Tech|M\.?Tech|Bachelor|Master|PhD)[\w \t&]+)\s*\n?([A-Za-z \t,.-]*(?:College|University|Institute)[\w \t,.-]*)',
+     _YEAR + _SEP + _DEGREE_NO_CERT + _SEP + _INSTITUTION_NO_SCHOOL),
+]
 
 class JobMatchingSystem:
-    def __init__(self):
-        print("CONSOLE: Initializing Enhanced ML-only Job Matching System...")
-        
-        # Load ML models with error handling
-        try:
-            self.clf_model = self._load_model(r"C:\Users\omkar\OneDrive\Desktop\InnoHack 2.0\Resume-Checker\backend\api\clf.pkl")
-            print("CONSOLE: Classifier model loaded")
-        except:
-            print("CONSOLE: Classifier model not found, using fallback")
-            self.clf_model = None
-            
-        try:
-            self.tfidf = self._load_model(r"C:\Users\omkar\OneDrive\Desktop\InnoHack 2.0\Resume-Checker\backend\api\tfidf.pkl")
-            print("CONSOLE: TF-IDF vectorizer loaded")
-        except:
-            print("CONSOLE: TF-IDF vectorizer not found")
-            self.tfidf = None
-            
-        try:
-            self.encoder = self._load_model(r"C:\Users\omkar\OneDrive\Desktop\InnoHack 2.0\Resume-Checker\backend\api\encoder.pkl")
-            print("CONSOLE: Label encoder loaded")
-        except:
-            print("CONSOLE: Label encoder not found")
-            self.encoder = None
+    """
+    Resume parsing, role prediction and JD matching.
+
+    Instances are built by ``model_registry.get_job_matching_system()`` and
+    shared by every request in the worker, so nothing here may mutate
+    instance state after ``__init__``.
+    """
+
+    # Alternative spellings mapped onto their canonical skills_database entry
+    SKILL_ALIASES = {
+        "JS": "JavaScript", "ReactJS": "React", "React.js": "React", "NodeJS": "Node.js",
+        "VueJS": "Vue.js", "Vue": "Vue.js", "ExpressJS": "Express", "Golang": "Go",
+        "Postgres": "PostgreSQL", "Mongo": "MongoDB", "K8s": "Kubernetes", "GCP": "Google Cloud",
+        "Amazon Web Services": "AWS", "sklearn": "Scikit-learn", "Scikit Learn": "Scikit-learn",
+        "PowerBI": "Power BI", "MS Excel": "Excel", "Jira": "JIRA",
+    }
+
+    # Batches at least this large parse on the shared process pool
+    BATCH_PARALLEL_MIN = 16
+
+    # Parsed fields extracted from a single section's slice (each falls back
+    # to the whole document when its section is missing)
+    SECTION_FIELDS = {
+        'experience_details': 'experience',
+        'education': 'education',
+        'projects': 'projects',
+        'summary': 'summary',
+        'languages': 'languages',
+        'hobbies': 'hobbies',
+        'certifications': 'certifications',
+    }
+    MIN_SUMMARY_LENGTH = 50
+
+    def __init__(self, clf_model=None, tfidf=None, encoder=None, similarity_vectorizer=None,
+                 model_version: str = 'fallback', role_keywords: RoleKeywordTable = None):
+        self.clf_model = clf_model
+        self.tfidf = tfidf
+        self.encoder = encoder
+        # Weight matrix + bias view of a linear clf_model (None for other model types)
+        self.role_classifier = linear_classifier(clf_model)
+        # Fitted once on a reference corpus of resumes and JDs; only ever used via transform()
+        self.similarity_vectorizer = similarity_vectorizer
+        self.model_version = model_version
+        # Keyword table for fallback role prediction (settings.ROLE_KEYWORDS_FILE)
+        self.role_keywords = role_keywords or get_role_keyword_table()
         
         self.job_roles = [
             "Data Analyst", "Software Engineer", "Frontend Developer", 
@@ -51,40 +128,93 @@ class JobMatchingSystem:
             "Mobile": ["Android", "iOS", "React Native", "Flutter", "Xamarin"],
             "Other": ["Machine Learning", "Artificial Intelligence", "IoT", "Blockchain", "AR/VR"]
         }
-        
-        print("CONSOLE: Enhanced Job Matching System initialized successfully!")
 
-    def _load_model(self, filename):
-        with open(filename, 'rb') as f:
-            return pickle.load(f)
+        self.keyword_matcher = self._build_keyword_matcher()
+
+    def _build_keyword_matcher(self) -> KeywordMatcher:
+        matcher = KeywordMatcher()
+        for category, skills_list in self.skills_database.items():
+            for skill in skills_list:
+                matcher.add(skill, label=skill, category='skill')
+        for alias, skill in self.SKILL_ALIASES.items():
+            matcher.add(alias, label=skill, category='skill')
+        for role_name, keywords in self.role_keywords.role_keywords.items():
+            matcher.add_many(keywords, label=role_name, category='role')
+        return matcher.build()
+
+    @property
+    def has_classifier(self) -> bool:
+        return bool(self.clf_model is not None and self.tfidf is not None and self.encoder is not None)
 
     def clean_resume(self, text):
-        text = re.sub(r'http\S+\s', ' ', text)
-        text = re.sub(r'@\S+', ' ', text)
-        text = re.sub(r'#\S+\s', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.lower().strip()
+        return clean_text(text)
+
+    def parse_resume(self, resume_text, reuse: Dict = None) -> Dict:
+        """
+        ``reuse`` maps SECTION_FIELDS entries to values parsed earlier from an
+        identical section (see ``section_fingerprints``); those extractors are
+        skipped.
+        
+        Pattern-heavy extractors run under a per-extractor time budget;
+        extractors that ran out are listed in ``extraction_warnings``.
+        """
+        with extraction_budget() as budget:
+            parsed_data = self._parse_fields(AnalysisContext.of(resume_text), reuse or {})
+        parsed_data['extraction_warnings'] = budget.warnings
+        return parsed_data
+
+    def _parse_fields(self, ctx: AnalysisContext, reuse: Dict) -> Dict:
+        # Segment once; section-scoped extractors only look at their own slice
+        resume_text = ctx.text
+        with span('segmentation'):
+            sections = ctx.sections
+
+        def extract(field, extractor, *args):
+            with span(f"extract.{field}"):
+                return extractor(*args)
+
+        def section_field(field, extractor):
+            if field in reuse:
+                return reuse[field]
+            return extract(field, extractor, resume_text, sections)
 
-    def parse_resume(self, resume_text: str) -> Dict:
         parsed_data = {}
-        parsed_data['name'] = self._extract_name(resume_text)
-        parsed_data['email'] = self._extract_email(resume_text)
-        parsed_data['phone'] = self._extract_phone(resume_text)
-        parsed_data['location'] = self._extract_location(resume_text)
-        parsed_data['linkedin'] = self._extract_linkedin(resume_text)
-        parsed_data['github'] = self._extract_github(resume_text)
-        parsed_data['skills'] = self._extract_skills(resume_text)
-        parsed_data['experience_level'] = self._extract_experience_level(resume_text)
-        parsed_data['experience_details'] = self._extract_experience_details(resume_text)
-        parsed_data['education'] = self._extract_education_detailed(resume_text)
-        parsed_data['projects'] = self._extract_projects(resume_text)
-        parsed_data['summary'] = self._extract_summary(resume_text)
-        parsed_data['languages'] = self._extract_languages(resume_text)
-        parsed_data['achievements'] = self._extract_achievements(resume_text)
-        parsed_data['hobbies'] = self._extract_hobbies(resume_text)
-        parsed_data['certifications'] = self._extract_certifications(resume_text)
+        parsed_data['name'] = extract('name', self._extract_name, resume_text)
+        parsed_data['email'] = extract('email', self._extract_email, resume_text)
+        parsed_data['phone'] = extract('phone', self._extract_phone, resume_text)
+        parsed_data['location'] = extract('location', self._extract_location, resume_text)
+        parsed_data['linkedin'] = extract('linkedin', self._extract_linkedin, resume_text)
+        parsed_data['github'] = extract('github', self._extract_github, resume_text)
+        parsed_data['skills'] = extract('skills', self._extract_skills, resume_text, ctx.lower)
+        parsed_data['experience_level'] = extract('experience_level', self._extract_experience_level, resume_text, ctx.lower)
+        parsed_data['experience_details'] = section_field('experience_details', self._extract_experience_details)
+        parsed_data['education'] = section_field('education', self._extract_education_detailed)
+        parsed_data['projects'] = section_field('projects', self._extract_projects)
+        parsed_data['summary'] = section_field('summary', self._extract_summary)
+        parsed_data['languages'] = section_field('languages', self._extract_languages)
+        parsed_data['achievements'] = extract('achievements', self._extract_achievements, resume_text)
+        parsed_data['hobbies'] = section_field('hobbies', self._extract_hobbies)
+        parsed_data['certifications'] = section_field('certifications', self._extract_certifications)
         return parsed_data
 
+    def section_fingerprints(self, resume_text) -> Dict[str, str]:
+        """
+        Digest of exactly the text each SECTION_FIELDS extractor reads: its
+        section slice, or the whole document when it falls back to that.
+        Equal fingerprints mean the extractor would return the same value.
+        """
+        ctx = AnalysisContext.of(resume_text)
+        document = hashlib.sha1(ctx.text.encode()).hexdigest()
+        fingerprints = {}
+        for field, section in self.SECTION_FIELDS.items():
+            content = ctx.sections.get(section)
+            # A too-short summary section also sends _extract_summary to the full text
+            if not content or (field == 'summary' and len(content) <= self.MIN_SUMMARY_LENGTH):
+                fingerprints[field] = document
+            else:
+                fingerprints[field] = hashlib.sha1(f"{section}\0{content}".encode()).hexdigest()
+        return fingerprints
+
     def _extract_name(self, text: str) -> str:
         lines = text.strip().split('\n')
         for line in lines[:8]:
@@ -96,8 +226,8 @@ class JobMatchingSystem:
         return "Not found"
 
     def _extract_email(self, text: str) -> str:
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        email_pattern, linear = EMAIL_PATTERN
+        emails = extraction_engine.findall(email_pattern, text, extractor='email', linear=linear)
         return emails[0] if emails else "Not found"
 
     def _extract_phone(self, text: str) -> str:
@@ -114,14 +244,8 @@ class JobMatchingSystem:
         return "Not found"
 
     def _extract_location(self, text: str) -> str:
-        location_patterns = [
-            r'([A-Za-z\s]+),\s*([A-Za-z\s]+)[-\s]*\d{6}',
-            r'([A-Za-z\s]+),\s*([A-Za-z\s]+),\s*([A-Za-z\s]+)',
-            r'([A-Za-z\s]+),\s*([A-Za-z\s]+)'
-        ]
-        
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text)
+        for pattern, linear in LOCATION_PATTERNS:
+            matches = extraction_engine.findall(pattern, text, extractor='location', linear=linear)
             if matches:
                 location = ', '.join(matches[0])
                 if len(location) > 5 and location.lower() not in ['not found', 'email', 'phone']:
@@ -162,19 +286,12 @@ class JobMatchingSystem:
                 return link
         return "Not found"
 
-    def _extract_skills(self, text: str) -> List[str]:
-        skills_found = []
-        text_lower = text.lower()
-        # Consider adding a regex for skills if they follow a pattern, or look in a specific "Skills" section
-        for category, skills_list in self.skills_database.items():
-            for skill in skills_list:
-                # Use word boundaries to avoid partial matches e.g. 'C' in 'Certificate'
-                if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text_lower):
-                    skills_found.append(skill)
-        return list(set(skills_found))
+    def _extract_skills(self, text: str, text_lower: str = None) -> List[str]:
+        # One pass over the text for every skill and alias in the taxonomy
+        return self.keyword_matcher.labels(text_lower or text.lower(), category='skill')
 
-    def _extract_experience_level(self, text: str) -> str:
-        text_lower = text.lower()
+    def _extract_experience_level(self, text: str, text_lower: str = None) -> str:
+        text_lower = text_lower or text.lower()
         
         # Check for fresher indicators
         fresher_keywords = ['fresher', 'recent graduate', 'new graduate', 'entry level', 'seeking opportunities', 'student']
@@ -199,33 +316,17 @@ class JobMatchingSystem:
                 
         return "Not specified"
 
-    def _extract_experience_details(self, text: str) -> List[Dict]:
+    def _extract_experience_details(self, text: str, sections: SectionIndex = None) -> List[Dict]:
         experiences = []
+        sections = sections or segment_sections(text)
         
-        # Look for work experience section
-        exp_section_patterns = [
-            r'(?:work\s+experience|experience|professional\s+experience)[:]*\s*(.+?)(?=\n\s*(?:education|projects|skills|certifications|[A-Z][^:]*:)|$)',
-            r'(?:employment|career)[:]*\s*(.+?)(?=\n\s*(?:education|projects|skills|[A-Z][^:]*:)|$)'
-        ]
-        
-        exp_text = ""
-        for pattern in exp_section_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                exp_text = match.group(1)
-                break
-        
-        if not exp_text:
-            exp_text = text  # Use full text if no specific section found
+        # Use the work experience section, or the full text if there is none
+        exp_text = sections.get('experience') or text
             
-        # Extract individual experiences
-        job_patterns = [
-            r'([A-Za-z\s&]+(?:Developer|Engineer|Analyst|Manager|Specialist|Intern|Executive))\s*\n?([A-Za-z\s&.,]+(?:Company|Corp|Ltd|Inc|Solutions|Technologies))\s*\n?([A-Za-z\s,]+)?\s*\n?(\d{4}\s*[-–]\s*(?:\d{4}|Present))',
-            r'(\d{4}\s*[-–]\s*(?:\d{4}|Present))\s*\n?([A-Za-z\s&]+(?:Developer|Engineer|Analyst|Manager|Specialist|Intern))\s*\n?([A-Za-z\s&.,]+(?:Company|Corp|Ltd|Inc|Solutions|Technologies))'
-        ]
-        
-        for pattern in job_patterns:
-            matches = re.findall(pattern, exp_text, re.IGNORECASE)
+        # Extract individual experiences (budgeted; see extraction_engine)
+        for pattern, linear in EXPERIENCE_PATTERNS:
+            matches = extraction_engine.findall(pattern, exp_text, re.IGNORECASE,
+                                                extractor='experience_details', linear=linear)
             for match in matches:
                 if len(match) >= 3:
                     exp_dict = {
@@ -260,35 +361,19 @@ class JobMatchingSystem:
                 
         return responsibilities[:5]  # Limit to 5 responsibilities
 
-    def _extract_education_detailed(self, text: str) -> List[Dict]:
-        education_list = []
+    def _extract_education_detailed(self, text: str, sections: SectionIndex = None) -> List[Dict]:
+        sections = sections or segment_sections(text)
         
-        # Look for education section
-        edu_patterns = [
-            r'(?:education|academic\s+background|qualifications)[:]*\s*(.+?)(?=\n\s*(?:experience|projects|skills|[A-Z][^:]*:)|$)'
-        ]
-        
-        edu_text = ""
-        for pattern in edu_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                edu_text = match.group(1)
-                break
-                
-        if not edu_text:
-            edu_text = text  # Use full text if no specific section found
+        # Use the education section, or the full text if there is none
+        edu_text = sections.get('education') or text
             
         # Extract education details
         edu_entries = []
         
-        # Pattern for structured education entries
-        degree_patterns = [
-            r'([A-Za-z.\s]+(?:B\.?Tech|M\.?Tech|Bachelor|Master|PhD|Diploma|Certificate)[\w\s&]+)\s*\n?([A-Za-z\s,.-]+(?:College|University|Institute|School)[\w\s,.-]*)\s*\n?(\d{4}[\s-]*(?:\d{4}|Present)?)\s*\n?(?:(?:GPA|CGPA|Score|Percentage)[:]*\s*([\d.]+))?',
-            r'(\d{4}[\s-]*(?:\d{4}|Present)?)\s*\n?([A-Za-z.\s]+(?:B\.?Tech|M\.?Tech|Bachelor|Master|PhD)[\w\s&]+)\s*\n?([A-Za-z\s,.-]+(?:College|University|Institute)[\w\s,.-]*)'
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, edu_text, re.IGNORECASE)
+        # Pattern for structured education entries (budgeted; see extraction_engine)
+        for pattern, linear in EDUCATION_PATTERNS:
+            matches = extraction_engine.findall(pattern, edu_text, re.IGNORECASE,
+                                                extractor='education', linear=linear)
             for match in matches:
                 edu_dict = {
                     'degree': match[0].strip() if match[0] else "Not specified",
@@ -300,20 +385,9 @@ class JobMatchingSystem:
                 
         return edu_entries
 
-    def _extract_projects(self, text: str) -> List[Dict]:
-        projects = []
-        
-        # Look for projects section
-        project_patterns = [
-            r'(?:projects?|portfolio)[:]*\s*(.+?)(?=\n\s*(?:experience|education|skills|[A-Z][^:]*:)|$)'
-        ]
-        
-        project_text = ""
-        for pattern in project_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                project_text = match.group(1)
-                break
+    def _extract_projects(self, text: str, sections: SectionIndex = None) -> List[Dict]:
+        sections = sections or segment_sections(text)
+        project_text = sections.get('projects')
                 
         if not project_text:
             # Look for project indicators in full text
@@ -325,8 +399,12 @@ class JobMatchingSystem:
         # Extract project details
         project_entries = []
         
-        # Look for project titles and descriptions
-        project_sections = re.split(r'\n(?=\w)', project_text)
+        # Look for project titles and descriptions: a projects section holds
+        # blank-line separated blocks, the fallback one project per line
+        if sections.get('projects'):
+            project_sections = re.split(r'\n[ \t]*\n', project_text)
+        else:
+            project_sections = re.split(r'\n(?=\w)', project_text)
         
         for section in project_sections:
             if len(section.strip()) > 20:  # Minimum length for a project description
@@ -342,38 +420,32 @@ class JobMatchingSystem:
                     # Extract technologies
                     tech_patterns = [
                         r'(?:technologies?|tech\s+stack|built\s+using|tools?)[:]*\s*([^.\n]+)',
-                        r'using\s+([A-Za-z0-9+#.\s,]+)'
+                        r'using\s+([A-Za-z0-9+#., \t]+)'
                     ]
                     
                     technologies = []
                     for pattern in tech_patterns:
-                        matches = re.findall(pattern, section, re.IGNORECASE)
+                        matches = extraction_engine.findall(pattern, section, re.IGNORECASE, extractor='projects')
                         for match in matches:
                             tech_list = re.findall(r'\b[A-Za-z][A-Za-z0-9+#.]{1,15}\b', match)
                             technologies.extend(tech_list)
                     
+                    # Deduplicated in order of mention: set order varies between pool workers
                     project_dict = {
                         'title': title,
                         'description': section.strip(),
-                        'technologies': list(set(technologies)) if technologies else ["Not specified"],
+                        'technologies': list(dict.fromkeys(technologies)) if technologies else ["Not specified"],
                         'project_link': github_link
                     }
                     project_entries.append(project_dict)
                     
         return project_entries[:5]  # Limit to 5 projects
 
-    def _extract_summary(self, text: str) -> str:
-        summary_patterns = [
-            r'(?:summary|profile|objective|about\s+me)[:]*\s*(.+?)(?=\n\s*(?:experience|education|skills|[A-Z][^:]*:)|$)',
-            r'(?:professional\s+summary|career\s+objective)[:]*\s*(.+?)(?=\n\s*[A-Z]|$)'
-        ]
-        
-        for pattern in summary_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                summary = match.group(1).strip()
-                if len(summary) > 50:  # Minimum length for meaningful summary
-                    return summary
+    def _extract_summary(self, text: str, sections: SectionIndex = None) -> str:
+        sections = sections or segment_sections(text)
+        summary = sections.get('summary')
+        if len(summary) > self.MIN_SUMMARY_LENGTH:  # Minimum length for meaningful summary
+            return summary
                     
         # If no explicit summary, extract first meaningful paragraph
         paragraphs = text.split('\n\n')
@@ -383,22 +455,16 @@ class JobMatchingSystem:
                 
         return "Not found"
 
-    def _extract_languages(self, text: str) -> List[str]:
+    def _extract_languages(self, text: str, sections: SectionIndex = None) -> List[str]:
         languages = []
-        
-        # Look for language section
-        lang_patterns = [
-            r'(?:languages?|linguistic\s+skills?)[:]*\s*(.+?)(?=\n\s*[A-Z]|$)'
-        ]
-        
-        for pattern in lang_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                lang_text = match.group(1)
-                common_languages = ['English', 'Hindi', 'Marathi', 'Tamil', 'Telugu', 'Bengali', 'Gujarati', 'Kannada', 'Malayalam', 'Punjabi', 'Spanish', 'French', 'German', 'Chinese', 'Japanese']
-                for lang in common_languages:
-                    if lang.lower() in lang_text.lower():
-                        languages.append(lang)
+        sections = sections or segment_sections(text)
+        
+        lang_text = sections.get('languages').lower()
+        if lang_text:
+            common_languages = ['English', 'Hindi', 'Marathi', 'Tamil', 'Telugu', 'Bengali', 'Gujarati', 'Kannada', 'Malayalam', 'Punjabi', 'Spanish', 'French', 'German', 'Chinese', 'Japanese']
+            for lang in common_languages:
+                if lang.lower() in lang_text:
+                    languages.append(lang)
                         
         return languages
 
@@ -414,70 +480,75 @@ class JobMatchingSystem:
                 
         return achievements[:5]  # Limit to 5 achievements
 
-    def _extract_hobbies(self, text: str) -> List[str]:
+    def _extract_hobbies(self, text: str, sections: SectionIndex = None) -> List[str]:
         hobbies = []
+        sections = sections or segment_sections(text)
         
-        hobby_patterns = [
-            r'(?:hobbies|interests|personal\s+interests)[:]*\s*(.+?)(?=\n\s*[A-Z]|$)'
-        ]
-        
-        for pattern in hobby_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                hobby_text = match.group(1)
-                hobby_list = re.findall(r'\b[A-Za-z\s]{3,20}\b', hobby_text)
-                hobbies.extend([hobby.strip() for hobby in hobby_list if len(hobby.strip()) > 2])
+        hobby_text = sections.get('hobbies')
+        if hobby_text:
+            # One hobby per line or comma-separated item, never across lines
+            hobby_list = re.findall(r'\b[A-Za-z \t]{3,20}\b', hobby_text)
+            hobbies.extend([hobby.strip() for hobby in hobby_list if len(hobby.strip()) > 2])
                 
         return hobbies[:5]  # Limit to 5 hobbies
 
-    def _extract_certifications(self, text: str) -> List[str]:
+    def _extract_certifications(self, text: str, sections: SectionIndex = None) -> List[str]:
         certifications = []
+        sections = sections or segment_sections(text)
         
-        cert_patterns = [
-            r'(?:certifications?|certificates?)[:]*\s*(.+?)(?=\n\s*[A-Z]|$)'
-        ]
-        
-        for pattern in cert_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                cert_text = match.group(1)
-                # Look for certification names and links
-                cert_lines = cert_text.split('\n')
-                for line in cert_lines:
-                    if len(line.strip()) > 10:
-                        certifications.append(line.strip())
+        # Look for certification names and links, one per line
+        cert_text = sections.get('certifications')
+        for line in cert_text.split('\n'):
+            if len(line.strip()) > 10:
+                certifications.append(line.strip())
                         
         return certifications
 
-    def calculate_similarity_scores(self, resume_text: str, job_description: str) -> Dict:
+    def calculate_similarity_scores(self, resume_text, job_description) -> Dict:
+        resume_ctx = AnalysisContext.of(resume_text)
+        job_ctx = AnalysisContext.of(job_description)
         scores = {}
-        if not resume_text or not job_description:
+        if not resume_ctx or not job_ctx:
             scores['tfidf_similarity'] = 0.0
             scores['keyword_similarity'] = 0.0
             scores['combined_score'] = 0.0
             return scores
 
-        scores['tfidf_similarity'] = self._tfidf_similarity(resume_text, job_description)
-        scores['keyword_similarity'] = self._keyword_similarity(resume_text, job_description)
+        scores['tfidf_similarity'] = self._tfidf_similarity(resume_ctx, job_ctx)
+        scores['keyword_similarity'] = self._keyword_similarity(resume_ctx, job_ctx)
         scores['combined_score'] = round((
             scores['tfidf_similarity'] * 0.6 + 
             scores['keyword_similarity'] * 0.4
         ), 2)
         return scores
 
-    def _tfidf_similarity(self, text1: str, text2: str) -> float:
+    def vectorize(self, texts: List[Any]):
+        """
+        TF-IDF rows for ``texts`` (strings or AnalysisContexts) from the
+        corpus-fitted similarity vectorizer, or None when it is not installed.
+        """
+        if self.similarity_vectorizer is None:
+            return None
+        return self.similarity_vectorizer.transform([AnalysisContext.of(text).cleaned for text in texts])
+
+    def _tfidf_similarity(self, text1, text2) -> float:
         try:
-            vectorizer = TfidfVectorizer(stop_words='english', max_features=5000)
-            tfidf_matrix = vectorizer.fit_transform([self.clean_resume(text1), self.clean_resume(text2)])
+            tfidf_matrix = self.vectorize([text1, text2])
+            if tfidf_matrix is None:
+                # No reference corpus installed: fall back to a two-document fit,
+                # whose IDF weights are only a rough approximation
+                vectorizer = TfidfVectorizer(stop_words='english', max_features=5000)
+                tfidf_matrix = vectorizer.fit_transform([AnalysisContext.of(text1).cleaned, AnalysisContext.of(text2).cleaned])
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
             return round(similarity * 100, 2)
-        except:
+        except Exception:
+            logger.exception("TF-IDF similarity failed")
             return 0.0
 
-    def _keyword_similarity(self, resume_text: str, job_description: str) -> float:
+    def _keyword_similarity(self, resume_text, job_description) -> float:
         try:
-            resume_keywords = set(re.findall(r'\b\w+\b', self.clean_resume(resume_text).lower()))
-            job_keywords = set(re.findall(r'\b\w+\b', self.clean_resume(job_description).lower()))
+            resume_keywords = AnalysisContext.of(resume_text).word_set
+            job_keywords = AnalysisContext.of(job_description).word_set
             
             if not resume_keywords or not job_keywords:
                 return 0.0
@@ -492,68 +563,58 @@ class JobMatchingSystem:
         except:
             return 0.0
 
-    def predict_job_roles(self, resume_text: str) -> Dict:
-        if self.clf_model and self.tfidf and self.encoder:
+    def predict_job_roles(self, resume_text) -> Dict:
+        ctx = AnalysisContext.of(resume_text)
+        if self.has_classifier:
             try:
-                cleaned_text = self.clean_resume(resume_text)
-                vectorized_text = self.tfidf.transform([cleaned_text])
-                prediction = self.clf_model.predict(vectorized_text)
-                probabilities = self.clf_model.predict_proba(vectorized_text)[0]
+                vectorized_text = self.tfidf.transform([ctx.cleaned])
+                if self.role_classifier is not None:
+                    top_indices, top_probabilities = self.role_classifier.top_k(vectorized_text, 5)
+                    top_indices, top_probabilities = top_indices[0], top_probabilities[0]
+                    # LabelEncoder.inverse_transform is classes_[indices] behind input validation
+                    roles = np.asarray(self.encoder.classes_)[top_indices]
+                else:
+                    probabilities = self.clf_model.predict_proba(vectorized_text)[0]
+                    top_indices = np.argsort(probabilities)[::-1][:5]
+                    top_probabilities = probabilities[top_indices]
+                    roles = self.encoder.inverse_transform(top_indices)
                 
-                top_indices = np.argsort(probabilities)[::-1][:5]
-                roles = self.encoder.inverse_transform(top_indices)
-                scores = [round(probabilities[i] * 100, 2) for i in top_indices]
+                scores = [round(float(p) * 100, 2) for p in top_probabilities]
                 
                 return {"roles": roles.tolist(), "scores": scores}
-            except:
-                print("CONSOLE: ML prediction failed, using fallback")
-        
-        return self._fallback_role_prediction(resume_text)
-
-    def _fallback_role_prediction(self, resume_text: str) -> Dict:
-        role_keywords = {
-            "Data Analyst": ["data", "analyst", "sql", "excel", "tableau", "power bi", "analysis", "reporting"],
-            "Software Engineer": ["software", "engineer", "developer", "programming", "code", "agile", "java", "python", "c++"],
-            "Frontend Developer": ["frontend", "ui", "ux", "html", "css", "javascript", "react", "angular", "vue"],
-            "Backend Developer": ["backend", "api", "server", "database", "node.js", "python", "java", "microservices"],
-            "Full Stack Developer": ["full stack", "fullstack", "frontend", "backend", "react", "node.js", "database"],
-            "Machine Learning Engineer": ["machine learning", "ml", "ai", "tensorflow", "pytorch", "scikit-learn", "deep learning"],
-            "DevOps Engineer": ["devops", "ci/cd", "docker", "kubernetes", "aws", "azure", "automation", "jenkins"],
-            "Business Analyst": ["business analyst", "requirements", "stakeholder", "process improvement", "erp", "crm"],
-            "Product Manager": ["product manager", "product owner", "roadmap", "user stories", "agile", "market research"],
-            "UI/UX Designer": ["ui/ux", "designer", "figma", "sketch", "adobe xd", "user interface", "user experience"],
-            "Data Scientist": ["data scientist", "statistics", "python", "r", "machine learning", "algorithms", "modeling"],
-            "Cybersecurity Analyst": ["cybersecurity", "security analyst", "infosec", "siem", "firewall", "penetration"],
-        }
-
-        text_lower = self.clean_resume(resume_text).lower()
-        role_scores = {}
-        
-        for role_name, keywords in role_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if re.search(r'\b' + re.escape(keyword) + r'\b', text_lower):
-                    score += 1
-            role_scores[role_name] = score
-        
-        sorted_roles = sorted(role_scores.items(), key=lambda x: x[1], reverse=True)
-        filtered_roles = [item for item in sorted_roles if item[1] > 0][:5]
+            except Exception:
+                logger.exception("Role classifier prediction failed (model_version=%s), using keyword fallback", self.model_version)
         
-        if not filtered_roles:
-            return {"roles": ["General Application"], "scores": [20]}
-            
-        roles = [role for role, _ in filtered_roles]
-        scores = [min(score * 20, 100) for _, score in filtered_roles]
-        
-        return {"roles": roles, "scores": scores}
+        return self._fallback_role_prediction(ctx)
 
-    def extract_keywords_analysis(self, resume_text: str, job_description: str) -> Dict:
+    def _fallback_role_prediction(self, resume_text) -> Dict:
+        return self._fallback_role_prediction_batch([resume_text])[0]
+
+    def _fallback_role_prediction_batch(self, resume_texts: List[Any]) -> List[Dict]:
+        # One automaton scan per document, then one matrix product for the whole batch
+        matched_terms = [
+            {hit.term for hit in self.keyword_matcher.find_all(AnalysisContext.of(text).cleaned, category='role')}
+            for text in resume_texts
+        ]
+        predictions = []
+        for counts in self.role_keywords.role_counts(matched_terms):
+            top_roles = self.role_keywords.top_roles(counts, limit=5)
+            if not top_roles:
+                predictions.append({"roles": ["General Application"], "scores": [20]})
+                continue
+            predictions.append({
+                "roles": [role for role, _ in top_roles],
+                "scores": [min(count * 20, 100) for _, count in top_roles],
+            })
+        return predictions
+
+    def extract_keywords_analysis(self, resume_text, job_description) -> Dict:
         if not job_description:
             return {"present_keywords": [], "missing_keywords": []}
             
         # Extract keywords from job description
-        job_words = set(re.findall(r'\b[a-zA-Z]{3,}\b', job_description.lower()))
-        resume_words = set(re.findall(r'\b[a-zA-Z]{3,}\b', resume_text.lower()))
+        job_words = AnalysisContext.of(job_description).alpha_set
+        resume_words = AnalysisContext.of(resume_text).alpha_set
         
         # Filter out common stop words
         stop_words = {'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'}
@@ -625,7 +686,12 @@ class JobMatchingSystem:
             
         return detailed_analysis
 
-    def generate_optimization_tips(self, parsed_data: Dict, job_description: str = None) -> List[str]:
+    def generate_optimization_tips(self, parsed_data: Dict, job_description=None,
+                                   keywords_analysis: Dict = None) -> List[str]:
+        """
+        ``keywords_analysis`` is the resume's ``extract_keywords_analysis``
+        against ``job_description`` when the caller already has it.
+        """
         tips = []
         
         # Check basic information completeness
@@ -663,7 +729,8 @@ class JobMatchingSystem:
             
         # Job-specific tips
         if job_description:
-            keywords_analysis = self.extract_keywords_analysis(str(parsed_data), job_description)
+            if keywords_analysis is None:
+                keywords_analysis = self.extract_keywords_analysis(parsed_data.get('full_text', ''), job_description)
             missing_keywords = keywords_analysis.get('missing_keywords', [])
             if missing_keywords:
                 tips.append(f"Consider incorporating these job-relevant keywords: {', '.join(missing_keywords[:5])}")
@@ -671,40 +738,181 @@ class JobMatchingSystem:
         return tips[:8]  # Limit to 8 tips
 
     def analyze_resume_complete(self, resume_text: str, job_description: str = None, 
-                              preferences: Dict = None) -> Dict:
-        if not resume_text or not resume_text.strip():
-            return {
-                "timestamp": datetime.now().isoformat(),
-                "error": "Resume text is empty. Please provide resume content.",
-                "parsed_resume": {},
-                "similarity_scores": {},
-                "role_predictions": {"roles": [], "scores": []},
-                "keywords_analysis": {"present_keywords": [], "missing_keywords": []},
-                "detailed_role_analysis": [],
-                "optimization_tips": [],
-                "analysis_summary": "Analysis failed due to empty resume."
-            }
+                              preferences: Dict = None, reuse: Dict = None,
+                              on_stage: Callable[[str, Dict], None] = None) -> Dict:
+        """
+        ``reuse`` carries results taken from an earlier analysis under the same
+        model version (``role_predictions``, and ``parsed_fields`` for
+        unchanged sections); those stages are skipped instead of recomputed.
+        
+        ``on_stage(stage, partial)`` is called with the parsed resume
+        (``'parsed'``) and the role predictions (``'roles_predicted'``) as
+        soon as each is ready.
+        """
+        # Every stage reads the same lazily-built tokens instead of re-cleaning the text
+        resume_ctx = AnalysisContext.of(resume_text)
+        if not resume_ctx.text.strip():
+            return self._empty_resume_analysis()
+        reuse = reuse or {}
+        on_stage = on_stage or (lambda stage, partial: None)
+        job_ctx = AnalysisContext(job_description) if job_description and job_description.strip() else None
         
         # Parse resume data
-        parsed_data = self.parse_resume(resume_text)
-        parsed_data['full_text'] = resume_text
+        with span('parse'):
+            parsed_data = self.parse_resume(resume_ctx, reuse=reuse.get('parsed_fields'))
+        on_stage('parsed', parsed_data)
         
         # Calculate similarity scores
         similarity_scores = {}
-        if job_description and job_description.strip():
-            similarity_scores = self.calculate_similarity_scores(resume_text, job_description)
+        if job_ctx:
+            with span('similarity'):
+                similarity_scores = self.calculate_similarity_scores(resume_ctx, job_ctx)
         
         # Predict job roles
-        role_predictions = self.predict_job_roles(resume_text)
+        with span('role_prediction'):
+            role_predictions = reuse.get('role_predictions') or self.predict_job_roles(resume_ctx)
+        on_stage('roles_predicted', role_predictions)
+        
+        with span('assembly'):
+            return self._assemble_analysis(resume_ctx, job_ctx, parsed_data, similarity_scores, role_predictions)
+
+    def analyze_resume_batch(self, resume_texts: List[str], job_descriptions=None,
+                             top_k: int = 5, parallel: bool = None) -> List[Dict]:
+        """
+        Analyze many resumes at once, returning one ``analyze_resume_complete``
+        style dict per input, in order.
+
+        ``job_descriptions`` may be None, a single description applied to every
+        resume, or a list aligned with ``resume_texts``. Role prediction and
+        TF-IDF similarity run as single matrix operations over the whole batch;
+        parsing is fanned out over the shared process pool for large batches.
+        """
+        n = len(resume_texts)
+        if job_descriptions is None or isinstance(job_descriptions, str):
+            job_descriptions = [job_descriptions] * n
+        if len(job_descriptions) != n:
+            raise ValueError("job_descriptions must be a string or a list aligned with resume_texts")
+
+        results: List[Dict] = [None] * n
+        indices, contexts, job_contexts = [], [], []
+        job_cache: Dict[str, AnalysisContext] = {}
+        for i, (text, job_description) in enumerate(zip(resume_texts, job_descriptions)):
+            if not text or not text.strip():
+                results[i] = self._empty_resume_analysis()
+                continue
+            indices.append(i)
+            contexts.append(AnalysisContext(text))
+            if job_description and job_description.strip():
+                # Identical descriptions share one context (and one vector below)
+                job_contexts.append(job_cache.setdefault(job_description, AnalysisContext(job_description)))
+            else:
+                job_contexts.append(None)
+
+        if not contexts:
+            return results
+
+        parsed = self._parse_batch(contexts, parallel)
+        role_predictions = self.predict_job_roles_batch(contexts, top_k=top_k)
+        similarity = self.calculate_similarity_scores_batch(contexts, job_contexts)
+
+        for pos, i in enumerate(indices):
+            results[i] = self._assemble_analysis(
+                contexts[pos], job_contexts[pos], parsed[pos], similarity[pos], role_predictions[pos]
+            )
+        return results
+
+    def _parse_batch(self, contexts: List[AnalysisContext], parallel: bool = None) -> List[Dict]:
+        if parallel is None:
+            parallel = len(contexts) >= self.BATCH_PARALLEL_MIN
+        if parallel:
+            from .worker_pool import pool_size, run_in_pool
+            chunksize = max(1, len(contexts) // (pool_size() * 4))
+            return run_in_pool(_parse_resume_in_worker, [ctx.text for ctx in contexts], chunksize=chunksize)
+        return [self.parse_resume(ctx) for ctx in contexts]
+
+    def predict_job_roles_batch(self, resume_texts: List[Any], top_k: int = 5) -> List[Dict]:
+        """One ``tfidf.transform`` and one ``predict_proba`` for the whole batch"""
+        contexts = [AnalysisContext.of(text) for text in resume_texts]
+        if self.has_classifier and contexts:
+            try:
+                vectorized = self.tfidf.transform([ctx.cleaned for ctx in contexts])
+                if self.role_classifier is not None:
+                    top_indices, top_probabilities = self.role_classifier.top_k(vectorized, top_k)
+                else:
+                    probabilities = self.clf_model.predict_proba(vectorized)
+                    k = min(top_k, probabilities.shape[1])
+                    top_indices = np.argsort(-probabilities, axis=1, kind='stable')[:, :k]
+                    top_probabilities = np.take_along_axis(probabilities, top_indices, axis=1)
+                roles = self.encoder.inverse_transform(top_indices.ravel()).reshape(top_indices.shape)
+                scores = np.round(top_probabilities * 100, 2)
+                return [
+                    {"roles": roles[row].tolist(), "scores": scores[row].tolist()}
+                    for row in range(len(contexts))
+                ]
+            except Exception:
+                logger.exception("Batch role prediction failed (model_version=%s), using keyword fallback", self.model_version)
+
+        return self._fallback_role_prediction_batch(contexts)
+
+    def calculate_similarity_scores_batch(self, resume_texts: List[Any], job_descriptions: List[Any]) -> List[Dict]:
+        """Pairwise resume/JD scores; every distinct text is vectorized exactly once"""
+        scores: List[Dict] = [{} for _ in resume_texts]
+        valid = []
+        for i, (resume, job) in enumerate(zip(resume_texts, job_descriptions)):
+            if job is None:
+                continue
+            resume_ctx, job_ctx = AnalysisContext.of(resume), AnalysisContext.of(job)
+            if resume_ctx and job_ctx:
+                valid.append((i, resume_ctx, job_ctx))
+            else:
+                scores[i] = {'tfidf_similarity': 0.0, 'keyword_similarity': 0.0, 'combined_score': 0.0}
+
+        tfidf_scores = self._tfidf_similarity_batch([r for _, r, _ in valid], [j for _, _, j in valid])
+        for (i, r, j), tfidf_score in zip(valid, tfidf_scores):
+            keyword_score = self._keyword_similarity(r, j)
+            scores[i] = {
+                'tfidf_similarity': tfidf_score,
+                'keyword_similarity': keyword_score,
+                'combined_score': round(tfidf_score * 0.6 + keyword_score * 0.4, 2),
+            }
+        return scores
+
+    def _tfidf_similarity_batch(self, resume_contexts: List[AnalysisContext], job_contexts: List[AnalysisContext]) -> List[float]:
+        if not resume_contexts:
+            return []
+        if self.similarity_vectorizer is None:
+            return [self._tfidf_similarity(r, j) for r, j in zip(resume_contexts, job_contexts)]
+
+        try:
+            from sklearn.preprocessing import normalize
+
+            job_rows, distinct_jobs, seen = [], [], {}
+            for job_ctx in job_contexts:
+                if id(job_ctx) not in seen:
+                    seen[id(job_ctx)] = len(distinct_jobs)
+                    distinct_jobs.append(job_ctx)
+                job_rows.append(seen[id(job_ctx)])
+
+            resume_matrix = normalize(self.vectorize(resume_contexts))
+            job_matrix = normalize(self.vectorize(distinct_jobs))
+            similarity = np.asarray(resume_matrix.multiply(job_matrix[job_rows]).sum(axis=1)).ravel()
+            return [round(float(value) * 100, 2) for value in similarity]
+        except Exception:
+            logger.exception("Batch TF-IDF similarity failed")
+            return [0.0] * len(resume_contexts)
+
+    def _assemble_analysis(self, resume_ctx: AnalysisContext, job_ctx: AnalysisContext, parsed_data: Dict,
+                           similarity_scores: Dict, role_predictions: Dict) -> Dict:
+        parsed_data['full_text'] = resume_ctx.text
         
         # Extract keywords analysis
-        keywords_analysis = self.extract_keywords_analysis(resume_text, job_description) if job_description else {"present_keywords": [], "missing_keywords": []}
+        keywords_analysis = self.extract_keywords_analysis(resume_ctx, job_ctx) if job_ctx else {"present_keywords": [], "missing_keywords": []}
         
         # Generate detailed role analysis
-        detailed_role_analysis = self.generate_detailed_role_analysis(resume_text, role_predictions)
+        detailed_role_analysis = self.generate_detailed_role_analysis(resume_ctx.text, role_predictions)
         
         # Generate optimization tips
-        optimization_tips = self.generate_optimization_tips(parsed_data, job_description)
+        optimization_tips = self.generate_optimization_tips(parsed_data, job_ctx, keywords_analysis)
         
         # Create analysis summary
         name = parsed_data.get('name', 'Candidate')
@@ -727,4 +935,28 @@ class JobMatchingSystem:
             "analysis_summary": analysis_summary
         }
         
-        return complete_analysis
\ No newline at end of file
+        return complete_analysis
+
+    def _empty_resume_analysis(self) -> Dict:
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "error": "Resume text is empty. Please provide resume content.",
+            "parsed_resume": {},
+            "similarity_scores": {},
+            "role_predictions": {"roles": [], "scores": []},
+            "keywords_analysis": {"present_keywords": [], "missing_keywords": []},
+            "detailed_role_analysis": [],
+            "optimization_tips": [],
+            "analysis_summary": "Analysis failed due to empty resume."
+        }
+
+
+_parse_only_system = None
+
+
+def _parse_resume_in_worker(resume_text: str) -> Dict:
+    """Process-pool entry point: parsing needs no model artifacts"""
+    global _parse_only_system
+    if _parse_only_system is None:
+        _parse_only_system = JobMatchingSystem()
+    return _parse_only_system.parse_resume(resume_text)
@@ -0,0 +1,168 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ExtractedTextCache, ExtractedTextCacheStats
+from .text_extraction import (
+    SUPPORTED_RESUME_MIMES, ExtractedText, extract_resume_text, extractor_order, resolve_budget, sniff_mime,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 500
+STATS_ID = 1
+# Counters are written to the shared stats row in batches, not on every lookup
+STATS_FLUSH_LOOKUPS = 100
+STATS_FLUSH_SECONDS = 30.0
+
+_pending = Counter()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def max_entries() -> int:
+    return getattr(settings, 'EXTRACTION_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+
+
+def count(**increments):
+    """Add to the shared hit/miss/eviction counters, creating their row on first use"""
+    changes = {name: F(name) + value for name, value in increments.items()}
+    if ExtractedTextCacheStats.objects.filter(pk=STATS_ID).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            ExtractedTextCacheStats.objects.create(pk=STATS_ID, **increments)
+    except IntegrityError:
+        # Another worker created it first
+        ExtractedTextCacheStats.objects.filter(pk=STATS_ID).update(**changes)
+
+
+def flush_stats():
+    """Write this process' pending counters to the shared stats row"""
+    global _last_flush
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+    try:
+        count(**pending)
+    except DatabaseError:
+        logger.exception("Extraction cache stats write failed")
+        with _pending_lock:
+            _pending.update(pending)
+
+
+def record(**increments):
+    """Add to this process' pending counters, flushing them every few lookups or seconds"""
+    with _pending_lock:
+        _pending.update(increments)
+        due = (_pending['hits'] + _pending['misses'] >= STATS_FLUSH_LOOKUPS
+               or time.monotonic() - _last_flush >= STATS_FLUSH_SECONDS)
+    if due:
+        flush_stats()
+
+
+@atexit.register
+def _flush_stats_at_exit():
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+    if not pending:
+        return
+    try:
+        count(**pending)
+    except DatabaseError as e:
+        # The database may already be gone at interpreter exit (a torn-down test database, say)
+        logger.warning("Dropped unflushed extraction cache stats at exit: %s", e)
+
+
+def extractor_key(mime: str) -> str:
+    """Installed backends for ``mime`` in order: a changed order or backend set misses the cache"""
+    return ','.join(extractor.name for extractor in extractor_order(mime))
+
+
+def get_cached_extraction(content_hash: str, max_pages: int, max_chars: int,
+                          extractors: str) -> Optional[ExtractedText]:
+    """The stored extraction of these bytes under this budget and backend order, marked as just used; None on a miss"""
+    entry = ExtractedTextCache.objects.filter(
+        content_hash=content_hash, max_pages=max_pages, max_chars=max_chars, extractors=extractors
+    ).first()
+    if entry is None:
+        record(misses=1)
+        return None
+    ExtractedTextCache.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=timezone.now())
+    record(hits=1)
+    return ExtractedText(
+        text=entry.text,
+        pages_read=entry.pages_read,
+        total_pages=entry.total_pages,
+        truncated=bool(entry.truncated_by),
+        truncated_by=entry.truncated_by or None,
+        mime=entry.mime or None,
+        backend=entry.backend or None,
+    )
+
+
+def store_extraction(content_hash: str, max_pages: int, max_chars: int, extractors: str,
+                     extracted: ExtractedText):
+    """Store one extraction, then evict least recently used entries once the table exceeds the bound"""
+    _, created = ExtractedTextCache.objects.update_or_create(
+        content_hash=content_hash, max_pages=max_pages, max_chars=max_chars, extractors=extractors,
+        defaults={
+            'text': extracted.text,
+            'mime': extracted.mime or '',
+            'backend': extracted.backend or '',
+            'pages_read': extracted.pages_read,
+            'total_pages': extracted.total_pages,
+            'truncated_by': extracted.truncated_by or '',
+            'last_used_at': timezone.now(),
+        },
+    )
+    if not created:
+        return
+    excess = ExtractedTextCache.objects.count() - max_entries()
+    if excess <= 0:
+        return
+    stale = list(ExtractedTextCache.objects.order_by('last_used_at', 'pk').values_list('pk', flat=True)[:excess])
+    ExtractedTextCache.objects.filter(pk__in=stale).delete()
+    record(evictions=len(stale))
+
+
+def extract_resume_text_cached(resume_file, content_hash: str, mime: str = None) -> ExtractedText:
+    """
+    ``extract_resume_text`` behind the extraction cache. Extraction depends
+    only on the bytes, the page/character budget and the backend order, so
+    re-analysing a file against another job description or model version
+    skips it. Cache failures fall back to extracting.
+    """
+    if mime is None:
+        mime = sniff_mime(resume_file)
+    if not max_entries() or mime not in SUPPORTED_RESUME_MIMES:
+        return extract_resume_text(resume_file, mime=mime)
+    max_pages, max_chars = resolve_budget()
+    extractors = extractor_key(mime)
+
+    try:
+        cached = get_cached_extraction(content_hash, max_pages, max_chars, extractors)
+    except DatabaseError:
+        logger.exception("Extraction cache lookup failed")
+        cached = None
+    if cached is not None:
+        return cached
+
+    extracted = extract_resume_text(resume_file, max_pages, max_chars, mime=mime)
+    try:
+        store_extraction(content_hash, max_pages, max_chars, extractors, extracted)
+    except DatabaseError:
+        logger.exception("Extraction cache write failed")
+    return extracted
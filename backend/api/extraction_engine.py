@@ -0,0 +1,144 @@
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+import regex
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MS = 250
+# Text whose longest line exceeds this has lost its line structure (typical
+# of PyPDF2 output) and goes straight to the linear-time patterns in 'auto'
+LINE_STRUCTURE_MAX_LINE = 400
+
+MODES = ('auto', 'full', 'linear')
+
+
+class ExtractionBudget:
+    """
+    Wall-clock allowance per extractor for one ``parse_resume`` call.
+
+    Every budgeted match charges the time it took to its extractor; once an
+    extractor has used its allowance further matching is cut short, the hit
+    is recorded in ``warnings`` and the extractor is marked ``exhausted``:
+    its remaining patterns run only in linear-time form, on a second
+    allowance of the same size. No extractor spends more than twice the
+    per-extractor budget.
+    """
+
+    def __init__(self, per_extractor_ms: float = None, mode: str = None):
+        if per_extractor_ms is None:
+            per_extractor_ms = getattr(settings, 'EXTRACTION_BUDGET_MS', DEFAULT_BUDGET_MS)
+        self.per_extractor = per_extractor_ms / 1000
+        self.mode = mode or getattr(settings, 'EXTRACTION_REGEX_MODE', 'auto')
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown extraction mode {self.mode!r}; expected one of {', '.join(MODES)}")
+        self.spent: Dict[str, float] = {}
+        # Separate allowance for linear passes after the extractor's budget ran out
+        self.linear_spent: Dict[str, float] = {}
+        self.exhausted: Set[str] = set()
+        self.warnings: List[Dict] = []
+
+    def _account(self, extractor: str) -> Dict[str, float]:
+        return self.linear_spent if extractor in self.exhausted else self.spent
+
+    def remaining(self, extractor: str) -> float:
+        return self.per_extractor - self._account(extractor).get(extractor, 0.0)
+
+    def charge(self, extractor: str, seconds: float):
+        account = self._account(extractor)
+        account[extractor] = account.get(extractor, 0.0) + seconds
+
+    def record(self, extractor: str, fallback: str = None):
+        warning = {'extractor': extractor, 'budget_ms': round(self.per_extractor * 1000), 'fallback': fallback}
+        if warning not in self.warnings:
+            logger.warning("Extraction budget of %.0f ms exhausted in %s", self.per_extractor * 1000, extractor)
+            self.warnings.append(warning)
+
+
+_current_budget: contextvars.ContextVar = contextvars.ContextVar('extraction_budget', default=None)
+
+
+@contextmanager
+def extraction_budget(per_extractor_ms: float = None, mode: str = None):
+    """Make a fresh ExtractionBudget current for every ``findall`` in the block"""
+    budget = ExtractionBudget(per_extractor_ms, mode)
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str, flags: int):
+    return regex.compile(pattern, flags)
+
+
+def has_line_structure(text: str) -> bool:
+    return max((len(line) for line in text.split('\n')), default=0) <= LINE_STRUCTURE_MAX_LINE
+
+
+def _findall(pattern: str, text: str, flags: int, extractor: str, budget: ExtractionBudget) -> Optional[List]:
+    """Budgeted ``re.findall``; None when the budget ran out mid-scan"""
+    remaining = budget.remaining(extractor)
+    if remaining <= 0:
+        return None
+    compiled = _compile(pattern, flags)
+    results = []
+    start = time.perf_counter()
+    try:
+        for match in compiled.finditer(text, timeout=remaining):
+            if compiled.groups == 0:
+                results.append(match.group(0))
+            elif compiled.groups == 1:
+                results.append(match.group(1) or '')
+            else:
+                results.append(match.groups(default=''))
+    except TimeoutError:
+        return None
+    finally:
+        budget.charge(extractor, time.perf_counter() - start)
+    return results
+
+
+def findall(pattern: str, text: str, flags: int = 0, extractor: str = 'default', linear: str = None) -> List:
+    """
+    ``re.findall`` drop-in that never runs past the current extractor's
+    budget.
+
+    ``linear`` is a line-bounded counterpart of ``pattern`` built from
+    possessive, bounded repeats that cannot backtrack catastrophically, so
+    its cost grows linearly with the text. It is used directly in
+    'linear' mode, in 'auto' mode for text without line structure, and,
+    in every mode, for the pattern that exhausted the budget and every
+    later pattern of the same extractor.
+    """
+    budget = _current_budget.get() or ExtractionBudget()
+    use_linear = linear is not None and (
+        extractor in budget.exhausted
+        or budget.mode == 'linear'
+        or (budget.mode == 'auto' and not has_line_structure(text))
+    )
+
+    if not use_linear:
+        if extractor in budget.exhausted:
+            # Exhausted and no linear form: the pattern is skipped
+            return []
+        results = _findall(pattern, text, flags, extractor, budget)
+        if results is not None:
+            return results
+        budget.record(extractor, fallback='linear' if linear else None)
+        budget.exhausted.add(extractor)
+        if linear is None:
+            return []
+
+    results = _findall(linear, text, flags, extractor, budget)
+    if results is None:
+        budget.record(extractor)
+        return []
+    return results
@@ -0,0 +1,125 @@
+import logging
+import threading
+from typing import Dict, List
+
+import numpy as np
+from django.db.models import Count, Max
+
+from .analysis_context import AnalysisContext
+from .model_registry import get_job_matching_system
+from .models import JobDescription
+from .vector_index import SparseVectorIndex, sparse_from_json, sparse_to_json, top_k
+
+logger = logging.getLogger(__name__)
+
+
+class SimilarityUnavailable(Exception):
+    """Raised when no corpus-fitted similarity vectorizer is installed"""
+
+
+def index_job_description(job: JobDescription, system=None, save: bool = True) -> JobDescription:
+    """Precompute the job description's TF-IDF vector and keyword set"""
+    from sklearn.preprocessing import normalize
+
+    system = system or get_job_matching_system()
+    ctx = AnalysisContext(job.description)
+    job.keywords = sorted(ctx.word_set)
+
+    vector = system.vectorize([ctx])
+    if vector is not None:
+        job.tfidf_vector = sparse_to_json(normalize(vector))
+        job.vector_version = system.model_version
+    else:
+        job.tfidf_vector = {}
+        job.vector_version = ''
+
+    if save and job.pk:
+        JobDescription.objects.filter(pk=job.pk).update(
+            keywords=job.keywords, tfidf_vector=job.tfidf_vector, vector_version=job.vector_version
+        )
+    return job
+
+
+class JobDescriptionIndex:
+    def __init__(self, signature: tuple, dim: int):
+        self.signature = signature
+        self.vectors = SparseVectorIndex(dim)
+        self.keywords: Dict[int, frozenset] = {}
+
+
+_job_index = None
+_job_index_lock = threading.Lock()
+
+
+def get_job_description_index(system=None) -> JobDescriptionIndex:
+    """
+    Process-wide matrix of every active job description's vector.
+
+    Rebuilt only when the library or the model version changes; rows whose
+    stored vector predates the current model version are re-indexed first.
+    """
+    global _job_index
+    system = system or get_job_matching_system()
+    active = JobDescription.objects.filter(is_active=True)
+    stats = active.aggregate(count=Count('id'), latest=Max('updated_at'))
+    signature = (system.model_version, stats['count'], stats['latest'])
+
+    if _job_index is not None and _job_index.signature == signature:
+        return _job_index
+
+    with _job_index_lock:
+        if _job_index is not None and _job_index.signature == signature:
+            return _job_index
+
+        stale = active.exclude(vector_version=system.model_version)
+        for job in stale.iterator():
+            index_job_description(job, system)
+
+        dim = len(system.similarity_vectorizer.vocabulary_)
+        index = JobDescriptionIndex(signature, dim)
+        rows = active.values_list('id', 'tfidf_vector', 'keywords').iterator()
+        items = []
+        for job_id, vector, keywords in rows:
+            items.append((job_id, sparse_from_json(vector, dim)))
+            index.keywords[job_id] = frozenset(keywords)
+        index.vectors.add_many(items)
+        _job_index = index
+        logger.info("Built job description index: %d openings, %d terms", len(index.vectors), dim)
+        return index
+
+
+def rank_job_descriptions(resume_text, k: int = 10) -> List[Dict]:
+    """Top-k saved job descriptions for one resume, best first"""
+    from sklearn.preprocessing import normalize
+
+    system = get_job_matching_system()
+    if system.similarity_vectorizer is None:
+        raise SimilarityUnavailable("No similarity vectorizer installed; run manage.py fit_similarity_vectorizer")
+
+    index = get_job_description_index(system)
+    if not len(index.vectors):
+        return []
+
+    ctx = AnalysisContext.of(resume_text)
+    query = normalize(system.vectorize([ctx]))
+    tfidf_scores = index.vectors.scores(query) * 100
+
+    resume_words = ctx.word_set
+    keyword_scores = np.zeros(len(index.vectors.ids), dtype=np.float32)
+    for pos, job_id in enumerate(index.vectors.ids):
+        job_words = index.keywords[job_id]
+        union = len(resume_words | job_words)
+        if union:
+            keyword_scores[pos] = len(resume_words & job_words) / union * 100
+
+    combined = tfidf_scores * 0.6 + keyword_scores * 0.4
+    results = []
+    for score, job_id in top_k(combined, k, index.vectors.ids):
+        pos = index.vectors.position(job_id)
+        results.append({
+            'job_id': job_id,
+            'tfidf_similarity': round(float(tfidf_scores[pos]), 2),
+            'keyword_similarity': round(float(keyword_scores[pos]), 2),
+            'combined_score': round(float(score), 2),
+        })
+    return results
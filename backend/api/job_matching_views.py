@@ -0,0 +1,152 @@
+from django.http import JsonResponse
+from rest_framework import generics
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from .models import JobDescription, ResumeAnalysis, UserRegisterData
+from .serializers import JobDescriptionSerializer
+from .analysis_core import UnreadableResume, read_uploaded_resume
+from .model_registry import get_job_matching_system
+
+MAX_TOP_K = 100
+
+
+class JobDescriptionListCreateView(generics.ListCreateAPIView):
+    """Browse the active job description library or save a new opening"""
+    serializer_class = JobDescriptionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = JobDescription.objects.filter(is_active=True).select_related('owner')
+        if self.request.query_params.get('mine'):
+            queryset = queryset.filter(owner=self.request.user)
+        return queryset
+
+    def perform_create(self, serializer):
+        from .job_library import index_job_description
+        job = serializer.save(owner=self.request.user)
+        index_job_description(job)
+
+
+class JobDescriptionDetailView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = JobDescriptionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return JobDescription.objects.filter(owner=self.request.user)
+
+    def perform_update(self, serializer):
+        from .job_library import index_job_description
+        job = serializer.save()
+        index_job_description(job)
+
+
+class JobMatchView(APIView):
+    """
+    Rank every saved job description against one resume.
+
+    Accepts either an uploaded ``resume`` file or the ``analysis_id`` of one
+    of the user's previous analyses, plus an optional ``top_k`` (default 10).
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
+
+    def post(self, request):
+        try:
+            k = min(max(int(request.data.get('top_k', 10)), 1), MAX_TOP_K)
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'top_k must be an integer'}, status=400)
+
+        analysis_id = request.data.get('analysis_id')
+        resume_file = request.FILES.get('resume')
+        if analysis_id:
+            analysis = ResumeAnalysis.objects.filter(user=request.user, pk=analysis_id).first()
+            if analysis is None:
+                return JsonResponse({'error': 'Analysis not found'}, status=404)
+            resume_text = (analysis.parsed_data or {}).get('full_text', '')
+        elif resume_file:
+            try:
+                resume_text = read_uploaded_resume(resume_file)
+            except UnreadableResume as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            except ValueError:
+                return JsonResponse({'error': 'Unsupported file type'}, status=400)
+        else:
+            return JsonResponse({'error': 'Provide a resume file or analysis_id'}, status=400)
+
+        if not resume_text.strip():
+            return JsonResponse({'error': 'Could not extract text from resume'}, status=400)
+
+        from .job_library import rank_job_descriptions, SimilarityUnavailable
+        try:
+            ranked = rank_job_descriptions(resume_text, k)
+        except SimilarityUnavailable as e:
+            return JsonResponse({'error': str(e)}, status=503)
+
+        jobs = JobDescription.objects.in_bulk([item['job_id'] for item in ranked])
+        matches = []
+        for item in ranked:
+            job = jobs.get(item['job_id'])
+            if job is None:
+                continue
+            matches.append({
+                **item,
+                'title': job.title,
+                'company': job.company,
+            })
+
+        return JsonResponse({'matches': matches, 'top_k': k})
+
+
+class CandidateSearchView(APIView):
+    """
+    HR candidate search: rank the requesting HR user's stored analyses
+    against a pasted job description, with cursor pagination.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, FormParser]
+
+    def post(self, request):
+        profile = getattr(request.user, 'profile', None)
+        if profile is None or profile.user_type != UserRegisterData.UserType.HR:
+            return JsonResponse({'error': 'Candidate search is available to HR users only'}, status=403)
+
+        job_description = (request.data.get('job_description') or '').strip()
+        if not job_description:
+            return JsonResponse({'error': 'job_description is required'}, status=400)
+        try:
+            limit = min(max(int(request.data.get('limit', 20)), 1), MAX_TOP_K)
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'limit must be an integer'}, status=400)
+
+        system = get_job_matching_system()
+        if system.similarity_vectorizer is None:
+            return JsonResponse({'error': 'No similarity vectorizer installed; run manage.py fit_similarity_vectorizer'}, status=503)
+
+        from .candidate_search import search_candidates, InvalidCursor
+        try:
+            page, next_cursor = search_candidates(request.user.id, job_description, limit, request.data.get('cursor'))
+        except InvalidCursor as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        analyses = ResumeAnalysis.objects.in_bulk([item['analysis_id'] for item in page])
+        candidates = []
+        for item in page:
+            analysis = analyses.get(item['analysis_id'])
+            if analysis is None:
+                continue
+            parsed_data = analysis.parsed_data or {}
+            analysis_results = analysis.analysis_results or {}
+            # Keyword overlap is only computed for the rows on this page
+            keyword_similarity = system._keyword_similarity(parsed_data.get('full_text', ''), job_description)
+            candidates.append({
+                **item,
+                'keyword_similarity': keyword_similarity,
+                'name': parsed_data.get('name', 'Not found'),
+                'email': parsed_data.get('email', 'Not found'),
+                'ats_score': analysis.ats_score,
+                'top_role': (analysis_results.get('role_predictions', {}).get('roles') or ['Not determined'])[0],
+                'analysis_time': analysis.analysis_time.isoformat(),
+            })
+
+        return JsonResponse({'candidates': candidates, 'next_cursor': next_cursor})
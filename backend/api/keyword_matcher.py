@@ -0,0 +1,132 @@
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+
+class KeywordHit(NamedTuple):
+    start: int
+    end: int
+    term: str
+    label: str
+    category: str
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a set of lowercase terms.
+
+    All skills, aliases and role keywords are compiled into one automaton so a
+    document is scanned once regardless of how many terms the taxonomy holds.
+    A hit is only reported on token boundaries: a term that starts (or ends)
+    with a word character must not be preceded (or followed) by one, which is
+    what the old per-term ``\\b...\\b`` regexes intended, and also lets terms
+    such as ``c++`` and ``c#`` match at the end of a word.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        self._payloads: Dict[str, List[tuple]] = {}
+        self._bounds: Dict[str, tuple] = {}
+        self._built = False
+
+    def add(self, term: str, label: str = None, category: str = None):
+        term = term.lower().strip()
+        if not term:
+            return
+        if self._built:
+            raise RuntimeError("KeywordMatcher is already built; create a new matcher to add terms")
+
+        payload = (label or term, category or '')
+        if term in self._payloads:
+            if payload not in self._payloads[term]:
+                self._payloads[term].append(payload)
+            return
+
+        node = 0
+        for ch in term:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(term)
+        self._payloads[term] = [payload]
+        self._bounds[term] = (_is_word_char(term[0]), _is_word_char(term[-1]))
+
+    def add_many(self, terms: Iterable[str], label: str = None, category: str = None):
+        for term in terms:
+            self.add(term, label=label, category=category)
+
+    def build(self) -> 'KeywordMatcher':
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            queue.append(node)
+
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                state = self._fail[node]
+                while state and ch not in self._goto[state]:
+                    state = self._fail[state]
+                fallback = self._goto[state].get(ch, 0)
+                self._fail[nxt] = fallback if fallback != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+        self._built = True
+        return self
+
+    def find_all(self, text: str, category: str = None) -> List[KeywordHit]:
+        """
+        Every boundary-respecting hit in ``text`` (expected lowercase), in
+        order of end offset. Offsets index into ``text`` itself.
+        """
+        if not self._built:
+            self.build()
+
+        goto, fail, out = self._goto, self._fail, self._out
+        payloads, bounds = self._payloads, self._bounds
+        length = len(text)
+        hits = []
+        node = 0
+
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+
+            end = i + 1
+            for term in out[node]:
+                start = end - len(term)
+                left_word, right_word = bounds[term]
+                if left_word and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if right_word and end < length and _is_word_char(text[end]):
+                    continue
+                for label, term_category in payloads[term]:
+                    if category is None or term_category == category:
+                        hits.append(KeywordHit(start, end, term, label, term_category))
+
+        return hits
+
+    def labels(self, text: str, category: str = None) -> List[str]:
+        """Distinct labels found in ``text``, in order of first occurrence"""
+        return list(dict.fromkeys(hit.label for hit in self.find_all(text, category)))
+
+    def terms_by_label(self, text: str, category: str = None) -> Dict[str, Set[str]]:
+        """Distinct matched terms grouped by label"""
+        grouped: Dict[str, Set[str]] = {}
+        for hit in self.find_all(text, category):
+            grouped.setdefault(hit.label, set()).add(hit.term)
+        return grouped
@@ -0,0 +1,80 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks import TARGETS, BenchmarkRunner, SyntheticResumeCorpus, benchmark_report, compare_reports
+from api.benchmarks.compare import DEFAULT_THRESHOLD
+from api.benchmarks.corpus import FORMATS, SECTIONS
+from api.model_registry import get_model_registry
+
+
+def _csv(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark resume parsing, similarity, role prediction, ATS scoring and the full "
+        "analysis view over a synthetic resume corpus; optionally compare against a baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=50, help="Resumes in the corpus")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--size', type=float, default=1.0,
+                            help="Content scale: 0.5 for short resumes, 3 for long ones")
+        parser.add_argument('--sections', type=_csv, default=list(SECTIONS),
+                            help=f"Comma-separated optional sections ({','.join(SECTIONS)})")
+        parser.add_argument('--section-probability', type=float, default=0.85)
+        parser.add_argument('--formats', type=_csv, default=['txt'],
+                            help=f"Comma-separated upload formats for the view ({','.join(FORMATS)})")
+        parser.add_argument('--targets', type=_csv, default=list(TARGETS),
+                            help=f"Comma-separated targets ({','.join(TARGETS)})")
+        parser.add_argument('--repeat', type=int, default=1)
+        parser.add_argument('--output', help="Write the JSON report here")
+        parser.add_argument('--baseline', help="Baseline report to compare against")
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help="Allowed p50/p95 slowdown as a fraction (0.15 = 15%%)")
+
+    def handle(self, *args, **options):
+        if options['count'] < 1:
+            raise CommandError("--count must be at least 1")
+        try:
+            corpus = SyntheticResumeCorpus(options['seed'], options['size'], options['sections'],
+                                           options['section_probability'])
+            resumes = list(corpus.resumes(options['count'], options['formats']))
+            job_descriptions = [corpus.job_description(i) for i in range(min(options['count'], 10))]
+            runner = BenchmarkRunner(get_model_registry().get_system(), resumes, job_descriptions,
+                                     options['repeat'], options['targets'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        report = benchmark_report(
+            runner.run(),
+            count=options['count'], seed=options['seed'], size=options['size'],
+            sections=options['sections'], formats=options['formats'], repeat=options['repeat'],
+            model_version=get_model_registry().model_version,
+        )
+
+        for target, stats in report['results'].items():
+            if not stats.get('count'):
+                self.stdout.write(f"{target:<55} no successful samples")
+                continue
+            self.stdout.write(
+                f"{target:<55} p50 {stats['p50']:>9.3f} ms  p95 {stats['p95']:>9.3f} ms  "
+                f"{stats['throughput_per_s'] or 0:>9.1f}/s"
+            )
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+            comparison = compare_reports(baseline, report, options['threshold'])
+            if comparison['regressions']:
+                for regression in comparison['regressions']:
+                    self.stderr.write(str(regression))
+                raise CommandError(f"{len(comparison['regressions'])} regression(s) against {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}"))
@@ -0,0 +1,127 @@
+import json
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks.corpus import FORMATS, SyntheticResumeCorpus
+from api.text_extraction import configured_extractor_order, registered_extractors, sniff_path
+
+
+def _csv(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def word_agreement(reference: str, text: str) -> float:
+    """Share of the reference text's words (with multiplicity) that ``text`` also contains"""
+    expected = Counter(reference.split())
+    if not expected:
+        return 1.0
+    return sum((expected & Counter(text.split())).values()) / sum(expected.values())
+
+
+class Command(BaseCommand):
+    help = (
+        "Time every installed text-extraction backend on synthetic (and optionally real) "
+        "resumes of each format and report the fastest one that agrees with the current "
+        "preferred backend; --write makes that order the one uploads use"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10, help="Synthetic resumes per format")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--size', type=float, default=1.0)
+        parser.add_argument('--formats', type=_csv, default=list(FORMATS),
+                            help=f"Comma-separated synthetic formats ({','.join(FORMATS)})")
+        parser.add_argument('--files', nargs='*', default=[], metavar='PATH',
+                            help="Real resumes to include (recommended: synthetic PDFs are far simpler than "
+                                 "real ones); their format is sniffed from the content")
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--min-agreement', type=float, default=0.9,
+                            help="Word agreement with the preferred backend needed to be chosen")
+        parser.add_argument('--write', action='store_true',
+                            help="Store the chosen order in RESUME_EXTRACTORS_FILE")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            samples = defaultdict(list)
+            corpus = SyntheticResumeCorpus(options['seed'], options['size'])
+            try:
+                resumes = list(corpus.resumes(options['count'] * len(options['formats']), options['formats']))
+            except ValueError as e:
+                raise CommandError(str(e))
+            for resume in resumes:
+                path = os.path.join(directory, resume.name)
+                with open(path, 'wb') as f:
+                    f.write(resume.payload)
+                samples[sniff_path(path)].append(path)
+            for path in options['files']:
+                mime = sniff_path(path)
+                if mime is None:
+                    raise CommandError(f"{path}: not a PDF, DOCX or text resume")
+                samples[mime].append(path)
+
+            configured = configured_extractor_order()
+            chosen = {}
+            measured = {}
+            for mime, paths in samples.items():
+                self.stdout.write(f"\n{mime} ({len(paths)} files)")
+                preferred = configured.get(mime, [])
+                rows = self._measure(mime, paths, options['repeat'])
+                if not rows:
+                    self.stderr.write(f"  no backend could extract {mime}")
+                    continue
+
+                reference = next((row for name in preferred for row in rows if row['name'] == name), rows[0])
+                for row in rows:
+                    row['agreement'] = statistics.mean(
+                        word_agreement(expected, text) for expected, text in zip(reference['texts'], row['texts'])
+                    )
+                    self.stdout.write(
+                        f"  {row['name']:<14} p50 {row['p50_ms']:>9.3f} ms  total {row['total_ms']:>10.1f} ms  "
+                        f"agreement {row['agreement']:>6.1%}"
+                    )
+
+                eligible = sorted((row for row in rows if row['agreement'] >= options['min_agreement']),
+                                  key=lambda row: row['p50_ms'])
+                order = [row['name'] for row in eligible]
+                order += [name for name in preferred if name not in order]
+                chosen[mime] = order
+                measured[mime] = {row['name']: {'p50_ms': round(row['p50_ms'], 3),
+                                                'agreement': round(row['agreement'], 4)} for row in rows}
+                self.stdout.write(f"  fastest: {order[0]}")
+
+        if options['write']:
+            path = getattr(settings, 'RESUME_EXTRACTORS_FILE', None)
+            if not path:
+                raise CommandError("RESUME_EXTRACTORS_FILE is not configured")
+            with open(path, 'w') as f:
+                json.dump({'order': chosen, 'measured': measured}, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote extractor order to {path}"))
+
+    def _measure(self, mime, paths, repeat):
+        rows = []
+        for extractor in registered_extractors(mime):
+            if not extractor.available():
+                self.stdout.write(f"  {extractor.name:<14} not installed")
+                continue
+            samples_ms = []
+            try:
+                # Untimed pass: library imports and first-use caches are not per-file costs
+                extractor.extract(paths[0], None, None, False)
+                for _ in range(max(1, repeat)):
+                    texts = []
+                    for path in paths:
+                        start = time.perf_counter()
+                        texts.append(extractor.extract(path, None, None, False).text)
+                        samples_ms.append((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                self.stdout.write(f"  {extractor.name:<14} failed: {e}")
+                continue
+            rows.append({'name': extractor.name, 'texts': texts, 'p50_ms': statistics.median(samples_ms),
+                         'total_ms': sum(samples_ms) / max(1, repeat)})
+        return rows
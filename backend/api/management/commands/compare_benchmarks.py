@@ -0,0 +1,38 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks import compare_reports
+from api.benchmarks.compare import DEFAULT_THRESHOLD
+
+
+class Command(BaseCommand):
+    help = "Compare two benchmark_analysis reports and fail on p50/p95 regressions"
+
+    def add_arguments(self, parser):
+        parser.add_argument('baseline')
+        parser.add_argument('current')
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help="Allowed slowdown as a fraction (0.15 = 15%%)")
+
+    def handle(self, *args, **options):
+        reports = []
+        for path in (options['baseline'], options['current']):
+            try:
+                with open(path) as f:
+                    reports.append(json.load(f))
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read report {path}: {e}")
+
+        comparison = compare_reports(*reports, threshold=options['threshold'])
+        for row in comparison['rows']:
+            cells = [f"{stat} {before:.3f} -> {after:.3f} ms" for stat, (before, after) in row['stats'].items()]
+            self.stdout.write(f"{row['target']:<55} {'   '.join(cells)}")
+        for target in comparison['missing']:
+            self.stdout.write(self.style.WARNING(f"{target}: missing from current report"))
+
+        if comparison['regressions']:
+            for regression in comparison['regressions']:
+                self.stderr.write(str(regression))
+            raise CommandError(f"{len(comparison['regressions'])} regression(s) over {options['threshold']:.0%}")
+        self.stdout.write(self.style.SUCCESS("No regressions"))
@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from api.model_arrays import ArrayArtifactError
+from api.model_registry import ModelArtifactError, ModelRegistry, save_array_artifact
+
+SAMPLE_TEXT = (
+    "Senior software engineer with python django sql aws docker kubernetes experience, "
+    "machine learning pipelines, react frontend and rest api design"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Export the pickled model artifacts as memory-mapped .npy arrays so every worker "
+        "shares one copy through the page cache; the registry prefers them once present"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model-dir', default=None)
+
+    def handle(self, *args, **options):
+        registry = ModelRegistry(options['model_dir'], strict=False)
+        registry.use_arrays = False
+        filenames = {**registry.ARTIFACTS, **registry.OPTIONAL_ARTIFACTS}
+        expected = registry._read_manifest().get('artifacts', {})
+
+        exported = {}
+        for key, filename in filenames.items():
+            path = os.path.join(registry.model_dir, filename)
+            if not os.path.exists(path):
+                self.stdout.write(self.style.WARNING(f"{filename}: not found, skipped"))
+                continue
+            try:
+                model = registry._load_artifact(path, expected.get(filename))
+                digest = save_array_artifact(filename, model, registry.model_dir)
+            except (ModelArtifactError, ArrayArtifactError) as e:
+                raise CommandError(f"{filename}: {e}")
+            exported[key] = model
+            self.stdout.write(f"{filename} -> {registry.array_filename(filename)} (sha256 {digest[:12]})")
+
+        if not exported:
+            raise CommandError(f"No pickled artifacts found in {registry.model_dir}")
+
+        # The arrays must reproduce the pickles before workers switch over
+        reloaded = ModelRegistry(registry.model_dir, strict=True)
+        reloaded._ensure_loaded()
+        for key in ('tfidf', 'similarity_vectorizer'):
+            if key in exported:
+                expected_rows = exported[key].transform([SAMPLE_TEXT]).toarray()
+                actual_rows = reloaded.models[key].transform([SAMPLE_TEXT]).toarray()
+                if not np.allclose(expected_rows, actual_rows):
+                    raise CommandError(f"{key}: exported arrays do not reproduce the pickled vectorizer")
+        if 'clf_model' in exported and 'tfidf' in exported:
+            features = exported['tfidf'].transform([SAMPLE_TEXT])
+            if not np.allclose(exported['clf_model'].predict_proba(features),
+                               reloaded.models['clf_model'].predict_proba(features)):
+                raise CommandError("clf_model: exported arrays do not reproduce the pickled classifier")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {len(exported)} artifacts; model version is now {reloaded.model_version}. "
+            f"Restart workers to pick them up."
+        ))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from api.extraction_cache import STATS_FLUSH_SECONDS, STATS_ID, flush_stats, max_entries
+from api.models import ExtractedTextCache, ExtractedTextCacheStats
+
+
+class Command(BaseCommand):
+    help = "Report the extracted-text cache: hit rate since the last reset, entries and stored text size"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=0, help="Also list the N most reused entries")
+        parser.add_argument('--reset', action='store_true', help="Zero the hit/miss/eviction counters afterwards")
+        parser.add_argument('--clear', action='store_true', help="Delete every cached extraction afterwards")
+
+    def handle(self, *args, **options):
+        flush_stats()
+        stats = ExtractedTextCacheStats.objects.filter(pk=STATS_ID).first() or ExtractedTextCacheStats()
+        lookups = stats.hits + stats.misses
+        entries = ExtractedTextCache.objects.aggregate(
+            count=Count('pk'), characters=Sum(Length('text')),
+            oldest=Min('last_used_at'), newest=Max('last_used_at'),
+        )
+        limit = max_entries()
+
+        self.stdout.write(f"Counters since {stats.reset_at:%Y-%m-%d %H:%M} "
+                          f"(running workers add theirs every {STATS_FLUSH_SECONDS:.0f}s)")
+        self.stdout.write(f"  lookups    {lookups}")
+        self.stdout.write(f"  hits       {stats.hits}")
+        self.stdout.write(f"  misses     {stats.misses}")
+        self.stdout.write(f"  hit rate   {stats.hits / lookups:.1%}" if lookups else "  hit rate   n/a")
+        self.stdout.write(f"  evictions  {stats.evictions}")
+        self.stdout.write(f"Entries      {entries['count']} / {limit if limit else 'disabled'}")
+        self.stdout.write(f"Stored text  {(entries['characters'] or 0) / 1_000_000:.2f} M characters")
+        if entries['count']:
+            self.stdout.write(f"Last used    {entries['oldest']:%Y-%m-%d %H:%M} .. {entries['newest']:%Y-%m-%d %H:%M}")
+
+        if options['top']:
+            self.stdout.write("\nMost reused:")
+            for entry in ExtractedTextCache.objects.order_by('-hits', '-last_used_at')[:options['top']]:
+                self.stdout.write(
+                    f"  {entry.content_hash[:12]}  {entry.hits:>6} hits  {len(entry.text):>8} chars  "
+                    f"{entry.backend or '-':<12} {entry.pages_read}/{entry.total_pages or '-'} pages"
+                )
+
+        if options['reset']:
+            ExtractedTextCacheStats.objects.update_or_create(
+                pk=STATS_ID, defaults={'hits': 0, 'misses': 0, 'evictions': 0, 'reset_at': timezone.now()}
+            )
+            self.stdout.write(self.style.SUCCESS("Counters reset"))
+        if options['clear']:
+            deleted, _ = ExtractedTextCache.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} cached extractions"))
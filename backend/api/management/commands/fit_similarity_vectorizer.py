@@ -0,0 +1,71 @@
+import os
+import pickle
+
+from django.core.management.base import BaseCommand, CommandError
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from api.analysis_context import clean_text
+from api.model_registry import ModelRegistry, save_array_artifact, save_artifact
+
+
+class Command(BaseCommand):
+    help = (
+        "Fit the JD/resume similarity TF-IDF vectorizer once on a reference corpus "
+        "and store it with the model artifacts"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', action='append', default=[],
+                            help="Directory of .txt resumes / job descriptions (repeatable)")
+        parser.add_argument('--from-db', action='store_true',
+                            help="Also use stored ResumeAnalysis texts and job descriptions")
+        parser.add_argument('--max-features', type=int, default=20000)
+        parser.add_argument('--min-df', type=int, default=2)
+        parser.add_argument('--model-dir', default=None)
+
+    def handle(self, *args, **options):
+        documents = []
+        for directory in options['corpus']:
+            documents.extend(self._read_directory(directory))
+        if options['from_db']:
+            documents.extend(self._read_database())
+
+        documents = [doc for doc in (clean_text(d) for d in documents) if doc]
+        if len(documents) < 2:
+            raise CommandError("Need at least two non-empty documents to fit the vectorizer")
+
+        vectorizer = TfidfVectorizer(
+            stop_words='english',
+            max_features=options['max_features'],
+            min_df=min(options['min_df'], len(documents)),
+            sublinear_tf=True,
+        )
+        vectorizer.fit(documents)
+
+        filename = ModelRegistry.OPTIONAL_ARTIFACTS['similarity_vectorizer']
+        digest = save_artifact(filename, pickle.dumps(vectorizer), options['model_dir'])
+        # Refresh the memory-mapped copy too, which the registry would otherwise prefer
+        save_array_artifact(filename, vectorizer, options['model_dir'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Fitted on {len(documents)} documents, {len(vectorizer.vocabulary_)} terms; "
+            f"wrote {filename} (sha256 {digest[:12]}). Restart workers to pick it up."
+        ))
+
+    def _read_directory(self, directory):
+        if not os.path.isdir(directory):
+            raise CommandError(f"Corpus directory not found: {directory}")
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.lower().endswith('.txt'):
+                    with open(os.path.join(root, name), 'r', encoding='utf-8', errors='ignore') as f:
+                        yield f.read()
+
+    def _read_database(self):
+        from api.models import ResumeAnalysis
+
+        rows = ResumeAnalysis.objects.values_list('parsed_data', 'job_description').iterator()
+        for parsed_data, job_description in rows:
+            if isinstance(parsed_data, dict) and parsed_data.get('full_text'):
+                yield parsed_data['full_text']
+            if job_description:
+                yield job_description
@@ -0,0 +1,54 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+STARTUP_CODE = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the import cost of a fresh worker (django.setup() plus URLConf loading) "
+        "with python -X importtime, grouped by top-level package, slowest first"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help="Rows per table")
+        parser.add_argument('--also-import', action='append', default=[], metavar='MODULE',
+                            help="Additionally import MODULE after start-up (repeatable), "
+                                 "e.g. api.dummy to see what the first analysis request pays")
+
+    def handle(self, *args, **options):
+        code = STARTUP_CODE + ''.join(f"; import {module}" for module in options['also_import'])
+        env = {**os.environ, 'PYTHONPATH': os.pathsep.join(path for path in sys.path if path)}
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                capture_output=True, text=True, env=env)
+        if result.returncode != 0:
+            raise CommandError(f"Start-up failed:\n{result.stderr[-2000:]}")
+
+        by_package = defaultdict(int)
+        project_modules = []
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if not match:
+                continue
+            self_us, cumulative_us, module = int(match.group(1)), int(match.group(2)), match.group(4)
+            by_package[module.split('.')[0]] += self_us
+            if module == 'api' or module.startswith('api.'):
+                project_modules.append((cumulative_us, module))
+
+        total_us = sum(by_package.values())
+        self.stdout.write(f"Total import time: {total_us / 1000:.1f} ms across {len(by_package)} packages\n")
+        self.stdout.write("Slowest packages (self time):")
+        for package, us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:options['top']]:
+            self.stdout.write(f"  {package:<40} {us / 1000:>9.1f} ms  {us / total_us:>6.1%}")
+        self.stdout.write("\nSlowest project modules (cumulative, including what they import):")
+        for us, module in sorted(project_modules, reverse=True)[:options['top']]:
+            self.stdout.write(f"  {module:<40} {us / 1000:>9.1f} ms")
@@ -0,0 +1,76 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Nothing at module level may touch Django models: spawned worker processes
+# import this module (to find _worker_process) before Django is set up
+
+
+def _worker_process(index, poll_interval, burst):
+    import django
+    django.setup()
+
+    from api.analysis_jobs import run_worker, worker_name
+
+    try:
+        run_worker(f"{worker_name()}/{index}", poll_interval, burst)
+    except KeyboardInterrupt:
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Run job-mode resume analyses (POST /api/resume/analyze/ with async=1) from the "
+        "database queue on a pool of worker processes; no external broker is needed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=None,
+                            help="Worker processes (default ANALYSIS_JOB_WORKERS, or one per spare CPU)")
+        parser.add_argument('--poll-interval', type=float, default=None,
+                            help="Seconds between queue polls while idle (default ANALYSIS_JOB_POLL_INTERVAL)")
+        parser.add_argument('--burst', action='store_true',
+                            help="Exit once the queue is empty instead of waiting for new jobs")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        from api.analysis_jobs import run_worker, worker_name
+        from api.worker_pool import pool_size
+
+        processes = options['processes'] or getattr(settings, 'ANALYSIS_JOB_WORKERS', 0) or pool_size()
+        if processes < 1:
+            raise CommandError("--processes must be at least 1")
+
+        if processes == 1:
+            self.stdout.write(f"Analysis worker {worker_name()} waiting for jobs")
+            try:
+                ran = run_worker(poll_interval=options['poll_interval'], burst=options['burst'])
+            except KeyboardInterrupt:
+                return
+            self.stdout.write(self.style.SUCCESS(f"Ran {ran} analysis jobs"))
+            return
+
+        # Same start method as the shared analysis pool; each worker sets up Django itself
+        context = multiprocessing.get_context(getattr(settings, 'ANALYSIS_POOL_START_METHOD', 'spawn'))
+        workers = [
+            context.Process(target=_worker_process, args=(index, options['poll_interval'], options['burst']),
+                            name=f"analysis-worker-{index}")
+            for index in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {processes} analysis workers")
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            # The workers got the same SIGINT; give them a moment to finish up
+            for worker in workers:
+                worker.join(timeout=10)
+                if worker.is_alive():
+                    worker.terminate()
+        failed = [worker.name for worker in workers if worker.exitcode]
+        if failed:
+            raise CommandError(f"Workers exited with errors: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS("Analysis workers stopped"))
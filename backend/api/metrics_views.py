@@ -0,0 +1,68 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List
+
+from django.http import JsonResponse
+from django.utils import timezone
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from .models import ResumeAnalysis
+
+PERCENTILES = (50, 90, 95, 99)
+MAX_SAMPLE = 20000
+
+
+def summarize_timings(samples: List[float]) -> Dict:
+    import numpy as np
+
+    values = np.asarray(samples, dtype=np.float64)
+    summary = {'count': int(values.size), 'mean': round(float(values.mean()), 3), 'max': round(float(values.max()), 3)}
+    for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f'p{q}'] = round(float(value), 3)
+    return summary
+
+
+class AnalysisMetricsView(APIView):
+    """
+    Per-stage latency percentiles (milliseconds) over recent resume analyses,
+    e.g. ``GET /api/admin/metrics/analysis/?hours=24&model_version=sha-1234``.
+    Stages are sorted slowest p95 first.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            hours = max(int(request.query_params.get('hours', 24)), 1)
+            limit = min(max(int(request.query_params.get('limit', 5000)), 1), MAX_SAMPLE)
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'hours and limit must be integers'}, status=400)
+
+        analyses = ResumeAnalysis.objects.filter(
+            analysis_time__gte=timezone.now() - timedelta(hours=hours),
+            processing_time__gt=0,
+        )
+        model_version = request.query_params.get('model_version')
+        if model_version:
+            analyses = analyses.filter(model_version=model_version)
+        rows = analyses.order_by('-id').values_list('stage_timings', 'processing_time')[:limit]
+
+        stage_samples = defaultdict(list)
+        totals = []
+        for stage_timings, processing_time in rows:
+            totals.append(processing_time * 1000)
+            for stage, ms in (stage_timings or {}).items():
+                stage_samples[stage].append(ms)
+
+        if not totals:
+            return JsonResponse({'window_hours': hours, 'sample_size': 0, 'total_ms': None, 'stages': {}})
+
+        stages = {stage: summarize_timings(samples) for stage, samples in stage_samples.items()}
+        stages = dict(sorted(stages.items(), key=lambda item: item[1]['p95'], reverse=True))
+        return JsonResponse({
+            'window_hours': hours,
+            'model_version': model_version,
+            'sample_size': len(totals),
+            'total_ms': summarize_timings(totals),
+            'stages': stages,
+        })
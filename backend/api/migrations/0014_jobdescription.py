@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_analysishistory_atsscorebreakdown_keywordanalysis_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDescription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('company', models.CharField(blank=True, max_length=200)),
+                ('description', models.TextField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('tfidf_vector', models.JSONField(default=dict)),
+                ('keywords', models.JSONField(default=list)),
+                ('vector_version', models.CharField(blank=True, max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_descriptions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['is_active', 'updated_at'], name='api_jobdesc_is_acti_43958f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_jobdescription'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='tfidf_vector',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='vector_version',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_resumeanalysis_tfidf_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='resumeanalysis',
+            index=models.Index(fields=['content_hash'], name='api_resumea_content_9d1e42_idx'),
+        ),
+    ]
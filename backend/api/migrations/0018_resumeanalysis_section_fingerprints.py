@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_resumeanalysis_simhash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='section_fingerprints',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
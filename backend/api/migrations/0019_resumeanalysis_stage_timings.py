@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_resumeanalysis_section_fingerprints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='stage_timings',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
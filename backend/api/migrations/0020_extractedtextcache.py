@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:33
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_resumeanalysis_stage_timings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtractedTextCacheStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hits', models.PositiveBigIntegerField(default=0)),
+                ('misses', models.PositiveBigIntegerField(default=0)),
+                ('evictions', models.PositiveBigIntegerField(default=0)),
+                ('reset_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ExtractedTextCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('max_pages', models.PositiveIntegerField()),
+                ('max_chars', models.PositiveIntegerField()),
+                ('text', models.TextField()),
+                ('mime', models.CharField(blank=True, max_length=100)),
+                ('backend', models.CharField(blank=True, max_length=50)),
+                ('pages_read', models.PositiveIntegerField(default=0)),
+                ('total_pages', models.PositiveIntegerField(blank=True, null=True)),
+                ('truncated_by', models.CharField(blank=True, max_length=20)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='api_extract_last_us_c6f6de_idx')],
+                'constraints': [models.UniqueConstraint(fields=('content_hash', 'max_pages', 'max_chars'), name='unique_extraction_per_budget')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-18 06:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_analysisjobevent'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='extractedtextcache',
+            name='unique_extraction_per_budget',
+        ),
+        migrations.AddField(
+            model_name='extractedtextcache',
+            name='extractors',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AddConstraint(
+            model_name='extractedtextcache',
+            constraint=models.UniqueConstraint(fields=('content_hash', 'max_pages', 'max_chars', 'extractors'), name='unique_extraction_per_budget_and_backends'),
+        ),
+    ]
@@ -0,0 +1,339 @@
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+META_NAME = 'meta.json'
+FORMAT_VERSION = 1
+
+# TfidfVectorizer parameters that shape transform(); everything else is fit-time only
+VECTORIZER_PARAMS = ('input', 'encoding', 'decode_error', 'strip_accents', 'lowercase', 'token_pattern',
+                     'stop_words', 'ngram_range', 'analyzer', 'binary', 'norm', 'use_idf', 'smooth_idf',
+                     'sublinear_tf')
+
+
+class ArrayArtifactError(Exception):
+    """Raised when a model cannot be exported to, or loaded from, array files"""
+
+
+def _load_array(directory: str, name: str) -> np.ndarray:
+    # Read-only memory map: every worker on the host shares the same page-cache pages
+    return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r', allow_pickle=False)
+
+
+def _as_text_array(values) -> np.ndarray:
+    return np.asarray([str(value) for value in values], dtype=str)
+
+
+class ArrayVocabulary(Mapping):
+    """
+    Read-only ``term -> feature index`` mapping over sorted term arrays, so
+    the vocabulary lives in shared memory instead of a per-process dict.
+    """
+
+    def __init__(self, sorted_terms: np.ndarray, sorted_indices: np.ndarray):
+        self.sorted_terms = sorted_terms
+        self.sorted_indices = sorted_indices
+
+    def __len__(self) -> int:
+        return len(self.sorted_terms)
+
+    def __iter__(self):
+        return (str(term) for term in self.sorted_terms)
+
+    def __getitem__(self, term: str) -> int:
+        indices = self.lookup([term])
+        if indices[0] < 0:
+            raise KeyError(term)
+        return int(indices[0])
+
+    def lookup(self, terms: Iterable[str]) -> np.ndarray:
+        """Feature index of every term, -1 for terms outside the vocabulary"""
+        terms = np.asarray(list(terms), dtype=str)
+        if not len(terms) or not len(self.sorted_terms):
+            return np.full(len(terms), -1, dtype=np.int64)
+        positions = np.searchsorted(self.sorted_terms, terms)
+        positions = np.minimum(positions, len(self.sorted_terms) - 1)
+        found = self.sorted_terms[positions] == terms
+        return np.where(found, self.sorted_indices[positions], -1).astype(np.int64)
+
+
+class ArrayTfidfVectorizer:
+    """
+    ``TfidfVectorizer.transform`` over memory-mapped vocabulary and IDF
+    arrays. Tokenization is sklearn's own analyzer, so the output matches
+    the fitted vectorizer it was exported from.
+    """
+
+    kind = 'tfidf'
+
+    def __init__(self, params: Dict, vocabulary: ArrayVocabulary, idf: np.ndarray, dtype: str = 'float64'):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        params = dict(params)
+        params['ngram_range'] = tuple(params['ngram_range'])
+        self.params = params
+        self.vocabulary_ = vocabulary
+        self.idf_ = idf
+        self.dtype = np.dtype(dtype)
+        self._analyzer = TfidfVectorizer(**params).build_analyzer()
+
+    def transform(self, documents: List[str]) -> sparse.csr_matrix:
+        indptr, indices, counts = [0], [], []
+        for document in documents:
+            terms, term_counts = np.unique(np.asarray(self._analyzer(document), dtype=str), return_counts=True)
+            feature_ids = self.vocabulary_.lookup(terms)
+            known = feature_ids >= 0
+            indices.append(feature_ids[known])
+            counts.append(term_counts[known])
+            indptr.append(indptr[-1] + int(known.sum()))
+
+        matrix = sparse.csr_matrix(
+            (np.concatenate(counts or [[]]).astype(self.dtype), np.concatenate(indices or [[]]).astype(np.int32), indptr),
+            shape=(len(documents), len(self.vocabulary_)),
+        )
+        matrix.sort_indices()
+        if self.params['binary']:
+            matrix.data.fill(1)
+        if self.params['sublinear_tf']:
+            np.log(matrix.data, matrix.data)
+            matrix.data += 1
+        if self.params['use_idf']:
+            matrix.data *= np.asarray(self.idf_)[matrix.indices]
+        if self.params['norm']:
+            from sklearn.preprocessing import normalize
+            matrix = normalize(matrix, norm=self.params['norm'], copy=False)
+        return matrix
+
+    @classmethod
+    def export(cls, vectorizer, directory: str) -> Dict:
+        if not hasattr(vectorizer, 'vocabulary_') or not hasattr(vectorizer, 'idf_'):
+            raise ArrayArtifactError(f"{type(vectorizer).__name__} is not a fitted TfidfVectorizer")
+        params = vectorizer.get_params()
+        if callable(params.get('analyzer')) or params.get('tokenizer') or params.get('preprocessor'):
+            raise ArrayArtifactError("Vectorizers with custom analyzer/tokenizer/preprocessor callables cannot be exported")
+        stop_words = params['stop_words']
+        if stop_words is not None and not isinstance(stop_words, str):
+            stop_words = sorted(stop_words)
+
+        terms = sorted(vectorizer.vocabulary_)
+        np.save(os.path.join(directory, 'terms.npy'), _as_text_array(terms))
+        np.save(os.path.join(directory, 'term_indices.npy'),
+                np.asarray([vectorizer.vocabulary_[term] for term in terms], dtype=np.int64))
+        np.save(os.path.join(directory, 'idf.npy'), np.asarray(vectorizer.idf_))
+        return {
+            'params': {**{key: params[key] for key in VECTORIZER_PARAMS}, 'stop_words': stop_words},
+            'dtype': np.dtype(params['dtype']).name,
+        }
+
+    @classmethod
+    def load(cls, directory: str, meta: Dict) -> 'ArrayTfidfVectorizer':
+        vocabulary = ArrayVocabulary(_load_array(directory, 'terms'), _load_array(directory, 'term_indices'))
+        return cls(meta['params'], vocabulary, _load_array(directory, 'idf'), meta.get('dtype', 'float64'))
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    exp = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _sigmoid(scores: np.ndarray) -> np.ndarray:
+    # Overflow-free logistic function
+    return 0.5 * (1.0 + np.tanh(0.5 * scores))
+
+
+class ArrayLinearClassifier:
+    """
+    ``predict`` / ``predict_proba`` of a fitted LogisticRegression as one
+    sparse-dense product plus softmax in NumPy, without sklearn's per-call
+    input validation. Backed by memory-mapped arrays when exported, or by
+    the estimator's own ``coef_`` via ``from_estimator``.
+    """
+
+    kind = 'linear_classifier'
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray, classes: np.ndarray, multinomial: bool):
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.classes_ = classes
+        self.multinomial = multinomial
+
+    def decision_function(self, X) -> np.ndarray:
+        return np.asarray(X @ self.coef_.T) + self.intercept_
+
+    def predict_proba(self, X) -> np.ndarray:
+        scores = self.decision_function(X)
+        if self.multinomial:
+            return _softmax(scores)
+        if scores.shape[1] == 1:
+            positive = _sigmoid(scores[:, 0])
+            return np.column_stack([1 - positive, positive])
+        probabilities = _sigmoid(scores)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def top_k(self, X, k: int):
+        """(column indices, probabilities) of the ``k`` likeliest classes per row, best first"""
+        probabilities = self.predict_proba(X)
+        k = min(k, probabilities.shape[1])
+        if k < probabilities.shape[1]:
+            candidates = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(k), probabilities.shape)
+        candidate_probabilities = np.take_along_axis(probabilities, candidates, axis=1)
+        order = np.argsort(-candidate_probabilities, axis=1, kind='stable')
+        return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_probabilities, order, axis=1)
+
+    def predict(self, X) -> np.ndarray:
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            indices = (scores[:, 0] > 0).astype(np.int64)
+        else:
+            indices = scores.argmax(axis=1)
+        return np.asarray(self.classes_)[indices]
+
+    @staticmethod
+    def _is_multinomial(classifier) -> bool:
+        from sklearn.linear_model import LogisticRegression
+
+        if not isinstance(classifier, LogisticRegression) or not hasattr(classifier, 'coef_'):
+            raise ArrayArtifactError(
+                f"Only fitted LogisticRegression classifiers can be exported, not {type(classifier).__name__}"
+            )
+        # Mirrors LogisticRegression.predict_proba's choice between softmax and one-vs-rest
+        multi_class = getattr(classifier, 'multi_class', 'auto')
+        ovr = multi_class in ('ovr', 'warn') or (
+            multi_class in ('auto', 'deprecated') and (len(classifier.classes_) <= 2 or classifier.solver == 'liblinear')
+        )
+        return not ovr
+
+    @classmethod
+    def from_estimator(cls, classifier) -> 'ArrayLinearClassifier':
+        """In-memory counterpart of an exported artifact, for pickled classifiers"""
+        if isinstance(classifier, cls):
+            return classifier
+        multinomial = cls._is_multinomial(classifier)
+        return cls(np.ascontiguousarray(classifier.coef_), np.asarray(classifier.intercept_),
+                   np.asarray(classifier.classes_), multinomial)
+
+    @classmethod
+    def export(cls, classifier, directory: str) -> Dict:
+        multinomial = cls._is_multinomial(classifier)
+        np.save(os.path.join(directory, 'coef.npy'), np.ascontiguousarray(classifier.coef_))
+        np.save(os.path.join(directory, 'intercept.npy'), np.asarray(classifier.intercept_))
+        np.save(os.path.join(directory, 'classes.npy'), np.asarray(classifier.classes_))
+        return {'multinomial': multinomial}
+
+    @classmethod
+    def load(cls, directory: str, meta: Dict) -> 'ArrayLinearClassifier':
+        return cls(_load_array(directory, 'coef'), _load_array(directory, 'intercept'),
+                   _load_array(directory, 'classes'), meta['multinomial'])
+
+
+def linear_classifier(model) -> Optional[ArrayLinearClassifier]:
+    """NumPy inference view of ``model``, or None when it is not a linear classifier"""
+    if model is None:
+        return None
+    try:
+        return ArrayLinearClassifier.from_estimator(model)
+    except ArrayArtifactError:
+        return None
+
+
+class ArrayLabelEncoder:
+    """``LabelEncoder.inverse_transform`` over a memory-mapped class array"""
+
+    kind = 'label_encoder'
+
+    def __init__(self, classes: np.ndarray):
+        self.classes_ = classes
+
+    def inverse_transform(self, indices) -> np.ndarray:
+        return np.asarray(self.classes_[np.asarray(indices, dtype=np.int64)])
+
+    def transform(self, labels) -> np.ndarray:
+        lookup = {str(label): i for i, label in enumerate(self.classes_)}
+        return np.asarray([lookup[str(label)] for label in labels], dtype=np.int64)
+
+    @classmethod
+    def export(cls, encoder, directory: str) -> Dict:
+        if not hasattr(encoder, 'classes_'):
+            raise ArrayArtifactError(f"{type(encoder).__name__} is not a fitted LabelEncoder")
+        np.save(os.path.join(directory, 'classes.npy'), _as_text_array(encoder.classes_))
+        return {}
+
+    @classmethod
+    def load(cls, directory: str, meta: Dict) -> 'ArrayLabelEncoder':
+        return cls(_load_array(directory, 'classes'))
+
+
+ARRAY_TYPES = {cls.kind: cls for cls in (ArrayTfidfVectorizer, ArrayLinearClassifier, ArrayLabelEncoder)}
+
+
+def _array_type_for(model):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import LabelEncoder
+
+    if isinstance(model, TfidfVectorizer):
+        return ArrayTfidfVectorizer
+    if isinstance(model, LabelEncoder):
+        return ArrayLabelEncoder
+    return ArrayLinearClassifier
+
+
+def artifact_digest(directory: str) -> str:
+    """sha256 over every file of an array artifact (names and contents)"""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(directory)):
+        digest.update(name.encode())
+        file_digest = hashlib.sha256()
+        with open(os.path.join(directory, name), 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                file_digest.update(chunk)
+        digest.update(file_digest.digest())
+    return digest.hexdigest()
+
+
+def write_array_artifact(model, directory: str) -> str:
+    """
+    Export a fitted sklearn model into ``directory`` (replaced atomically)
+    and return its digest. Raises ArrayArtifactError for unsupported models.
+    """
+    array_type = _array_type_for(model)
+    tmp_dir = f"{directory}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        meta = array_type.export(model, tmp_dir)
+        with open(os.path.join(tmp_dir, META_NAME), 'w', encoding='utf-8') as f:
+            json.dump({'format': FORMAT_VERSION, 'kind': array_type.kind, **meta}, f, indent=2)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Workers that already mapped the old files keep them alive until they reload
+    old_dir = f"{directory}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(directory):
+        os.replace(directory, old_dir)
+    os.replace(tmp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return artifact_digest(directory)
+
+
+def load_array_artifact(directory: str):
+    try:
+        with open(os.path.join(directory, META_NAME), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ArrayArtifactError(f"cannot read {META_NAME} in {directory}: {e}")
+    if meta.get('format') != FORMAT_VERSION or meta.get('kind') not in ARRAY_TYPES:
+        raise ArrayArtifactError(f"unsupported array artifact in {directory}: {meta.get('kind')!r} v{meta.get('format')}")
+    try:
+        return ARRAY_TYPES[meta['kind']].load(directory, meta)
+    except (OSError, ValueError, KeyError) as e:
+        raise ArrayArtifactError(f"cannot load {directory}: {e}")
@@ -0,0 +1,310 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from typing import Dict, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ModelArtifactError(Exception):
+    """Raised when a model artifact is missing, unreadable or fails its checksum"""
+
+
+class ModelRegistry:
+    """
+    Loads the role classifier artifacts once per process and hands out a
+    shared, read-only JobMatchingSystem built on top of them.
+
+    Artifacts are read from ``settings.RESUME_MODEL_DIR``. If the directory
+    contains a ``manifest.json`` it is used to verify every artifact's sha256
+    and to pin the model version, e.g.::
+
+        {"version": "2025.07-knn", "artifacts": {"clf.pkl": "<sha256>", ...}}
+
+    Optional artifacts (the corpus-fitted similarity vectorizer written by
+    ``manage.py fit_similarity_vectorizer``) are loaded when present and do
+    not put the classifier into fallback mode when absent.
+
+    When an artifact also exists in array form (``manage.py
+    export_model_arrays``) that copy is memory-mapped instead of unpickled,
+    so every worker on the host shares one physical copy through the page
+    cache. ``RESUME_MODEL_MMAP = False`` forces the pickles.
+    """
+
+    ARTIFACTS = {
+        'clf_model': 'clf.pkl',
+        'tfidf': 'tfidf.pkl',
+        'encoder': 'encoder.pkl',
+    }
+    OPTIONAL_ARTIFACTS = {
+        'similarity_vectorizer': 'similarity_tfidf.pkl',
+    }
+    ARRAY_SUFFIX = '.arrays'
+    MANIFEST_NAME = 'manifest.json'
+    FALLBACK_VERSION = 'fallback'
+
+    def __init__(self, model_dir: str = None, strict: bool = None):
+        self.model_dir = str(model_dir or getattr(settings, 'RESUME_MODEL_DIR', os.path.dirname(__file__)))
+        self.strict = getattr(settings, 'RESUME_MODEL_STRICT', False) if strict is None else strict
+        self.use_arrays = getattr(settings, 'RESUME_MODEL_MMAP', True)
+        self.models: Dict[str, object] = {}
+        self.checksums: Dict[str, str] = {}
+        self.load_errors: Dict[str, str] = {}
+        self._model_version: Optional[str] = None
+        self._system = None
+        self._lock = threading.Lock()
+
+    @property
+    def model_version(self) -> str:
+        self._ensure_loaded()
+        return self._model_version
+
+    @property
+    def is_fallback(self) -> bool:
+        """True when the classifier pipeline is incomplete and keyword scoring is used"""
+        self._ensure_loaded()
+        return not all(self.models.get(key) is not None for key in self.ARTIFACTS)
+
+    def get_system(self):
+        """Return the shared JobMatchingSystem, loading artifacts on first use"""
+        self._ensure_loaded()
+        return self._system
+
+    def status(self) -> Dict:
+        self._ensure_loaded()
+        return {
+            'model_dir': self.model_dir,
+            'model_version': self._model_version,
+            'fallback': self.is_fallback,
+            'checksums': dict(self.checksums),
+            'errors': dict(self.load_errors),
+        }
+
+    def _ensure_loaded(self):
+        if self._system is not None:
+            return
+        with self._lock:
+            if self._system is None:
+                self._load()
+
+    def _load(self):
+        from .dummy import JobMatchingSystem
+        from .role_keywords import DEFAULT_ROLE_KEYWORDS_FILE, get_role_keyword_table
+
+        manifest = self._read_manifest()
+        expected = manifest.get('artifacts', {})
+
+        for key, filename in self.ARTIFACTS.items():
+            filename = self._preferred_filename(filename)
+            path = os.path.join(self.model_dir, filename)
+            try:
+                self.models[key] = self._load_artifact(path, expected.get(filename))
+                logger.info("Loaded model artifact %s (sha256 %s)", filename, self.checksums[filename][:12])
+            except ModelArtifactError as e:
+                self.models[key] = None
+                self.load_errors[filename] = str(e)
+                logger.error("Model artifact %s unavailable: %s", filename, e)
+                if self.strict:
+                    raise
+
+        for key, filename in self.OPTIONAL_ARTIFACTS.items():
+            filename = self._preferred_filename(filename)
+            path = os.path.join(self.model_dir, filename)
+            self.models[key] = None
+            if not os.path.exists(path):
+                logger.info("Optional model artifact %s not found", filename)
+                continue
+            try:
+                self.models[key] = self._load_artifact(path, expected.get(filename))
+                logger.info("Loaded model artifact %s (sha256 %s)", filename, self.checksums[filename][:12])
+            except ModelArtifactError as e:
+                self.load_errors[filename] = str(e)
+                logger.error("Model artifact %s unavailable: %s", filename, e)
+                if self.strict:
+                    raise
+
+        # The fallback predictor's output depends on the keyword table, so it versions like an artifact
+        try:
+            role_keywords = get_role_keyword_table()
+        except ValueError as e:
+            self.load_errors['role_keywords.json'] = str(e)
+            logger.error("Role keywords unavailable, using the bundled table: %s", e)
+            if self.strict:
+                raise ModelArtifactError(str(e)) from e
+            role_keywords = get_role_keyword_table(DEFAULT_ROLE_KEYWORDS_FILE)
+        self.checksums['role_keywords.json'] = role_keywords.digest
+
+        self._model_version = self._resolve_version(manifest)
+        if self.load_errors:
+            logger.warning(
+                "Model artifacts failed to load (model_version=%s): %s",
+                self._model_version, ', '.join(sorted(self.load_errors))
+            )
+
+        self._system = JobMatchingSystem(
+            clf_model=self.models.get('clf_model'),
+            tfidf=self.models.get('tfidf'),
+            encoder=self.models.get('encoder'),
+            similarity_vectorizer=self.models.get('similarity_vectorizer'),
+            model_version=self._model_version,
+            role_keywords=role_keywords,
+        )
+
+    def _read_manifest(self) -> Dict:
+        path = os.path.join(self.model_dir, self.MANIFEST_NAME)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if not isinstance(manifest, dict):
+                raise ValueError("expected a JSON object")
+            return manifest
+        except (OSError, ValueError) as e:
+            # Without a manifest nothing is verified, so the version must not look pinned
+            self.load_errors[self.MANIFEST_NAME] = str(e)
+            logger.error("Invalid model manifest %s: %s", path, e)
+            if self.strict:
+                raise ModelArtifactError(f"Invalid model manifest {path}: {e}")
+            return {}
+
+    @classmethod
+    def array_filename(cls, filename: str) -> str:
+        """'tfidf.pkl' -> 'tfidf.arrays'"""
+        return f"{os.path.splitext(filename)[0]}{cls.ARRAY_SUFFIX}"
+
+    def _preferred_filename(self, filename: str) -> str:
+        array_filename = self.array_filename(filename)
+        if self.use_arrays and os.path.isdir(os.path.join(self.model_dir, array_filename)):
+            return array_filename
+        return filename
+
+    def _load_artifact(self, path: str, expected_sha256: str = None):
+        filename = os.path.basename(path)
+        if os.path.isdir(path):
+            return self._load_array_artifact(path, expected_sha256)
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+        except OSError as e:
+            raise ModelArtifactError(f"cannot read {path}: {e.strerror or e}")
+
+        digest = hashlib.sha256(payload).hexdigest()
+        self.checksums[filename] = digest
+        if expected_sha256 and digest != expected_sha256:
+            raise ModelArtifactError(f"checksum mismatch for {filename}: expected {expected_sha256[:12]}, got {digest[:12]}")
+
+        try:
+            return pickle.loads(payload)
+        except Exception as e:
+            raise ModelArtifactError(f"cannot unpickle {filename}: {e}")
+
+    def _load_array_artifact(self, path: str, expected_sha256: str = None):
+        from .model_arrays import ArrayArtifactError, artifact_digest, load_array_artifact
+
+        filename = os.path.basename(path)
+        try:
+            digest = artifact_digest(path)
+        except OSError as e:
+            raise ModelArtifactError(f"cannot read {path}: {e.strerror or e}")
+        self.checksums[filename] = digest
+        if expected_sha256 and digest != expected_sha256:
+            raise ModelArtifactError(f"checksum mismatch for {filename}: expected {expected_sha256[:12]}, got {digest[:12]}")
+
+        try:
+            return load_array_artifact(path)
+        except ArrayArtifactError as e:
+            raise ModelArtifactError(str(e))
+
+    def _resolve_version(self, manifest: Dict) -> str:
+        if manifest.get('version'):
+            version = str(manifest['version'])
+            # A pinned version only describes the model when every artifact loaded
+            if self.load_errors:
+                version = f"{self.FALLBACK_VERSION}-{version}"
+            return version[:50]
+        if not self.checksums:
+            return self.FALLBACK_VERSION
+        combined = hashlib.sha256(
+            ''.join(self.checksums[name] for name in sorted(self.checksums)).encode()
+        ).hexdigest()
+        # Still changes whenever any artifact does, so caches keyed on it stay honest
+        prefix = self.FALLBACK_VERSION if self.load_errors else 'sha'
+        return f"{prefix}-{combined[:12]}"
+
+
+def save_artifact(filename: str, payload: bytes, model_dir: str = None) -> str:
+    """
+    Atomically write an artifact into the model directory and, if a
+    manifest.json is present, record its new sha256 there. Returns the digest.
+    """
+    model_dir = str(model_dir or getattr(settings, 'RESUME_MODEL_DIR', os.path.dirname(__file__)))
+    os.makedirs(model_dir, exist_ok=True)
+    path = os.path.join(model_dir, filename)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+    digest = hashlib.sha256(payload).hexdigest()
+    _record_checksum(model_dir, filename, digest)
+    return digest
+
+
+def save_array_artifact(filename: str, model, model_dir: str = None) -> str:
+    """
+    Export a fitted model as memory-mappable arrays under
+    ``ModelRegistry.array_filename(filename)`` and record its digest in the
+    manifest. Returns the digest; raises ArrayArtifactError for models that
+    have no array form.
+    """
+    from .model_arrays import write_array_artifact
+
+    model_dir = str(model_dir or getattr(settings, 'RESUME_MODEL_DIR', os.path.dirname(__file__)))
+    os.makedirs(model_dir, exist_ok=True)
+    array_filename = ModelRegistry.array_filename(filename)
+    digest = write_array_artifact(model, os.path.join(model_dir, array_filename))
+    _record_checksum(model_dir, array_filename, digest)
+    return digest
+
+
+def _record_checksum(model_dir: str, filename: str, digest: str):
+    manifest_path = os.path.join(model_dir, ModelRegistry.MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest.setdefault('artifacts', {})[filename] = digest
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide registry; each worker loads the artifacts exactly once"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+
+def get_job_matching_system():
+    return get_model_registry().get_system()
+
+
+def reset_model_registry():
+    """Drop the cached registry so the next call reloads artifacts (tests, hot reloads)"""
+    global _registry
+    with _registry_lock:
+        _registry = None
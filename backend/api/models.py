@@ -71,13 +71,44 @@ class ResumeAnalysis(models.Model):
     
     # Processing metadata
     processing_time = models.FloatField(default=0)  # Time taken for analysis in seconds
+    stage_timings = models.JSONField(default=dict, blank=True)  # Milliseconds per pipeline stage
     model_version = models.CharField(max_length=50, default='v1.0')
+    
+    # Normalized similarity TF-IDF vector for candidate search ({'dim', 'indices', 'data'})
+    tfidf_vector = models.JSONField(default=dict, blank=True)
+    vector_version = models.CharField(max_length=50, blank=True)
+
+    # sha256 of the uploaded resume bytes (analysis cache key component)
+    content_hash = models.CharField(max_length=64, blank=True)
+
+    # Per-section digests of the text each section extractor read (incremental re-analysis)
+    section_fingerprints = models.JSONField(default=dict, blank=True)
+
+    # 64-bit SimHash of the resume text and its eight 8-bit LSH bands (near-duplicate lookup)
+    simhash = models.BigIntegerField(null=True, blank=True)
+    simhash_band0 = models.PositiveSmallIntegerField(null=True, blank=True)
+    simhash_band1 = models.PositiveSmallIntegerField(null=True, blank=True)
+    simhash_band2 = models.PositiveSmallIntegerField(null=True, blank=True)
+    simhash_band3 = models.PositiveSmallIntegerField(null=True, blank=True)
+    simhash_band4 = models.PositiveSmallIntegerField(null=True, blank=True)
+    simhash_band5 = models.PositiveSmallIntegerField(null=True, blank=True)
+    simhash_band6 = models.PositiveSmallIntegerField(null=True, blank=True)
+    simhash_band7 = models.PositiveSmallIntegerField(null=True, blank=True)
 
     class Meta:
         ordering = ['-analysis_time']
         indexes = [
             models.Index(fields=['user', '-analysis_time']),
             models.Index(fields=['ats_score']),
+            models.Index(fields=['content_hash']),
+            models.Index(fields=['user', 'simhash_band0']),
+            models.Index(fields=['user', 'simhash_band1']),
+            models.Index(fields=['user', 'simhash_band2']),
+            models.Index(fields=['user', 'simhash_band3']),
+            models.Index(fields=['user', 'simhash_band4']),
+            models.Index(fields=['user', 'simhash_band5']),
+            models.Index(fields=['user', 'simhash_band6']),
+            models.Index(fields=['user', 'simhash_band7']),
         ]
 
     def __str__(self):
@@ -371,4 +402,145 @@ class AnalysisHistory(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"Analysis History - {self.user.username} - {self.created_at.strftime('%Y-%m-%d')}"
\ No newline at end of file
+        return f"Analysis History - {self.user.username} - {self.created_at.strftime('%Y-%m-%d')}"
+
+
+# Job description library for resume -> openings matching
+class JobDescription(models.Model):
+    """A saved opening with its precomputed similarity vector and keyword set"""
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_descriptions')
+    title = models.CharField(max_length=200)
+    company = models.CharField(max_length=200, blank=True)
+    description = models.TextField()
+    is_active = models.BooleanField(default=True)
+    
+    # Precomputed matching data, refreshed whenever the model version changes
+    tfidf_vector = models.JSONField(default=dict)  # {'dim', 'indices', 'data'}
+    keywords = models.JSONField(default=list)
+    vector_version = models.CharField(max_length=50, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.company})" if self.company else self.title
+
+
+# Extracted resume text, reused when the same file is analysed again
+class ExtractedTextCache(models.Model):
+    """
+    Text extracted from one upload under one page/character budget and
+    backend order, keyed by the upload's sha256. Bounded by EXTRACTION_CACHE_MAX_ENTRIES; the least
+    recently used entries are evicted.
+    """
+    content_hash = models.CharField(max_length=64)
+    max_pages = models.PositiveIntegerField()  # 0 = unlimited
+    max_chars = models.PositiveIntegerField()  # 0 = unlimited
+    extractors = models.CharField(max_length=200, default='')  # Backend names in the order tried
+    text = models.TextField()
+    mime = models.CharField(max_length=100, blank=True)
+    backend = models.CharField(max_length=50, blank=True)
+    pages_read = models.PositiveIntegerField(default=0)
+    total_pages = models.PositiveIntegerField(null=True, blank=True)
+    truncated_by = models.CharField(max_length=20, blank=True)
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['content_hash', 'max_pages', 'max_chars', 'extractors'],
+                                    name='unique_extraction_per_budget_and_backends'),
+        ]
+        indexes = [
+            models.Index(fields=['last_used_at']),
+        ]
+
+    def __str__(self):
+        return f"Extracted text {self.content_hash[:12]} ({self.backend})"
+
+
+class ExtractedTextCacheStats(models.Model):
+    """
+    Lookup counters of the extraction cache (a single row); unlike entries
+    they survive eviction. Each process adds its counts in batches.
+    """
+    hits = models.PositiveBigIntegerField(default=0)
+    misses = models.PositiveBigIntegerField(default=0)
+    evictions = models.PositiveBigIntegerField(default=0)
+    reset_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Extraction cache: {self.hits} hits, {self.misses} misses"
+
+
+# Resume analyses queued in job mode and run by `manage.py run_analysis_workers`
+class AnalysisJob(models.Model):
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='analysis_jobs')
+    resume_file = models.FileField(upload_to='resumes/', blank=True)
+    content_hash = models.CharField(max_length=64)
+    mime = models.CharField(max_length=100, blank=True)
+    job_description = models.TextField(blank=True, null=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    stage = models.CharField(max_length=50, blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)  # Percent
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True)  # host:pid of the claiming worker
+
+    analysis = models.ForeignKey(ResumeAnalysis, on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='jobs')
+    cached = models.BooleanField(default=False)  # Result served from the analysis cache
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Set on every state or progress change (workers update rows with .update())
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['user', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"Analysis job {self.id} ({self.status})"
+
+
+class AnalysisJobEvent(models.Model):
+    """
+    One progress step of a running job, with the partial result of the stage
+    that just completed; the progress stream replays these in ``id`` order.
+    """
+    job = models.ForeignKey(AnalysisJob, on_delete=models.CASCADE, related_name='events')
+    stage = models.CharField(max_length=50)
+    progress = models.PositiveSmallIntegerField(default=0)  # Percent
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.stage} for analysis job {self.job_id}"
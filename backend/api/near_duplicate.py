@@ -0,0 +1,151 @@
+import hashlib
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.db.models import Q
+
+from .analysis_context import AnalysisContext
+from .models import ResumeAnalysis
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+BANDS = 8
+BAND_BITS = SIMHASH_BITS // BANDS
+# Two signatures within 7 bits must agree on at least one of the 8 bands, so
+# the banded lookup finds every match at or under this distance. A fixed typo
+# plus a new contact line moves a one-page resume by ~2-10 bits; unrelated
+# resumes sit around 32 (rarely below 20).
+MAX_HAMMING_DISTANCE = BANDS - 1
+
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def _shingles(tokens: List[str]) -> Counter:
+    if len(tokens) < SHINGLE_SIZE:
+        return Counter([' '.join(tokens)]) if tokens else Counter()
+    return Counter(' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1))
+
+
+def simhash(resume_text) -> int:
+    """
+    64-bit SimHash of a resume's word 3-shingles, weighted by frequency.
+    Small edits (a fixed typo, a new phone number) flip only a few bits.
+    """
+    shingles = _shingles(AnalysisContext.of(resume_text).word_tokens)
+    if not shingles:
+        return 0
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'little') for s in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )
+    weights = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+    bits = ((hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)).astype(np.int64)
+    totals = weights @ (2 * bits - 1)
+    return sum(1 << int(i) for i in np.flatnonzero(totals > 0))
+
+
+def bands(signature: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(signature >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & ((1 << SIMHASH_BITS) - 1)).count('1')
+
+
+def _to_signed(value: int) -> int:
+    """BigIntegerField is signed; store the unsigned signature's two's complement"""
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value & ((1 << SIMHASH_BITS) - 1)
+
+
+def signature_fields(signature: int) -> Dict:
+    """``simhash`` / ``simhash_band*`` values to store on a ResumeAnalysis"""
+    fields = {'simhash': _to_signed(signature)}
+    for i, band in enumerate(bands(signature)):
+        fields[f'simhash_band{i}'] = band
+    return fields
+
+
+def find_near_duplicate(user, signature: int, model_version: str,
+                        max_distance: int = MAX_HAMMING_DISTANCE) -> Optional[Tuple[ResumeAnalysis, int]]:
+    """
+    The user's closest previous analysis (newest on ties) within
+    ``max_distance`` bits, found through the band indexes rather than by
+    comparing against every stored signature. Every band hit is compared,
+    so the work is bounded by the user's own analyses.
+    """
+    if not signature:
+        return None
+    band_match = Q()
+    for i, band in enumerate(bands(signature)):
+        band_match |= Q(**{f'simhash_band{i}': band})
+
+    candidates = (ResumeAnalysis.objects
+                  .filter(band_match, user=user, model_version=model_version, simhash__isnull=False)
+                  .order_by('-id')
+                  .values_list('id', 'simhash'))
+
+    best_id, best_distance = None, max_distance + 1
+    for candidate_id, candidate_hash in candidates.iterator():
+        distance = hamming_distance(signature, _to_unsigned(candidate_hash))
+        if distance < best_distance:
+            best_id, best_distance = candidate_id, distance
+            if distance == 0:
+                break
+    if best_id is None:
+        return None
+    analysis = ResumeAnalysis.objects.only('id', 'analysis_results', 'parsed_data', 'section_fingerprints').get(id=best_id)
+    return analysis, best_distance
+
+
+def latest_analysis(user, model_version: str) -> Optional[ResumeAnalysis]:
+    return (ResumeAnalysis.objects
+            .filter(user=user, model_version=model_version)
+            .only('id', 'parsed_data', 'section_fingerprints')
+            .order_by('-id')
+            .first())
+
+
+def reusable_results(user, signature: int, section_fingerprints: Dict[str, str], model_version: str) -> Dict:
+    """
+    Results from the user's earlier analyses that do not need recomputing,
+    in the shape ``analyze_resume_complete(reuse=...)`` takes:
+
+    * ``role_predictions`` from a near-identical analysis (SimHash match);
+    * ``parsed_fields`` for every section whose fingerprint is unchanged,
+      compared against that near-duplicate or else the user's latest analysis.
+      Fields whose extractor ran out of time budget there are recomputed.
+    """
+    reuse = {}
+    match = find_near_duplicate(user, signature, model_version)
+    if match is not None:
+        previous, distance = match
+        role_predictions = (previous.analysis_results or {}).get('role_predictions') or {}
+        if role_predictions.get('roles'):
+            logger.info("Reusing role predictions from analysis %s (simhash distance %d)", previous.id, distance)
+            reuse['role_predictions'] = role_predictions
+    else:
+        previous = latest_analysis(user, model_version)
+
+    if previous is not None:
+        previous_fingerprints = previous.section_fingerprints or {}
+        previous_parsed = previous.parsed_data or {}
+        # Extractor names are the parsed field names
+        degraded = {warning.get('extractor') for warning in previous_parsed.get('extraction_warnings') or []}
+        parsed_fields = {
+            field: previous_parsed[field]
+            for field, fingerprint in section_fingerprints.items()
+            if previous_fingerprints.get(field) == fingerprint and field in previous_parsed
+            and field not in degraded
+        }
+        if parsed_fields:
+            reuse['parsed_fields'] = parsed_fields
+    return reuse
@@ -2,7 +2,6 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from .resume_service import ResumeAssistantService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,6 +21,8 @@ def gemini_chat(request):
         )
     
     try:
+        # google.generativeai is slow to import; only chat requests pay for it
+        from .resume_service import ResumeAssistantService
         service = ResumeAssistantService()
         result = service.get_response(prompt)
         
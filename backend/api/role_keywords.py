@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+DEFAULT_ROLE_KEYWORDS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'role_keywords.json')
+
+
+class RoleKeywordTable:
+    """
+    Role keywords compiled into a role x term incidence matrix.
+
+    ``terms`` is the vocabulary shared by every role (a keyword listed under
+    several roles is one column). Scoring a batch of documents is one sparse
+    product of their matched-term indicators with the matrix, so adding roles
+    or keywords to the data file costs no extra passes over the text.
+    """
+
+    def __init__(self, role_keywords: Dict[str, List[str]], digest: str = ''):
+        self.role_keywords = {role: list(keywords) for role, keywords in role_keywords.items()}
+        self.roles = list(self.role_keywords)
+        self.term_index: Dict[str, int] = {}
+        rows, columns = [], []
+        for row, keywords in enumerate(self.role_keywords.values()):
+            for keyword in keywords:
+                term = keyword.lower().strip()
+                if term:
+                    rows.append(row)
+                    columns.append(self.term_index.setdefault(term, len(self.term_index)))
+        self.terms = list(self.term_index)
+
+        incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, columns)),
+            shape=(len(self.roles), len(self.terms)),
+        )
+        # A keyword repeated under one role still counts once
+        incidence.sum_duplicates()
+        incidence.data[:] = 1
+        self.term_role_matrix = incidence.T.tocsr()
+        self.digest = digest
+
+    @classmethod
+    def from_file(cls, path: str) -> 'RoleKeywordTable':
+        """Load ``{"Role": ["keyword", ...], ...}``; raises ValueError for malformed files"""
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+            role_keywords = json.loads(payload)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot read role keywords from {path}: {e}")
+        if not isinstance(role_keywords, dict) or not all(
+            isinstance(role, str) and isinstance(keywords, list) and all(isinstance(k, str) for k in keywords)
+            for role, keywords in role_keywords.items()
+        ):
+            raise ValueError(f"{path} must map role names to lists of keyword strings")
+        return cls(role_keywords, digest=hashlib.sha256(payload).hexdigest())
+
+    def indicators(self, matched_terms: List[Iterable[str]]) -> sparse.csr_matrix:
+        """documents x terms 0/1 matrix from each document's matched terms"""
+        indptr, indices = [0], []
+        for terms in matched_terms:
+            columns = sorted({self.term_index[term] for term in terms if term in self.term_index})
+            indices.extend(columns)
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(len(matched_terms), len(self.terms)),
+        )
+
+    def role_counts(self, matched_terms: List[Iterable[str]]) -> np.ndarray:
+        """documents x roles count of distinct matched keywords per role"""
+        if len(matched_terms) == 1:
+            # Same product for one row, read straight off the CSR arrays: building
+            # scipy matrices costs more than the arithmetic for a single document
+            matrix = self.term_role_matrix
+            columns = {self.term_index[term] for term in matched_terms[0] if term in self.term_index}
+            role_ids = [matrix.indices[matrix.indptr[c]:matrix.indptr[c + 1]] for c in columns]
+            counts = np.bincount(np.concatenate(role_ids) if role_ids else np.zeros(0, dtype=np.int32),
+                                 minlength=len(self.roles))
+            return counts[np.newaxis, :]
+        return np.asarray((self.indicators(matched_terms) @ self.term_role_matrix).todense())
+
+    def top_roles(self, counts: np.ndarray, limit: int = 5) -> List[Tuple[str, int]]:
+        """Roles with at least one match, most matches first (ties keep file order)"""
+        order = np.argsort(-counts, kind='stable')[:limit]
+        return [(self.roles[i], int(counts[i])) for i in order if counts[i] > 0]
+
+
+@lru_cache(maxsize=4)
+def _load_table(path: str) -> RoleKeywordTable:
+    return RoleKeywordTable.from_file(path)
+
+
+def get_role_keyword_table(path: str = None) -> RoleKeywordTable:
+    """The table from ``settings.ROLE_KEYWORDS_FILE`` (or ``path``), compiled once per process"""
+    if path is None:
+        from django.conf import settings
+        path = getattr(settings, 'ROLE_KEYWORDS_FILE', DEFAULT_ROLE_KEYWORDS_FILE)
+    return _load_table(path)
@@ -0,0 +1,92 @@
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+# Canonical section name -> header spellings seen in resumes
+SECTION_HEADERS = {
+    'summary': ['summary', 'professional summary', 'profile', 'professional profile', 'objective',
+                'career objective', 'about me'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career', 'internships', 'internship'],
+    'education': ['education', 'academic background', 'academics', 'qualifications',
+                  'educational qualifications'],
+    'projects': ['projects', 'project', 'personal projects', 'academic projects', 'portfolio'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core competencies', 'technologies'],
+    'certifications': ['certifications', 'certification', 'certificates', 'certificate',
+                       'licenses and certifications'],
+    'achievements': ['achievements', 'awards', 'honors', 'honours', 'accomplishments'],
+    'languages': ['languages', 'language', 'linguistic skills', 'languages known'],
+    'hobbies': ['hobbies', 'interests', 'personal interests', 'hobbies and interests',
+                'hobbies & interests'],
+}
+
+_ALIAS_TO_SECTION = {
+    re.sub(r'\s+', ' ', alias): name
+    for name, aliases in SECTION_HEADERS.items()
+    for alias in aliases
+}
+
+# A header is a line made of (optional bullet/decoration) + a known alias,
+# either alone on the line or followed by a colon and inline content.
+_HEADER_RE = re.compile(
+    r'^[ \t]*[^\w\n]{0,3}[ \t]*(?P<header>'
+    + '|'.join(
+        re.escape(alias).replace(r'\ ', r'[ \t]+')
+        for alias in sorted(_ALIAS_TO_SECTION, key=len, reverse=True)
+    )
+    + r')[ \t]*(?::|[ \t]*$)',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+class Section(NamedTuple):
+    name: str
+    header_start: int
+    start: int
+    end: int
+
+
+class SectionIndex:
+    """
+    Section name -> span map produced by one pass over the resume text.
+
+    Extractors read their own slice through ``get`` instead of searching the
+    whole document for "their" header.
+    """
+
+    def __init__(self, text: str, sections: List[Section]):
+        self.text = text
+        self.sections = sections
+        self.spans: Dict[str, Section] = {}
+        for section in sections:
+            # The first occurrence wins, mirroring the old re.search behaviour
+            self.spans.setdefault(section.name, section)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.spans
+
+    def get(self, name: str, default: str = '') -> str:
+        section = self.spans.get(name)
+        if section is None:
+            return default
+        return self.text[section.start:section.end].strip()
+
+    def span(self, name: str) -> Optional[Section]:
+        return self.spans.get(name)
+
+    def names(self) -> List[str]:
+        return list(self.spans)
+
+
+def segment_sections(text: str) -> SectionIndex:
+    """Detect section headers once and return the resulting SectionIndex"""
+    headers = []
+    for match in _HEADER_RE.finditer(text):
+        alias = re.sub(r'\s+', ' ', match.group('header').lower())
+        headers.append((_ALIAS_TO_SECTION[alias], match.start(), match.end()))
+
+    sections = []
+    for i, (name, header_start, content_start) in enumerate(headers):
+        end = headers[i + 1][1] if i + 1 < len(headers) else len(text)
+        sections.append(Section(name, header_start, content_start, end))
+
+    return SectionIndex(text, sections)
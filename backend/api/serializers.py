@@ -4,7 +4,7 @@ from .models import (
     Note, ResumeAnalysis, UserRegisterData, Resume, Skill, Experience, 
     Responsibility, Education, Project, Language, Interest, 
     GeneratedResumeSet, GeneratedResume, KeywordAnalysis, 
-    RoleAnalysisDetail, ATSScoreBreakdown, AnalysisHistory
+    RoleAnalysisDetail, ATSScoreBreakdown, AnalysisHistory, JobDescription
 )
 import base64
 
@@ -114,6 +114,14 @@ class ResumeAnalysisSerializer(serializers.ModelSerializer):
             'matched_keywords', 'missing_keywords', 'recommendations'
         ]
 
+class JobDescriptionSerializer(serializers.ModelSerializer):
+    owner = serializers.CharField(source='owner.username', read_only=True)
+    
+    class Meta:
+        model = JobDescription
+        fields = ['id', 'owner', 'title', 'company', 'description', 'is_active', 'created_at', 'updated_at']
+        read_only_fields = ['created_at', 'updated_at']
+
 class ResponsibilitySerializer(serializers.ModelSerializer):
     class Meta:
         model = Responsibility
@@ -0,0 +1,55 @@
+import contextvars
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict
+
+
+class SpanRecorder:
+    """
+    Accumulates wall-clock time per named stage for one unit of work.
+
+    Stages are flat names (``'text_extraction'``, ``'extract.skills'``); a
+    stage entered more than once is summed. Nested spans overlap, so the
+    stage times are not expected to add up to ``elapsed``.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + (time.perf_counter() - start)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_ms(self) -> Dict[str, float]:
+        return {name: round(seconds * 1000, 3) for name, seconds in self.durations.items()}
+
+
+_current_recorder: contextvars.ContextVar = contextvars.ContextVar('span_recorder', default=None)
+
+
+@contextmanager
+def record_spans():
+    """Make a fresh SpanRecorder current for every ``span()`` in the block"""
+    recorder = SpanRecorder()
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+def span(name: str):
+    """Time a stage on the current recorder; a no-op when nothing is recording"""
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return nullcontext()
+    return recorder.span(name)
@@ -1,3 +1,1386 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import pickle
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import docx
+import numpy as np
+from asgiref.sync import async_to_sync
+from fpdf import FPDF
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import LabelEncoder
+
+from . import candidate_search, job_library
+from .analysis_context import AnalysisContext
+from .analysis_jobs import claim_next_job, prune_job_events, report_progress, requeue_stale_jobs, run_job, run_worker
+from .benchmarks.corpus import SyntheticResumeCorpus
+from .analysis_cache import analysis_cache_key, get_cached_analysis
+from .candidate_search import InvalidCursor, get_candidate_index, search_candidates
+from .dummy import JobMatchingSystem
+from .extraction_cache import _flush_stats_at_exit, extract_resume_text_cached, flush_stats, record
+from .extraction_engine import extraction_budget, findall
+from .keyword_matcher import KeywordHit, KeywordMatcher
+from .model_registry import (
+    ModelArtifactError, ModelRegistry, get_job_matching_system, get_model_registry, reset_model_registry, save_artifact,
+)
+from .models import (
+    AnalysisJob, AnalysisJobEvent, ExtractedTextCache, ExtractedTextCacheStats, JobDescription, ResumeAnalysis,
+    UserRegisterData,
+)
+from .near_duplicate import find_near_duplicate, signature_fields
+from .role_keywords import DEFAULT_ROLE_KEYWORDS_FILE, RoleKeywordTable
+from .model_arrays import ArrayLinearClassifier, load_array_artifact, write_array_artifact
+from .text_extraction import (
+    DOCX_MIME, EXTRACTORS, PDF_MIME, TEXT_MIME, PdfExtractor, TextExtractor, collect_text, configured_extractor_order,
+    extract_resume_text, extract_text, use_parallel_pdf_extraction,
+)
+from .vector_index import SparseVectorIndex
+
+TRAINING_RESUMES = [
+    ("python django rest api backend postgresql microservices", "Backend Developer"),
+    ("java spring backend server database api design", "Backend Developer"),
+    ("react javascript css html frontend ui components", "Frontend Developer"),
+    ("angular typescript frontend ux responsive css", "Frontend Developer"),
+    ("sql excel tableau power bi reporting data analysis", "Data Analyst"),
+    ("statistics dashboards sql analysis kpi reporting excel", "Data Analyst"),
+    ("docker kubernetes aws terraform ci/cd jenkins automation", "DevOps Engineer"),
+    ("azure pipelines monitoring kubernetes helm automation", "DevOps Engineer"),
+]
+QUERIES = [
+    "Backend engineer building django and postgresql apis",
+    "Frontend developer, react and css, some python",
+    "Analyst: sql, tableau dashboards and kubernetes curiosity",
+    "nothing relevant here at all",
+]
+
+
+def fit_role_pipeline(labels=None):
+    """A small classifier, vectorizer and label encoder fitted on TRAINING_RESUMES"""
+    texts = [text for text, _ in TRAINING_RESUMES]
+    labels = labels or [label for _, label in TRAINING_RESUMES]
+    encoder = LabelEncoder().fit(labels)
+    tfidf = TfidfVectorizer(stop_words='english').fit(texts)
+    clf = LogisticRegression(max_iter=500).fit(tfidf.transform(texts), encoder.transform(labels))
+    return clf, tfidf, encoder
+
+
+class LinearRoleClassifierParityTests(SimpleTestCase):
+    """The NumPy inference path must reproduce sklearn's predictions"""
+
+    def fit(self, labels=None):
+        return fit_role_pipeline(labels)
+
+    def test_predict_proba_matches_sklearn(self):
+        clf, tfidf, _ = self.fit()
+        features = tfidf.transform(QUERIES)
+        linear = ArrayLinearClassifier.from_estimator(clf)
+        np.testing.assert_allclose(linear.predict_proba(features), clf.predict_proba(features), atol=1e-12)
+        np.testing.assert_array_equal(linear.predict(features), clf.predict(features))
+
+    def test_binary_predict_proba_matches_sklearn(self):
+        labels = ['Engineer' if 'Developer' in label or 'DevOps' in label else 'Analyst'
+                  for _, label in TRAINING_RESUMES]
+        clf, tfidf, _ = self.fit(labels)
+        features = tfidf.transform(QUERIES)
+        linear = ArrayLinearClassifier.from_estimator(clf)
+        np.testing.assert_allclose(linear.predict_proba(features), clf.predict_proba(features), atol=1e-12)
+        np.testing.assert_array_equal(linear.predict(features), clf.predict(features))
+
+    def test_exported_arrays_match_sklearn(self):
+        clf, tfidf, encoder = self.fit()
+        with tempfile.TemporaryDirectory() as model_dir:
+            write_array_artifact(clf, f"{model_dir}/clf.arrays")
+            write_array_artifact(tfidf, f"{model_dir}/tfidf.arrays")
+            write_array_artifact(encoder, f"{model_dir}/encoder.arrays")
+            array_clf = load_array_artifact(f"{model_dir}/clf.arrays")
+            array_tfidf = load_array_artifact(f"{model_dir}/tfidf.arrays")
+            array_encoder = load_array_artifact(f"{model_dir}/encoder.arrays")
+
+            np.testing.assert_allclose(array_tfidf.transform(QUERIES).toarray(), tfidf.transform(QUERIES).toarray())
+            features = tfidf.transform(QUERIES)
+            np.testing.assert_allclose(array_clf.predict_proba(features), clf.predict_proba(features), atol=1e-12)
+            self.assertEqual(array_encoder.inverse_transform([2, 0]).tolist(), encoder.inverse_transform([2, 0]).tolist())
+            # Release the memory maps before the directory is removed (required on Windows)
+            del array_clf, array_tfidf, array_encoder
+
+    def test_predict_job_roles_matches_sklearn_ranking(self):
+        clf, tfidf, encoder = self.fit()
+        system = JobMatchingSystem(clf_model=clf, tfidf=tfidf, encoder=encoder)
+        self.assertIsNotNone(system.role_classifier)
+
+        for query in QUERIES:
+            probabilities = clf.predict_proba(tfidf.transform([system.clean_resume(query)]))[0]
+            expected = np.argsort(-probabilities, kind='stable')[:5]
+            result = system.predict_job_roles(query)
+            self.assertEqual(result['roles'], encoder.inverse_transform(expected).tolist())
+            self.assertEqual(result['scores'], [round(float(probabilities[i]) * 100, 2) for i in expected])
+
+        batch = system.predict_job_roles_batch(QUERIES)
+        self.assertEqual(batch, [system.predict_job_roles(query) for query in QUERIES])
+
+
+SECTIONED_RESUME = """Priya Sharma
+Backend Developer
+priya.sharma@example.com | +91 9876543210
+
+Experience
+Senior Backend Developer
+Acme Technologies
+Pune
+2021 - Present
+- Built the payments API serving two million requests a day
+- Migrated the monolith into containerised services
+
+Education
+B.Tech in Computer Science
+College of Engineering Pune
+2015 - 2019
+CGPA: 8.6
+
+Projects
+Ledger
+Designed a double-entry ledger using Django, PostgreSQL.
+https://github.com/priya/ledger
+
+Certifications
+AWS Certified Developer Associate
+Certified Kubernetes Administrator
+
+Languages
+English
+Marathi
+
+Hobbies
+hiking
+open source
+"""
+
+
+class SectionParsingTests(SimpleTestCase):
+    """Section-scoped extractors read whole sections without letting a field cross lines"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.system = JobMatchingSystem()
+
+    def test_sectioned_resume(self):
+        parsed = self.system.parse_resume(SECTIONED_RESUME)
+        self.assertEqual(parsed['education'], [{
+            'degree': 'B.Tech in Computer Science', 'institution': 'College of Engineering Pune',
+            'year': '2015 - 2019', 'gpa_score': '8.6',
+        }])
+        [experience] = parsed['experience_details']
+        self.assertEqual(
+            (experience['job_title'], experience['company'], experience['location'], experience['duration']),
+            ('Senior Backend Developer', 'Acme Technologies', 'Pune', '2021 - Present'),
+        )
+        self.assertEqual(len(experience['responsibilities']), 2)
+        [project] = parsed['projects']
+        self.assertEqual(project['title'], 'Ledger')
+        self.assertEqual(sorted(project['technologies']), ['Django', 'PostgreSQL'])
+        self.assertEqual(project['project_link'], 'https://github.com/priya/ledger')
+        self.assertEqual(parsed['certifications'], ['AWS Certified Developer Associate', 'Certified Kubernetes Administrator'])
+        self.assertEqual(parsed['languages'], ['English', 'Marathi'])
+        self.assertEqual(parsed['hobbies'], ['hiking', 'open source'])
+
+    def test_synthetic_corpus_sections(self):
+        corpus = SyntheticResumeCorpus(seed=0)
+        for index in range(30):
+            data = corpus.resume_data(index)
+            parsed = self.system.parse_resume(corpus.resume_text(data))
+            with self.subTest(index=index):
+                self.assertEqual(
+                    [(e['degree'], e['institution'], e['year']) for e in parsed['education']],
+                    [(e['degree'], e['institution'], e['year']) for e in data['educations']],
+                )
+                self.assertEqual([p['title'] for p in parsed['projects']] if data['projects'] else [],
+                                 [p['title'] for p in data['projects']])
+                self.assertEqual(parsed['hobbies'], data['hobbies'])
+                self.assertEqual(sorted(parsed['languages']), sorted(data['languages']))
+                self.assertEqual(parsed['certifications'], data['certifications'])
+                for entry in parsed['education'] + parsed['experience_details']:
+                    for field, value in entry.items():
+                        if isinstance(value, str):
+                            self.assertNotIn('\n', value, field)
+
+    def test_keyword_analysis_runs_once_per_analysis(self):
+        job_description = "Backend developer with Django, PostgreSQL and Terraform experience"
+        with mock.patch.object(JobMatchingSystem, 'extract_keywords_analysis',
+                               autospec=True, side_effect=JobMatchingSystem.extract_keywords_analysis) as spy:
+            result = self.system.analyze_resume_complete(SECTIONED_RESUME, job_description=job_description)
+        # Optimisation tips reuse the analysis' keywords instead of re-tokenizing the parsed dict
+        self.assertEqual(spy.call_count, 1)
+        self.assertIsInstance(spy.call_args.args[1], AnalysisContext)
+        missing = result['keywords_analysis']['missing_keywords']
+        self.assertIn('terraform', missing)
+        self.assertTrue(any(tip.startswith("Consider incorporating") for tip in result['optimization_tips']))
+
+
+class SparseVectorIndexTests(SimpleTestCase):
+
+    def build(self, rows, dim=16, seed=0):
+        rng = np.random.default_rng(seed)
+        index = SparseVectorIndex(dim)
+        index.add_many((row_id, sparse.random(1, dim, density=0.3, random_state=rng, format='csr'))
+                       for row_id in range(1, rows + 1))
+        return index
+
+    def test_save_and_load_round_trip(self):
+        index = self.build(5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'candidates_1.npz')
+            index.save(path, model_version='v1')
+            loaded, meta = SparseVectorIndex.load(path)
+        self.assertEqual(loaded.ids, index.ids)
+        self.assertEqual(meta, {'model_version': 'v1'})
+        np.testing.assert_array_equal(loaded.matrix.toarray(), index.matrix.toarray())
+
+    def test_concurrent_saves_publish_a_complete_snapshot(self):
+        indexes = [self.build(rows, seed=rows) for rows in range(1, 17)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'candidates_1.npz')
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda index: index.save(path), indexes))
+            loaded, _ = SparseVectorIndex.load(path)
+            self.assertEqual(os.listdir(directory), ['candidates_1.npz'])
+        # Exactly one writer's snapshot, never a mix of several
+        [source] = [index for index in indexes if index.ids == loaded.ids]
+        np.testing.assert_array_equal(loaded.matrix.toarray(), source.matrix.toarray())
+
+    def test_frozen_copy_ignores_later_changes(self):
+        index = self.build(5)
+        frozen = index.frozen()
+        matrix = index.matrix.toarray()
+        index.remove([2])
+        index.add_many([(9, sparse.random(1, 16, density=0.3, random_state=1, format='csr'))])
+        self.assertEqual(frozen.ids, [1, 2, 3, 4, 5])
+        np.testing.assert_array_equal(frozen.id_array, [1, 2, 3, 4, 5])
+        np.testing.assert_array_equal(frozen.matrix.toarray(), matrix)
+
+
+class AnalysisApiTestCase(TestCase):
+    """Runs uploads through POST /api/resume/analyze/ with media in a temporary directory"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        media = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(media.cleanup)
+        cls.media_root = media.name
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media.name))
+
+    def setUp(self):
+        caches['analysis'].clear()
+
+    def tearDown(self):
+        # Pending extraction cache counters are written while this test's database still exists
+        flush_stats()
+
+    def client_for(self, username):
+        user = User.objects.create_user(username, password='x')
+        client = APIClient()
+        client.force_authenticate(user)
+        return client, user
+
+    def analyze(self, client, text=SECTIONED_RESUME, name='resume.txt', job_description='python developer', **params):
+        upload = SimpleUploadedFile(name, text.encode() if isinstance(text, str) else text)
+        query = ''.join(f"&{key}={value}" for key, value in params.items()).replace('&', '?', 1)
+        return client.post(f'/api/resume/analyze/{query}', {'resume': upload, 'job_description': job_description},
+                           format='multipart')
+
+
+class NearDuplicateTests(AnalysisApiTestCase):
+
+    def test_closest_match_is_found_past_newer_band_hits(self):
+        _, user = self.client_for('ana')
+        signature = 0x0123456789ABCDEF
+        ResumeAnalysis.objects.create(user=user, resume_file='resumes/old.txt', model_version='v1',
+                                      **signature_fields(signature ^ 0b1))
+        # Many newer analyses that share bands but sit further away
+        for i in range(60):
+            ResumeAnalysis.objects.create(user=user, resume_file=f'resumes/new{i}.txt', model_version='v1',
+                                          **signature_fields(signature ^ (0b11111 << 8)))
+        match, distance = find_near_duplicate(user, signature, 'v1')
+        self.assertEqual(distance, 1)
+        self.assertEqual(match.resume_file.name, 'resumes/old.txt')
+
+    def test_reused_role_predictions_are_not_cached_for_other_users(self):
+        client_a, _ = self.client_for('ana')
+        client_b, _ = self.client_for('ben')
+        edited = SECTIONED_RESUME.replace('+91 9876543210', '+91 9123456780')
+        self.assertEqual(self.analyze(client_a).status_code, 201)
+        response = self.analyze(client_a, edited)
+        self.assertEqual(response.status_code, 201)
+        row = ResumeAnalysis.objects.get(pk=response.json()['id'])
+        self.assertIn('role_predictions', row.analysis_results.get('reused_stages', []))
+
+        key = analysis_cache_key(get_model_registry().model_version, row.content_hash, 'python developer')
+        self.assertIsNone(get_cached_analysis(key))
+        response = self.analyze(client_b, edited)
+        self.assertFalse(response.json()['cached'])
+        row_b = ResumeAnalysis.objects.get(pk=response.json()['id'])
+        self.assertNotIn('reused_stages', row_b.analysis_results)
+
+    def test_budget_degraded_fields_are_neither_reused_nor_cached(self):
+        client, _ = self.client_for('ana')
+        with override_settings(EXTRACTION_BUDGET_MS=0):
+            response = self.analyze(client)
+        degraded = ResumeAnalysis.objects.get(pk=response.json()['id'])
+        warned = {warning['extractor'] for warning in degraded.parsed_data['extraction_warnings']}
+        self.assertIn('education', warned)
+        self.assertEqual(degraded.parsed_data['education'], [])
+
+        response = self.analyze(client)
+        self.assertFalse(response.json()['cached'])
+        row = ResumeAnalysis.objects.get(pk=response.json()['id'])
+        reused = row.analysis_results.get('reused_stages', [])
+        self.assertIn('parsed:languages', reused)
+        self.assertNotIn('parsed:education', reused)
+        self.assertEqual(len(row.parsed_data['education']), 1)
+        self.assertEqual(row.parsed_data['extraction_warnings'], [])
+
+
+class ModelRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        model_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(model_dir.cleanup)
+        self.model_dir = model_dir.name
+        self.keywords_file = os.path.join(self.model_dir, 'role_keywords.json')
+        with open(self.keywords_file, 'w') as f:
+            f.write('{"Backend Developer": "django"')
+
+    def test_malformed_role_keywords_fall_back_to_the_bundled_table(self):
+        with override_settings(ROLE_KEYWORDS_FILE=self.keywords_file):
+            registry = ModelRegistry(model_dir=self.model_dir, strict=False)
+            system = registry.get_system()
+        self.assertTrue(registry.is_fallback)
+        self.assertIn('role_keywords.json', registry.status()['errors'])
+        self.assertEqual(system.role_keywords.digest, RoleKeywordTable.from_file(DEFAULT_ROLE_KEYWORDS_FILE).digest)
+        self.assertTrue(system.predict_job_roles("django rest api backend postgresql")['roles'])
+
+    def test_strict_mode_refuses_malformed_role_keywords(self):
+        for artifact, filename in zip(fit_role_pipeline(), ('clf.pkl', 'tfidf.pkl', 'encoder.pkl')):
+            with open(os.path.join(self.model_dir, filename), 'wb') as f:
+                pickle.dump(artifact, f)
+        with override_settings(ROLE_KEYWORDS_FILE=self.keywords_file):
+            self.assertFalse(ModelRegistry(model_dir=self.model_dir, strict=False).is_fallback)
+            with self.assertRaises(ModelArtifactError):
+                ModelRegistry(model_dir=self.model_dir, strict=True).get_system()
+
+    def write_pipeline(self, version=None):
+        for artifact, filename in zip(fit_role_pipeline(), ('clf.pkl', 'tfidf.pkl', 'encoder.pkl')):
+            save_artifact(filename, pickle.dumps(artifact), model_dir=self.model_dir)
+        if version is not None:
+            registry = ModelRegistry(model_dir=self.model_dir)
+            registry.get_system()
+            artifacts = {name: registry.checksums[name] for name in ('clf.pkl', 'tfidf.pkl', 'encoder.pkl')}
+            with open(os.path.join(self.model_dir, 'manifest.json'), 'w') as f:
+                json.dump({'version': version, 'artifacts': artifacts}, f)
+
+    def test_checksum_mismatch_falls_back(self):
+        self.write_pipeline(version='2025.07-knn')
+        with open(os.path.join(self.model_dir, 'clf.pkl'), 'ab') as f:
+            f.write(b'tampered')
+
+        registry = ModelRegistry(model_dir=self.model_dir, strict=False)
+        self.assertTrue(registry.is_fallback)
+        self.assertIn('checksum mismatch', registry.status()['errors']['clf.pkl'])
+        self.assertEqual(registry.model_version, 'fallback-2025.07-knn')
+        with self.assertRaises(ModelArtifactError):
+            ModelRegistry(model_dir=self.model_dir, strict=True).get_system()
+
+    def test_model_version_derivation(self):
+        self.write_pipeline()
+        derived = ModelRegistry(model_dir=self.model_dir).model_version
+        self.assertRegex(derived, r'^sha-[0-9a-f]{12}$')
+        self.assertEqual(ModelRegistry(model_dir=self.model_dir).model_version, derived)
+
+        clf, _, _ = fit_role_pipeline()
+        clf.C = 2.0
+        save_artifact('clf.pkl', pickle.dumps(clf), model_dir=self.model_dir)
+        self.assertNotEqual(ModelRegistry(model_dir=self.model_dir).model_version, derived)
+
+        self.write_pipeline(version='2025.07-knn')
+        self.assertEqual(ModelRegistry(model_dir=self.model_dir).model_version, '2025.07-knn')
+
+    def test_save_artifact_updates_manifest_atomically(self):
+        self.write_pipeline(version='2025.07-knn')
+        clf, _, _ = fit_role_pipeline()
+        clf.C = 2.0
+        payload = pickle.dumps(clf)
+        digest = save_artifact('clf.pkl', payload, model_dir=self.model_dir)
+
+        self.assertEqual(digest, hashlib.sha256(payload).hexdigest())
+        with open(os.path.join(self.model_dir, 'manifest.json')) as f:
+            self.assertEqual(json.load(f)['artifacts']['clf.pkl'], digest)
+        self.assertEqual(sorted(name for name in os.listdir(self.model_dir) if name.endswith('.tmp')), [])
+        self.assertFalse(ModelRegistry(model_dir=self.model_dir).is_fallback)
+
+    def test_invalid_manifest_is_tolerated_unless_strict(self):
+        self.write_pipeline()
+        with open(os.path.join(self.model_dir, 'manifest.json'), 'w') as f:
+            f.write('{"version": ')
+
+        with self.assertLogs('api.model_registry', 'ERROR'):
+            registry = ModelRegistry(model_dir=self.model_dir, strict=False)
+            registry.get_system()
+        self.assertIn('manifest.json', registry.status()['errors'])
+        self.assertFalse(registry.is_fallback)
+        self.assertTrue(registry.model_version.startswith('fallback-'))
+        with self.assertRaises(ModelArtifactError):
+            ModelRegistry(model_dir=self.model_dir, strict=True).get_system()
+
+    def test_registry_is_shared_per_process(self):
+        self.write_pipeline()
+        self.addCleanup(reset_model_registry)
+        reset_model_registry()
+        with override_settings(RESUME_MODEL_DIR=self.model_dir):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                registries = list(pool.map(lambda _: get_model_registry(), range(8)))
+            self.assertTrue(all(registry is registries[0] for registry in registries))
+            self.assertIs(get_job_matching_system(), registries[0].get_system())
+            self.assertEqual(registries[0].model_dir, self.model_dir)
+
+            reset_model_registry()
+            self.assertIsNot(get_model_registry(), registries[0])
+
+
+class FitSimilarityVectorizerTests(SimpleTestCase):
+    def setUp(self):
+        model_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(model_dir.cleanup)
+        self.model_dir = model_dir.name
+        corpus_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(corpus_dir.cleanup)
+        self.corpus_dir = corpus_dir.name
+        for number, (text, _) in enumerate(TRAINING_RESUMES):
+            with open(os.path.join(self.corpus_dir, f'{number}.txt'), 'w') as f:
+                f.write(text)
+
+    def test_fitted_vectorizer_is_saved_and_used(self):
+        resume, job = QUERIES[0], 'python django developer for postgresql apis'
+        before = ModelRegistry(model_dir=self.model_dir).get_system().calculate_similarity_scores(resume, job)
+        with open(os.path.join(self.model_dir, 'manifest.json'), 'w') as f:
+            json.dump({'artifacts': {}}, f)
+
+        call_command('fit_similarity_vectorizer', corpus=[self.corpus_dir], model_dir=self.model_dir,
+                     min_df=1, stdout=io.StringIO())
+
+        with open(os.path.join(self.model_dir, 'similarity_tfidf.pkl'), 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with open(os.path.join(self.model_dir, 'manifest.json')) as f:
+            self.assertEqual(json.load(f)['artifacts']['similarity_tfidf.pkl'], digest)
+        for use_arrays in (False, True):
+            with self.subTest(mmap=use_arrays), override_settings(RESUME_MODEL_MMAP=use_arrays):
+                registry = ModelRegistry(model_dir=self.model_dir)
+                system = registry.get_system()
+                self.assertIsNotNone(registry.models['similarity_vectorizer'])
+                self.assertNotIn('similarity_tfidf.pkl', registry.status()['errors'])
+                after = system.calculate_similarity_scores(resume, job)
+                self.assertNotEqual(after['tfidf_similarity'], before['tfidf_similarity'])
+
+
+def multipage_pdf(pages: int) -> bytes:
+    pdf = FPDF()
+    pdf.set_font('Helvetica', size=12)
+    for number in range(1, pages + 1):
+        pdf.add_page()
+        pdf.cell(0, 10, f'Page {number} marker')
+    return bytes(pdf.output())
+
+
+class ParallelPdfExtractionTests(SimpleTestCase):
+    def write_pdf(self, pages):
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(multipage_pdf(pages))
+        self.addCleanup(os.remove, path)
+        return path
+
+    @override_settings(ANALYSIS_POOL_WORKERS=3)
+    def test_pool_keeps_page_order(self):
+        path = self.write_pdf(12)
+        for name, extractor in EXTRACTORS.items():
+            if extractor.mime != 'application/pdf' or not extractor.available():
+                continue
+            with self.subTest(backend=name):
+                serial = extractor.extract(path, 12, None, parallel=False)
+                with open(path, 'rb') as f:
+                    pooled = extractor.extract(f, 12, None, parallel=True)
+                self.assertEqual(pooled.text, serial.text)
+                self.assertEqual(pooled.pages_read, 12)
+                positions = [pooled.text.index(f'Page {number} marker') for number in range(1, 13)]
+                self.assertEqual(positions, sorted(positions))
+
+    def test_pool_respects_page_budget(self):
+        path = self.write_pdf(12)
+        result = extract_text(path, 'resume.pdf', max_pages=5, parallel=True)
+        self.assertIn('Page 5 marker', result.text)
+        self.assertNotIn('Page 6 marker', result.text)
+        self.assertEqual((result.pages_read, result.total_pages, result.truncated_by), (5, 12, 'pages'))
+
+    def test_default_threshold_within_page_budget(self):
+        with override_settings(ANALYSIS_POOL_WORKERS=2):
+            self.assertTrue(use_parallel_pdf_extraction(settings.RESUME_MAX_PAGES))
+            self.assertFalse(use_parallel_pdf_extraction(settings.RESUME_PARALLEL_PDF_PAGES - 1))
+        with override_settings(ANALYSIS_POOL_WORKERS=1):
+            self.assertFalse(use_parallel_pdf_extraction(settings.RESUME_MAX_PAGES))
+        with override_settings(ANALYSIS_POOL_WORKERS=2, RESUME_PARALLEL_PDF_PAGES=0):
+            self.assertFalse(use_parallel_pdf_extraction(settings.RESUME_MAX_PAGES))
+
+
+def table_docx() -> bytes:
+    document = docx.Document()
+    document.add_paragraph('Priya Sharma')
+    document.add_paragraph('Skills')
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = 'Python\tDjango'
+    table.cell(0, 1).text = 'PostgreSQL'
+    document.add_paragraph('Experience')
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class StartupImportTests(SimpleTestCase):
+    HEAVY_MODULES = (
+        'api.resume_generator', 'api.resume_service', 'docx', 'fpdf', 'PIL', 'pdf2image', 'google.generativeai',
+        'sklearn', 'scipy',
+    )
+
+    def test_views_leave_heavy_modules_unimported(self):
+        # A fresh interpreter: this process has long since imported all of them
+        code = (
+            "import sys, django; django.setup(); import api.views; "
+            "from django.urls import get_resolver; get_resolver().url_patterns; "
+            f"print(sorted(name for name in {self.HEAVY_MODULES!r} if name in sys.modules))"
+        )
+        env = {**os.environ, 'PYTHONPATH': os.pathsep.join(path for path in sys.path if path)}
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '[]')
+
+    def test_extractor_bases_are_abstract(self):
+        with self.assertRaises(TypeError):
+            TextExtractor()
+
+        class PageCountOnly(PdfExtractor):
+            def open(self, source):
+                return source
+
+            def page_count(self, document):
+                return 0
+
+        with self.assertRaises(TypeError):
+            PageCountOnly()
+
+    def test_collect_text_stops_at_character_budget(self):
+        pulled = []
+
+        def parts():
+            for part in ('abc', 'def', 'ghi'):
+                pulled.append(part)
+                yield part
+
+        result = collect_text(parts(), '', max_chars=5)
+        self.assertEqual(result.text, 'abcde')
+        self.assertEqual(result.truncated_by, 'characters')
+        self.assertEqual(pulled, ['abc', 'def'])
+        # A separator that uses up the budget is not emitted either
+        self.assertEqual(collect_text(iter(['abc', 'def']), '\n', max_chars=3).text, 'abc')
+        self.assertEqual(collect_text(iter(['abc', 'def']), '\n', max_chars=5).text, 'abc\nd')
+
+    def test_format_sniffed_from_content_not_name(self):
+        upload = SimpleUploadedFile('resume.docx', multipage_pdf(2), content_type='application/msword')
+        result = extract_resume_text(upload)
+        self.assertEqual(result.mime, PDF_MIME)
+        self.assertIn('Page 2 marker', result.text)
+        with self.assertRaises(ValueError):
+            extract_resume_text(SimpleUploadedFile('resume.pdf', b'\x00\x01binary'))
+
+    def test_falls_back_to_next_backend(self):
+        upload = SimpleUploadedFile('resume.pdf', multipage_pdf(2))
+        primary = extract_resume_text(upload)
+        with mock.patch.object(type(EXTRACTORS[primary.backend]), 'open', side_effect=RuntimeError('broken')), \
+                self.assertLogs('api.text_extraction', 'WARNING'):
+            fallback = extract_resume_text(upload)
+        self.assertNotEqual(fallback.backend, primary.backend)
+        self.assertIn('Page 2 marker', fallback.text)
+
+    def test_configured_order_picks_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'extractors.json')
+            with open(path, 'w') as f:
+                json.dump({'order': {PDF_MIME: ['pypdf2', 'pymupdf']}}, f)
+            with override_settings(RESUME_EXTRACTORS_FILE=path):
+                result = extract_resume_text(SimpleUploadedFile('resume.pdf', multipage_pdf(1)))
+        self.assertEqual(result.backend, 'pypdf2')
+
+    def test_docx_backends_agree(self):
+        content = table_docx()
+        texts = {
+            name: extractor.extract(io.BytesIO(content), None, None, None).text
+            for name, extractor in EXTRACTORS.items()
+            if extractor.mime == DOCX_MIME and extractor.available()
+        }
+        self.assertEqual(len(texts), 2)
+        self.assertEqual(len(set(texts.values())), 1, texts)
+        self.assertIn('Python\tDjango\nPostgreSQL', texts['docx-xml'])
+
+
+class ExtractionCacheTests(TestCase):
+    def setUp(self):
+        # Starts each test with no pending counters and a fresh flush interval
+        flush_stats()
+        ExtractedTextCacheStats.objects.all().delete()
+
+    def tearDown(self):
+        # Pending counters are written while this test's database still exists
+        flush_stats()
+
+    def extract(self, content, content_hash, name='resume.txt'):
+        return extract_resume_text_cached(SimpleUploadedFile(name, content), content_hash)
+
+    def test_exit_flush_logs_one_line_when_the_database_is_gone(self):
+        record(misses=1)
+        with mock.patch('api.extraction_cache.count', side_effect=OperationalError('no such table')), \
+                self.assertLogs('api.extraction_cache', 'WARNING') as logs:
+            _flush_stats_at_exit()
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('no such table', logs.output[0])
+        self.assertIsNone(logs.records[0].exc_info)
+
+    def test_hit_skips_extraction(self):
+        with mock.patch('api.extraction_cache.extract_resume_text', wraps=extract_resume_text) as extract:
+            first = self.extract(b'Python developer', 'a' * 64)
+            second = self.extract(b'Python developer', 'a' * 64)
+        self.assertEqual(extract.call_count, 1)
+        self.assertEqual(second, first)
+        self.assertEqual(ExtractedTextCache.objects.get().hits, 1)
+
+    def test_counters_written_in_batches(self):
+        self.extract(b'Python developer', 'a' * 64)
+        self.extract(b'Python developer', 'a' * 64)
+        self.assertFalse(ExtractedTextCacheStats.objects.exists())
+        flush_stats()
+        stats = ExtractedTextCacheStats.objects.get()
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+
+    @override_settings(EXTRACTION_CACHE_MAX_ENTRIES=2)
+    def test_evicts_least_recently_used_beyond_bound(self):
+        self.extract(b'first', '1' * 64)
+        self.extract(b'second', '2' * 64)
+        self.extract(b'first', '1' * 64)
+        self.extract(b'third', '3' * 64)
+        self.assertEqual(sorted(ExtractedTextCache.objects.values_list('text', flat=True)), ['first', 'third'])
+        flush_stats()
+        self.assertEqual(ExtractedTextCacheStats.objects.get().evictions, 1)
+
+    def test_backend_order_change_misses(self):
+        content = multipage_pdf(1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'extractors.json')
+            with override_settings(RESUME_EXTRACTORS_FILE=path):
+                first = self.extract(content, 'p' * 64, 'resume.pdf')
+                with open(path, 'w') as f:
+                    json.dump({'order': {PDF_MIME: ['pypdf2', 'pymupdf']}}, f)
+                second = self.extract(content, 'p' * 64, 'resume.pdf')
+        self.assertEqual((first.backend, second.backend), ('pymupdf', 'pypdf2'))
+        self.assertEqual(ExtractedTextCache.objects.count(), 2)
+
+
+class AnalysisJobTests(AnalysisApiTestCase):
+    def queue(self, client, **kwargs):
+        response = self.analyze(client, **kwargs, **{'async': 1})
+        self.assertEqual(response.status_code, 202)
+        return AnalysisJob.objects.get(pk=response.json()['job_id'])
+
+    def upload_exists(self, name):
+        return AnalysisJob._meta.get_field('resume_file').storage.exists(name)
+
+    def test_job_result_matches_synchronous_flow(self):
+        client, _ = self.client_for('ana')
+        response = self.analyze(client, **{'async': 1})
+        self.assertEqual(response.status_code, 202)
+        queued = response.json()
+        self.assertEqual((queued['status'], queued['queue_position']), ('queued', 1))
+
+        self.assertEqual(run_worker('test-worker', burst=True), 1)
+        status = client.get(queued['status_url']).json()
+        self.assertEqual((status['status'], status['progress']), ('succeeded', 100))
+        analysis = ResumeAnalysis.objects.get(pk=status['analysis_id'])
+        self.assertEqual(status['result']['id'], analysis.pk)
+        self.assertIn('ats_score', status['result'])
+        self.assertTrue(self.upload_exists(analysis.resume_file.name))
+
+        self.assertEqual(self.client_for('ben')[0].get(queued['status_url']).status_code, 404)
+
+    def test_two_claims_one_winner(self):
+        client, _ = self.client_for('ana')
+        first = self.queue(client)
+        second = self.queue(client, text=SECTIONED_RESUME + '\nReferences available')
+        claims = [claim_next_job('worker-a'), claim_next_job('worker-b'), claim_next_job('worker-c')]
+        self.assertEqual([job.pk if job else None for job in claims], [first.pk, second.pk, None])
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.worker, first.attempts), ('running', 'worker-a', 1))
+
+    def test_stale_jobs_requeued_then_failed(self):
+        client, _ = self.client_for('ana')
+        retried = self.queue(client)
+        exhausted = self.queue(client, text=SECTIONED_RESUME + '\nReferences available')
+        claim_next_job('dead-worker')
+        claim_next_job('dead-worker')
+        AnalysisJob.objects.filter(pk=exhausted.pk).update(attempts=2)
+        AnalysisJob.objects.update(updated_at=timezone.now() - timedelta(seconds=120))
+
+        with self.assertLogs('api.analysis_jobs', 'WARNING'):
+            self.assertEqual(requeue_stale_jobs(timeout=60, max_attempts=2), 2)
+        retried.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual((retried.status, retried.stage, retried.worker), ('queued', 'requeued', ''))
+        self.assertEqual((exhausted.status, exhausted.resume_file.name), ('failed', ''))
+        self.assertTrue(self.upload_exists(retried.resume_file.name))
+
+    def test_failed_job_deletes_upload(self):
+        client, _ = self.client_for('ana')
+        job = self.queue(client, text='   \n')
+        stored_name = job.resume_file.name
+        self.assertTrue(self.upload_exists(stored_name))
+        run_job(claim_next_job('test-worker'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), ('failed', 'Could not extract text from resume'))
+        self.assertFalse(self.upload_exists(stored_name))
+
+    def test_interrupted_job_is_requeued(self):
+        client, _ = self.client_for('ana')
+        job = self.queue(client)
+        with mock.patch('api.analysis_jobs.run_resume_analysis', side_effect=KeyboardInterrupt), \
+                self.assertLogs('api.analysis_jobs', 'WARNING'), self.assertRaises(KeyboardInterrupt):
+            run_job(claim_next_job('test-worker'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker, job.attempts), ('queued', '', 0))
+        self.assertEqual(claim_next_job('other-worker').pk, job.pk)
+
+
+def parse_sse(chunks):
+    """``(id, event, data)`` of each server-sent event in a streamed body"""
+    events = []
+    for block in ''.join(chunk.decode() for chunk in chunks).split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line)
+        if 'event' in fields:
+            events.append((fields.get('id'), fields['event'], json.loads(fields['data'])))
+    return events
+
+
+@override_settings(ANALYSIS_EVENTS_POLL_INTERVAL=0, ANALYSIS_EVENTS_MAX_DURATION=0)
+class AnalysisJobStreamTests(AnalysisApiTestCase):
+    def stream(self, url, **headers):
+        async def read():
+            response = await AsyncClient().get(url, headers=headers)
+            if not response.streaming:
+                return response.status_code, []
+            return response.status_code, parse_sse([chunk async for chunk in response.streaming_content])
+        return async_to_sync(read)()
+
+    def queue(self, client):
+        response = self.analyze(client, **{'async': 1})
+        self.assertEqual(response.status_code, 202)
+        return response.json()
+
+    def test_progress_events_resume_after_last_event_id(self):
+        client, _ = self.client_for('ana')
+        queued = self.queue(client)
+        job = claim_next_job('test-worker')
+        report_progress(job, 'extracted', 25, {'characters': 120})
+
+        status, events = self.stream(queued['events_url'])
+        self.assertEqual(status, 200)
+        self.assertEqual([event for _, event, _ in events], ['status', 'extracted'])
+        event_id, _, data = events[1]
+        self.assertEqual(data, {'stage': 'extracted', 'progress': 25, 'result': {'characters': 120}})
+        _, events = self.stream(queued['events_url'], last_event_id=event_id)
+        self.assertEqual([event for _, event, _ in events], ['status'])
+
+    def test_finished_job_streams_last_events_until_pruned(self):
+        client, _ = self.client_for('ana')
+        queued = self.queue(client)
+        run_worker('test-worker', burst=True)
+
+        _, events = self.stream(queued['events_url'])
+        self.assertEqual([event for _, event, _ in events][-3:], ['ats_scored', 'saving', 'done'])
+        _, _, data = events[-1]
+        self.assertEqual((data['status'], data['result']['id']), ('succeeded', data['analysis_id']))
+
+        self.assertEqual(prune_job_events(retention=60), 0)
+        self.assertGreater(prune_job_events(retention=0), 0)
+        _, events = self.stream(queued['events_url'])
+        self.assertEqual([event for _, event, _ in events], ['done'])
+
+    def test_prune_keeps_running_jobs_events(self):
+        client, _ = self.client_for('ana')
+        self.queue(client)
+        self.analyze(client, text='   \n', **{'async': 1})
+        running = claim_next_job('test-worker')
+        report_progress(running, 'text_extraction', 10)
+        failed = claim_next_job('test-worker')
+        report_progress(failed, 'text_extraction', 10)
+        run_job(failed)
+
+        prune_job_events(retention=0)
+        self.assertEqual(list(AnalysisJobEvent.objects.values_list('job_id', flat=True)), [running.pk])
+
+    def test_stream_token_opens_only_its_job(self):
+        client, user = self.client_for('ana')
+        first, second = self.queue(client), self.queue(client)
+        token = first['events_url'].split('?token=')[1]
+        events_path = second['events_url'].split('?')[0]
+
+        self.assertEqual(self.stream(f"{events_path}?token={token}")[0], 401)
+        self.assertEqual(self.stream(f"{events_path}?token={AccessToken.for_user(user)}")[0], 401)
+        self.assertEqual(self.stream(events_path)[0], 401)
+        self.assertEqual(self.stream(events_path, authorization=f"Bearer {AccessToken.for_user(user)}")[0], 200)
+        with override_settings(ANALYSIS_STREAM_TOKEN_MAX_AGE=-1):
+            self.assertEqual(self.stream(first['events_url'])[0], 401)
+
+        _, other = self.client_for('ben')
+        self.assertEqual(self.stream(events_path, authorization=f"Bearer {AccessToken.for_user(other)}")[0], 404)
+
+
+class KeywordMatcherTests(SimpleTestCase):
+    def test_matches_per_term_regexes(self):
+        terms = ['java', 'javascript', 'sql', 'mysql', 'machine learning', 'learning', 'go', 'r', 'node.js', 'ai']
+        matcher = KeywordMatcher()
+        matcher.add_many(terms, category='skill')
+        vocabulary = terms + ['script', 'my', 'nodes', 'machine', 'going', 'learn', 'ai_ops', '.', ',', '-']
+        rng = random.Random(0)
+        for _ in range(200):
+            text = ''.join(rng.choice(vocabulary) + rng.choice(' ,.-\n') for _ in range(rng.randint(1, 30)))
+            expected = sorted(
+                (m.start(), m.end(), term)
+                for term in terms for m in re.finditer(rf'\b{re.escape(term)}\b', text)
+            )
+            found = sorted((hit.start, hit.end, hit.term) for hit in matcher.find_all(text))
+            self.assertEqual(found, expected, text)
+
+    def test_symbol_terms_labels_and_categories(self):
+        matcher = KeywordMatcher()
+        matcher.add('c++', category='skill')
+        matcher.add('c#', category='skill')
+        matcher.add('js', label='JavaScript', category='skill')
+        matcher.add('javascript', label='JavaScript', category='skill')
+        matcher.add('javascript', label='Web Developer', category='role')
+        text = 'js, c++ and c#; javascript daily'
+        self.assertEqual(matcher.labels(text, category='skill'), ['JavaScript', 'c++', 'c#'])
+        self.assertEqual(matcher.terms_by_label(text, category='skill')['JavaScript'], {'js', 'javascript'})
+        self.assertEqual(matcher.find_all(text, category='role'), [KeywordHit(16, 26, 'javascript', 'Web Developer', 'role')])
+        # Only edges that are word characters need a boundary
+        self.assertEqual(matcher.labels('abc++ xc# jsx'), [])
+        self.assertEqual(matcher.labels('c++x'), ['c++'])
+        with self.assertRaises(RuntimeError):
+            matcher.add('rust')
+
+    def test_skill_extraction_uses_aliases(self):
+        system = JobMatchingSystem()
+        skills = system._extract_skills('Built ReactJS and NodeJS apps on K8s with Postgres, C++ and Java.')
+        self.assertEqual(skills, ['React', 'Node.js', 'Kubernetes', 'PostgreSQL', 'C', 'C++', 'Java'])
+
+
+class BatchAnalysisTests(SimpleTestCase):
+    """analyze_resume_batch must return what analyze_resume_complete returns for each resume"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        clf, tfidf, encoder = fit_role_pipeline()
+        corpus = SyntheticResumeCorpus(seed=1)
+        cls.resumes = [corpus.resume_text(corpus.resume_data(index)) for index in range(5)]
+        similarity = TfidfVectorizer(stop_words='english').fit(cls.resumes + [text for text, _ in TRAINING_RESUMES])
+        cls.system = JobMatchingSystem(clf_model=clf, tfidf=tfidf, encoder=encoder, similarity_vectorizer=similarity)
+
+    @staticmethod
+    def without_timestamp(result):
+        return {key: value for key, value in result.items() if key != 'timestamp'}
+
+    def test_batch_matches_single_analyses(self):
+        resumes = self.resumes + ['  ', SECTIONED_RESUME]
+        job_descriptions = ['Python backend developer with Django', None, 'Data analyst, SQL and Tableau',
+                            'Python backend developer with Django', '', 'Python developer', None]
+        expected = [self.without_timestamp(self.system.analyze_resume_complete(text, job_description))
+                    for text, job_description in zip(resumes, job_descriptions)]
+        for parallel in (False, True):
+            with self.subTest(parallel=parallel):
+                batch = self.system.analyze_resume_batch(resumes, job_descriptions, parallel=parallel)
+                self.assertEqual([self.without_timestamp(result) for result in batch], expected)
+
+    def test_single_job_description_applies_to_all(self):
+        batch = self.system.analyze_resume_batch(self.resumes[:2], 'Data analyst, SQL and Tableau', parallel=False)
+        self.assertEqual([result['similarity_scores'] for result in batch],
+                         [self.system.calculate_similarity_scores(text, 'Data analyst, SQL and Tableau')
+                          for text in self.resumes[:2]])
+        with self.assertRaises(ValueError):
+            self.system.analyze_resume_batch(self.resumes[:2], ['only one'])
+
+
+OPENINGS = [
+    ('Backend Developer', 'Python backend developer building Django REST APIs on PostgreSQL'),
+    ('Frontend Developer', 'Frontend developer with React, JavaScript and CSS'),
+    ('Data Analyst', 'Data analyst: SQL, Excel, Tableau and Power BI dashboards'),
+    ('DevOps Engineer', 'DevOps engineer with Docker, Kubernetes, Terraform and AWS'),
+]
+
+
+class JobLibraryMatchTests(AnalysisApiTestCase):
+    def setUp(self):
+        super().setUp()
+        similarity = TfidfVectorizer(stop_words='english').fit(
+            [SECTIONED_RESUME] + [description for _, description in OPENINGS] + [text for text, _ in TRAINING_RESUMES]
+        )
+        self.system = JobMatchingSystem(similarity_vectorizer=similarity, model_version='jd-test')
+        patcher = mock.patch('api.job_library.get_job_matching_system', return_value=self.system)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # The process-wide index must not outlive this test's rows
+        index_patcher = mock.patch.object(job_library, '_job_index', None)
+        index_patcher.start()
+        self.addCleanup(index_patcher.stop)
+        self.client, self.user = self.client_for('ana')
+        for title, description in OPENINGS:
+            response = self.client.post('/api/jobs/', {'title': title, 'description': description}, format='json')
+            self.assertEqual(response.status_code, 201)
+
+    def match(self, **data):
+        upload = SimpleUploadedFile('resume.txt', SECTIONED_RESUME.encode())
+        return self.client.post('/api/resume/match-jobs/', {'resume': upload, **data}, format='multipart')
+
+    def test_ranking_matches_pairwise_scores(self):
+        response = self.match(top_k=3)
+        self.assertEqual(response.status_code, 200)
+        matches = response.json()['matches']
+        expected = sorted(
+            ((self.system.calculate_similarity_scores(SECTIONED_RESUME, description), title)
+             for title, description in OPENINGS),
+            key=lambda pair: -pair[0]['combined_score'],
+        )[:3]
+        self.assertEqual([match['title'] for match in matches], [title for _, title in expected])
+        for match, (scores, _) in zip(matches, expected):
+            for field in ('tfidf_similarity', 'keyword_similarity', 'combined_score'):
+                self.assertAlmostEqual(match[field], scores[field], delta=0.02)
+
+    def test_inactive_and_stale_openings(self):
+        JobDescription.objects.filter(title='Backend Developer').update(is_active=False)
+        titles = [match['title'] for match in self.match(top_k=10).json()['matches']]
+        self.assertEqual(len(titles), 3)
+        self.assertNotIn('Backend Developer', titles)
+
+        # A model version change re-indexes stored vectors before ranking
+        self.system.model_version = 'jd-test-2'
+        self.assertEqual(len(self.match(top_k=10).json()['matches']), 3)
+        self.assertEqual(set(JobDescription.objects.filter(is_active=True).values_list('vector_version', flat=True)),
+                         {'jd-test-2'})
+
+    def test_requires_similarity_vectorizer(self):
+        self.system.similarity_vectorizer = None
+        self.assertEqual(self.match().status_code, 503)
+        self.assertEqual(self.client.post('/api/resume/match-jobs/', {}, format='multipart').status_code, 400)
+
+    def test_upload_text_comes_from_extraction_cache(self):
+        self.assertEqual(self.match().status_code, 200)
+        with mock.patch('api.text_extraction.extract_text') as extract:
+            self.assertEqual(self.match().status_code, 200)
+        extract.assert_not_called()
+
+    def test_corrupt_upload_is_a_client_error(self):
+        corrupt = b'%PDF-1.4\n' + b'\x00garbage' * 50
+        upload = SimpleUploadedFile('resume.pdf', corrupt)
+        response = self.client.post('/api/resume/match-jobs/', {'resume': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Could not read resume', response.json()['error'])
+        self.assertEqual(self.analyze(self.client, text=corrupt, name='resume.pdf').status_code, 400)
+
+
+class CandidateSearchTests(AnalysisApiTestCase):
+    JOB = 'Backend developer: python, django and postgresql apis'
+
+    def setUp(self):
+        super().setUp()
+        similarity = TfidfVectorizer(stop_words='english').fit([text for text, _ in TRAINING_RESUMES])
+        self.system = JobMatchingSystem(similarity_vectorizer=similarity, model_version='search-test')
+        for module in ('api.candidate_search', 'api.job_matching_views'):
+            patcher = mock.patch(f'{module}.get_job_matching_system', return_value=self.system)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Neither cached indexes nor snapshots may outlive this test's rows
+        indexes_patcher = mock.patch.object(candidate_search, '_indexes', OrderedDict())
+        indexes_patcher.start()
+        self.addCleanup(indexes_patcher.stop)
+        index_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(index_dir.cleanup)
+        settings_override = override_settings(CANDIDATE_INDEX_DIR=index_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client, self.hr = self.client_for('hana')
+        UserRegisterData.objects.create(user=self.hr, full_name='Hana', email='hana@example.com', mobile='555',
+                                        dob='1990-01-01', user_type=UserRegisterData.UserType.HR)
+        # Stored without vectors, so the first search backfills them
+        for number, (text, _) in enumerate(TRAINING_RESUMES * 2):
+            ResumeAnalysis.objects.create(user=self.hr, resume_file=f'resumes/{number}.txt',
+                                          parsed_data={'full_text': f'{text} {number}', 'name': f'Candidate {number}'})
+        _, self.other = self.client_for('ben')
+        self.foreign = ResumeAnalysis.objects.create(user=self.other, resume_file='resumes/other.txt',
+                                                     parsed_data={'full_text': TRAINING_RESUMES[0][0]})
+
+    def test_search_ranks_owned_analyses(self):
+        results, cursor = search_candidates(self.hr.id, self.JOB, limit=100)
+        self.assertIsNone(cursor)
+        owned = ResumeAnalysis.objects.filter(user=self.hr)
+        self.assertEqual({item['analysis_id'] for item in results}, set(owned.values_list('id', flat=True)))
+        keys = [(-item['tfidf_similarity'], -item['analysis_id']) for item in results]
+        self.assertEqual(keys, sorted(keys))
+        best = owned.get(pk=results[0]['analysis_id']).parsed_data['full_text']
+        expected = self.system.calculate_similarity_scores(best, self.JOB)['tfidf_similarity']
+        self.assertAlmostEqual(results[0]['tfidf_similarity'], expected, delta=0.02)
+        self.assertEqual(set(owned.values_list('vector_version', flat=True)), {'search-test'})
+
+    def test_cursor_pages_through_every_row(self):
+        everything, _ = search_candidates(self.hr.id, self.JOB, limit=100)
+        pages, cursor = [], None
+        while True:
+            page, cursor = search_candidates(self.hr.id, self.JOB, limit=3, cursor=cursor)
+            pages.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual(pages, everything)
+
+    def test_cursor_is_bound_to_its_job_description(self):
+        _, cursor = search_candidates(self.hr.id, self.JOB, limit=3)
+        with self.assertRaises(InvalidCursor):
+            search_candidates(self.hr.id, 'Data analyst with sql and tableau', limit=3, cursor=cursor)
+        with self.assertRaises(InvalidCursor):
+            search_candidates(self.hr.id, self.JOB, limit=3, cursor='not-a-cursor')
+        # Whitespace and case do not change the query
+        self.assertTrue(search_candidates(self.hr.id, f'  {self.JOB.upper()} ', limit=3, cursor=cursor)[0])
+        response = self.client.post('/api/candidates/search/', {'job_description': 'Data analyst', 'cursor': cursor},
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_view_is_for_hr_users_only(self):
+        response = self.client.post('/api/candidates/search/', {'job_description': self.JOB, 'limit': 5}, format='json')
+        self.assertEqual(response.status_code, 200)
+        candidates = response.json()['candidates']
+        self.assertEqual(len(candidates), 5)
+        self.assertNotIn(self.foreign.pk, [candidate['analysis_id'] for candidate in candidates])
+
+        individual_client, individual = self.client_for('ivan')
+        UserRegisterData.objects.create(user=individual, full_name='Ivan', email='ivan@example.com', mobile='555',
+                                        dob='1990-01-01')
+        for client in (individual_client, self.client_for('nora')[0]):
+            response = client.post('/api/candidates/search/', {'job_description': self.JOB}, format='json')
+            self.assertEqual(response.status_code, 403)
+
+    def test_deletions_are_checked_periodically(self):
+        results, _ = search_candidates(self.hr.id, self.JOB, limit=1)
+        ResumeAnalysis.objects.filter(pk=results[0]['analysis_id']).delete()
+        with override_settings(CANDIDATE_INDEX_DELETE_CHECK_SECONDS=3600):
+            self.assertIn(results[0]['analysis_id'], get_candidate_index(self.hr.id, self.system).vectors)
+            # The view skips ids whose rows are gone
+            response = self.client.post('/api/candidates/search/', {'job_description': self.JOB}, format='json')
+            self.assertNotIn(results[0]['analysis_id'], [row['analysis_id'] for row in response.json()['candidates']])
+        with override_settings(CANDIDATE_INDEX_DELETE_CHECK_SECONDS=0):
+            self.assertNotIn(results[0]['analysis_id'], get_candidate_index(self.hr.id, self.system).vectors)
+
+
+class AnalysisMetricsTests(AnalysisApiTestCase):
+    URL = '/api/admin/metrics/analysis/'
+
+    def test_analysis_saves_stage_timings(self):
+        client, _ = self.client_for('ana')
+        first = ResumeAnalysis.objects.get(pk=self.analyze(client).json()['id'])
+        self.assertGreater(first.processing_time, 0)
+        self.assertTrue({'upload_store', 'model_load', 'cache_lookup', 'text_extraction', 'db_write'}
+                        <= set(first.stage_timings))
+        self.assertTrue(all(ms >= 0 for ms in first.stage_timings.values()))
+
+        # A cache hit records only the stages it ran
+        second = ResumeAnalysis.objects.get(pk=self.analyze(client).json()['id'])
+        self.assertIn('cache_lookup', second.stage_timings)
+        self.assertNotIn('text_extraction', second.stage_timings)
+
+    def test_percentiles(self):
+        _, user = self.client_for('ana')
+        for ms in range(1, 101):
+            ResumeAnalysis.objects.create(user=user, resume_file='resumes/r.txt', model_version='v2',
+                                          processing_time=ms / 1000, stage_timings={'parse': ms, 'db_write': 1.0})
+        # Outside the window, under another model version, or never timed: all left out
+        stale = ResumeAnalysis.objects.create(user=user, resume_file='resumes/r.txt', model_version='v2',
+                                              processing_time=5, stage_timings={'parse': 5000})
+        ResumeAnalysis.objects.filter(pk=stale.pk).update(analysis_time=timezone.now() - timedelta(hours=48))
+        ResumeAnalysis.objects.create(user=user, resume_file='resumes/r.txt', model_version='v1',
+                                      processing_time=9, stage_timings={'parse': 9000})
+        ResumeAnalysis.objects.create(user=user, resume_file='resumes/r.txt', model_version='v2')
+
+        admin = User.objects.create_user('root', password='x', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.get(self.URL, {'hours': 24, 'model_version': 'v2'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['sample_size'], 100)
+        self.assertEqual(data['total_ms'], data['stages']['parse'])
+        self.assertEqual(data['stages']['parse'],
+                         {'count': 100, 'mean': 50.5, 'max': 100.0, 'p50': 50.5, 'p90': 90.1, 'p95': 95.05, 'p99': 99.01})
+        self.assertEqual(list(data['stages']), ['parse', 'db_write'])
+        self.assertEqual(client.get(self.URL, {'hours': 'soon'}).status_code, 400)
+
+    def test_admins_only(self):
+        client, _ = self.client_for('ana')
+        self.assertEqual(client.get(self.URL).status_code, 403)
+
+
+class AnalysisCacheTests(AnalysisApiTestCase):
+    def test_repeat_upload_served_from_cache(self):
+        client, _ = self.client_for('ana')
+        first = self.analyze(client, job_description='Python developer')
+        self.assertEqual(first.status_code, 201)
+        self.assertFalse(first.json()['cached'])
+
+        other_client, other = self.client_for('ben')
+        with mock.patch('api.analysis_core.extract_resume_text_cached') as extract, \
+                mock.patch('api.analysis_core.analyze_resume_text') as analyze:
+            second = self.analyze(other_client, job_description='  python   DEVELOPER ')
+        extract.assert_not_called()
+        analyze.assert_not_called()
+        self.assertEqual(second.status_code, 201)
+        self.assertTrue(second.json()['cached'])
+        self.assertEqual(second.json()['ats_score'], first.json()['ats_score'])
+        self.assertEqual(ResumeAnalysis.objects.get(pk=second.json()['id']).user, other)
+
+    def test_changed_job_description_or_file_misses(self):
+        client, _ = self.client_for('ana')
+        self.analyze(client, job_description='Python developer')
+        self.assertFalse(self.analyze(client, job_description='Data analyst').json()['cached'])
+        self.assertFalse(self.analyze(client, text=SECTIONED_RESUME + '\nReferences available',
+                                      job_description='Python developer').json()['cached'])
+
+    def test_key_covers_model_version_and_normalized_job_description(self):
+        content_hash = 'a' * 64
+        key = analysis_cache_key('v1', content_hash, 'Python developer')
+        self.assertEqual(analysis_cache_key('v1', content_hash, ' python\tDeveloper\n'), key)
+        self.assertNotEqual(analysis_cache_key('v2', content_hash, 'Python developer'), key)
+        self.assertNotEqual(analysis_cache_key('v1', 'b' * 64, 'Python developer'), key)
+        self.assertEqual(analysis_cache_key('v1', content_hash, None), analysis_cache_key('v1', content_hash, ''))
+
+
+class ExtractionBudgetTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.system = JobMatchingSystem()
+
+    def test_mode_picks_pattern(self):
+        long_line = 'x ' * 300 + 'y'
+        for mode, text, expected in [('full', 'x y', ['x']), ('linear', 'x y', ['y']),
+                                     ('auto', 'x y', ['x']), ('auto', long_line, ['y'])]:
+            with self.subTest(mode=mode, text=text[:10]), extraction_budget(1000, mode):
+                self.assertEqual(findall('x', text, linear='y')[:1], expected)
+        with self.assertRaises(ValueError), extraction_budget(mode='fast'):
+            pass
+
+    def test_exhausted_budget_falls_back_and_is_recorded(self):
+        with extraction_budget(0, 'full') as budget, self.assertLogs('api.extraction_engine', 'WARNING'):
+            self.assertEqual(findall('x', 'x y', extractor='skills', linear='y'), [])
+        self.assertEqual(budget.warnings[0], {'extractor': 'skills', 'budget_ms': 0, 'fallback': 'linear'})
+
+    def test_exhausted_extractor_stays_within_budget(self):
+        # Each pattern alone backtracks for far longer than the budget
+        text = 'a' * 60 + ' z'
+        start = time.process_time()
+        with extraction_budget(100, 'full') as budget, self.assertLogs('api.extraction_engine', 'WARNING'):
+            results = [findall(r'(a|aa)+b', text, extractor='skills', linear='z') for _ in range(3)]
+        # CPU time: the regex timeout is measured in it, and it is stable on a throttled host
+        self.assertLess(time.process_time() - start, 0.2)
+        self.assertEqual(results, [['z']] * 3)
+        self.assertEqual(budget.exhausted, {'skills'})
+        self.assertEqual(budget.warnings, [{'extractor': 'skills', 'budget_ms': 100, 'fallback': 'linear'}])
+        with extraction_budget(100, 'full') as budget:
+            budget.exhausted.add('skills')
+            self.assertEqual(findall(r'(a|aa)+b', text, extractor='skills'), [])
+
+    @override_settings(EXTRACTION_BUDGET_MS=50, EXTRACTION_REGEX_MODE='full')
+    def test_pathological_text_is_bounded(self):
+        # One long line that makes the original experience/education patterns backtrack
+        text = 'Developer Engineer Bachelor of University ' * 2000
+        start = time.perf_counter()
+        with self.assertLogs('api.extraction_engine', 'WARNING'):
+            parsed = self.system.parse_resume(text)
+        self.assertLess(time.perf_counter() - start, 5)
+        warned = {(w['extractor'], w['fallback']) for w in parsed['extraction_warnings']}
+        self.assertIn(('experience_details', 'linear'), warned)
+        self.assertIn(('education', 'linear'), warned)
+
+    def test_linear_patterns_agree_on_structured_resumes(self):
+        corpus = SyntheticResumeCorpus(seed=0)
+        texts = [SECTIONED_RESUME] + [corpus.resume_text(corpus.resume_data(index)) for index in range(10)]
+        for index, text in enumerate(texts):
+            parses = {}
+            for mode in ('full', 'linear'):
+                with override_settings(EXTRACTION_BUDGET_MS=10_000, EXTRACTION_REGEX_MODE=mode):
+                    parses[mode] = self.system.parse_resume(text)
+                    # The linear location pattern stays on one line; the original crosses lines
+                    parses[mode].pop('location')
+            with self.subTest(index=index):
+                self.assertEqual(parses['linear'], parses['full'])
+
+
+class ExtractionBudgetTruncationTests(AnalysisApiTestCase):
+    def test_pages_beyond_budget_are_never_read(self):
+        content = multipage_pdf(12)
+        for name, extractor in EXTRACTORS.items():
+            if extractor.mime != PDF_MIME or not extractor.available():
+                continue
+            with self.subTest(backend=name), \
+                    mock.patch.object(type(extractor), 'page_text', autospec=True,
+                                      side_effect=type(extractor).page_text) as page_text:
+                result = extractor.extract(io.BytesIO(content), 5, None, parallel=False)
+                self.assertEqual(page_text.call_count, 5)
+                self.assertEqual((result.pages_read, result.total_pages, result.truncated_by), (5, 12, 'pages'))
+
+                page_text.reset_mock()
+                result = extractor.extract(io.BytesIO(content), None, 20, parallel=False)
+                self.assertEqual(page_text.call_count, result.pages_read)
+                self.assertLess(result.pages_read, 12)
+                self.assertEqual((len(result.text), result.truncated_by), (20, 'characters'))
+
+    def test_character_budget_per_format(self):
+        for name, content in [('resume.txt', SECTIONED_RESUME.encode()), ('resume.docx', table_docx())]:
+            with self.subTest(name=name):
+                result = extract_resume_text(SimpleUploadedFile(name, content), max_pages=0, max_chars=12)
+                self.assertEqual((result.text, result.truncated_by), ('Priya Sharma', 'characters'))
+                result = extract_resume_text(SimpleUploadedFile(name, content), max_pages=0, max_chars=0)
+                self.assertFalse(result.truncated)
+
+    @override_settings(RESUME_MAX_PAGES=3)
+    def test_truncation_reported_in_response(self):
+        client, _ = self.client_for('ana')
+        response = self.analyze(client, text=multipage_pdf(12), name='portfolio.pdf')
+        self.assertEqual(response.status_code, 201)
+        summary = response.json()['text_extraction']
+        self.assertEqual(
+            (summary['pages_read'], summary['total_pages'], summary['truncated'], summary['truncated_by']),
+            (3, 12, True, 'pages'),
+        )
+        self.assertEqual(summary['content_type'], PDF_MIME)
+
+
+class UploadStorageTests(AnalysisApiTestCase):
+    def stored_files(self):
+        directory = os.path.join(self.media_root, 'resumes')
+        return set(os.listdir(directory)) if os.path.isdir(directory) else set()
+
+    def test_upload_stored_once_with_its_hash(self):
+        client, _ = self.client_for('ana')
+        # In memory, then spooled to a temporary file by Django's upload handlers
+        for memory_size in (2_621_440, 0):
+            content = f"{SECTIONED_RESUME}\nUpload buffer {memory_size}".encode()
+            with self.subTest(memory_size=memory_size), override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=memory_size):
+                before = self.stored_files()
+                response = self.analyze(client, text=content)
+                self.assertEqual(response.status_code, 201)
+                analysis = ResumeAnalysis.objects.get(pk=response.json()['id'])
+                self.assertEqual(self.stored_files() - before, {os.path.basename(analysis.resume_file.name)})
+                self.assertEqual(analysis.content_hash, hashlib.sha256(content).hexdigest())
+                with analysis.resume_file.open('rb') as f:
+                    self.assertEqual(f.read(), content)
+
+    def test_rejected_upload_leaves_no_file(self):
+        client, _ = self.client_for('ana')
+        before = self.stored_files()
+        self.assertEqual(self.analyze(client, text='   \n').status_code, 400)
+        self.assertEqual(self.analyze(client, text=b'\x00\x01binary', name='resume.pdf').status_code, 400)
+        self.assertEqual(self.stored_files(), before)
+
+
+class BenchmarkCommandTests(AnalysisApiTestCase):
+    """Smoke runs of the benchmark commands on a tiny synthetic corpus"""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write_report(self, name, report):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            json.dump(report, f)
+        return path
+
+    def test_benchmark_then_compare(self):
+        current = os.path.join(self.directory, 'current.json')
+        targets = ['parse_resume', 'calculate_similarity_scores', 'resume_analysis_view']
+        call_command('benchmark_analysis', count=2, formats=['txt', 'docx'], targets=targets, output=current,
+                     stdout=io.StringIO())
+        with open(current) as f:
+            report = json.load(f)
+        self.assertEqual(report['meta']['count'], 2)
+        self.assertTrue(set(targets) <= set(report['results']))
+        self.assertEqual(report['results']['resume_analysis_view']['failures'], 0)
+        self.assertEqual(report['results']['resume_analysis_view']['count'], 2)
+        # The view's rows are rolled back
+        self.assertFalse(ResumeAnalysis.objects.exists())
+
+        # parse_resume 50% slower than the baseline, every other target unchanged
+        baseline = json.loads(json.dumps(report))
+        baseline['results']['parse_resume'].update(p50=10.0, p95=20.0)
+        report['results']['parse_resume'].update(p50=15.0, p95=30.0)
+        baseline_path, current = self.write_report('baseline.json', baseline), self.write_report('slower.json', report)
+        with self.assertRaisesMessage(CommandError, '2 regression(s)'):
+            call_command('compare_benchmarks', baseline_path, current, threshold=0.15,
+                         stdout=io.StringIO(), stderr=io.StringIO())
+        out = io.StringIO()
+        call_command('compare_benchmarks', baseline_path, current, threshold=0.6, stdout=out)
+        self.assertIn('No regressions', out.getvalue())
+
+        # A baseline far slower than any real run never reports a regression
+        for stats in baseline['results'].values():
+            stats.update({stat: stats[stat] * 100 + 100 for stat in ('p50', 'p95') if stat in stats})
+        out = io.StringIO()
+        call_command('benchmark_analysis', count=2, targets=['parse_resume'], threshold=0.15,
+                     baseline=self.write_report('slow_baseline.json', baseline), stdout=out)
+        self.assertIn('No regressions', out.getvalue())
+
+    def test_text_extractor_benchmark_writes_an_order(self):
+        path = os.path.join(self.directory, 'text_extractors.json')
+        with override_settings(RESUME_EXTRACTORS_FILE=path):
+            call_command('benchmark_text_extractors', count=1, repeat=1, write=True, stdout=io.StringIO())
+            with open(path) as f:
+                written = json.load(f)
+            self.assertEqual(set(written['order']), {TEXT_MIME, DOCX_MIME, PDF_MIME})
+            for mime, order in written['order'].items():
+                self.assertEqual(configured_extractor_order()[mime], order)
+                self.assertEqual(set(written['measured'][mime]) - set(order), set())
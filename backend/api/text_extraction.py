@@ -0,0 +1,507 @@
+import abc
+import codecs
+import importlib.util
+import io
+import json
+import logging
+import math
+import os
+import zipfile
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PDF_MIME = 'application/pdf'
+DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+TEXT_MIME = 'text/plain'
+
+DEFAULT_MAX_PAGES = 20
+DEFAULT_MAX_CHARS = 100_000
+DEFAULT_PARALLEL_PDF_PAGES = 16
+MIN_PAGES_PER_TASK = 4
+TXT_READ_SIZE = 64 * 1024
+SNIFF_BYTES = 8 * 1024
+DOCX_MAIN_PART = 'word/document.xml'
+
+
+class ExtractedText(NamedTuple):
+    text: str
+    pages_read: int
+    total_pages: Optional[int]
+    truncated: bool
+    truncated_by: Optional[str]
+    mime: Optional[str] = None
+    backend: Optional[str] = None
+
+    def summary(self) -> Dict:
+        """JSON-friendly description stored with the analysis and returned to the client"""
+        return {
+            'pages_read': self.pages_read,
+            'total_pages': self.total_pages,
+            'truncated': self.truncated,
+            'truncated_by': self.truncated_by,
+            'characters': len(self.text),
+            'content_type': self.mime,
+            'backend': self.backend,
+        }
+
+
+def sniff_mime(fileobj) -> Optional[str]:
+    """
+    Resume MIME type from the content of a seekable binary file, ignoring
+    its name and the client's declared type: a PDF header, a zip holding
+    ``word/document.xml``, or UTF-8 text without NUL bytes. None for
+    anything else. The file position is restored.
+    """
+    position = fileobj.tell()
+    try:
+        fileobj.seek(0)
+        head = fileobj.read(SNIFF_BYTES)
+        # Readers accept the header anywhere in the first kilobyte
+        if b'%PDF-' in head[:1024]:
+            return PDF_MIME
+        if head.startswith(b'PK\x03\x04'):
+            fileobj.seek(0)
+            try:
+                with zipfile.ZipFile(fileobj) as archive:
+                    names = set(archive.namelist())
+            except zipfile.BadZipFile:
+                return None
+            return DOCX_MIME if DOCX_MAIN_PART in names else None
+        if b'\x00' in head:
+            return None
+        try:
+            # Incremental, so a multi-byte character cut at the sniff boundary is fine
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        except UnicodeDecodeError:
+            return None
+        return TEXT_MIME
+    finally:
+        fileobj.seek(position)
+
+
+def sniff_path(path: str) -> Optional[str]:
+    with open(path, 'rb') as f:
+        return sniff_mime(f)
+
+
+def _local_path(source) -> Optional[str]:
+    """Filesystem path of ``source``: a path itself, or an upload Django spooled to disk"""
+    if isinstance(source, str):
+        return source
+    if hasattr(source, 'temporary_file_path'):
+        return source.temporary_file_path()
+    return None
+
+
+def _read_bytes(source) -> bytes:
+    source.seek(0)
+    return source.read()
+
+
+@contextmanager
+def _open_binary(source):
+    """Binary file for a path (closed afterwards) or a rewound file object (left open)"""
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield f
+    else:
+        source.seek(0)
+        yield source
+
+
+def collect_text(parts: Iterator[str], separator: str = '', max_chars: int = None) -> ExtractedText:
+    """
+    Join ``parts`` (pages, paragraphs, chunks) until the character budget is
+    reached; the generator is not advanced past the budget, so the rest of
+    the document is never extracted. Page budgets are applied by the caller
+    when it sizes ``parts``.
+    """
+    pieces = []
+    length = 0
+    count = 0
+    truncated_by = None
+    for part in parts:
+        if pieces:
+            length += len(separator)
+        count += 1
+        if max_chars is not None and length + len(part) > max_chars:
+            # Nothing of the part fits once the separator is counted: leave the separator out too
+            if max_chars > length:
+                pieces.append(part[:max_chars - length])
+            truncated_by = 'characters'
+            break
+        pieces.append(part)
+        length += len(part)
+    return ExtractedText(separator.join(pieces), count, None, truncated_by is not None, truncated_by)
+
+
+class TextExtractor(abc.ABC):
+    """
+    One text-extraction backend for one format. ``module`` is the library it
+    needs; backends whose library is not installed are skipped. Sources are
+    paths or seekable binary file objects such as Django uploads.
+    """
+    name = ''
+    mime = ''
+    module = ''
+
+    def available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    @abc.abstractmethod
+    def extract(self, source, max_pages: Optional[int], max_chars: Optional[int],
+                parallel: Optional[bool]) -> ExtractedText:
+        """Budgets are None for unlimited; ``parallel`` only applies to paged formats"""
+
+
+class PdfExtractor(TextExtractor):
+    mime = PDF_MIME
+
+    @abc.abstractmethod
+    def open(self, source):
+        """Parsed document for a path or binary file object"""
+
+    @abc.abstractmethod
+    def page_count(self, document) -> int:
+        pass
+
+    @abc.abstractmethod
+    def page_text(self, document, index: int) -> str:
+        pass
+
+    def close(self, document):
+        pass
+
+    def iter_pages(self, document, page_count: int) -> Iterator[str]:
+        """Text of each page, extracted only when the consumer asks for it"""
+        for index in range(page_count):
+            yield self.page_text(document, index)
+
+    def extract(self, source, max_pages, max_chars, parallel):
+        document = self.open(source)
+        try:
+            total_pages = self.page_count(document)
+            page_count = min(total_pages, max_pages) if max_pages else total_pages
+            if parallel is None:
+                parallel = use_parallel_pdf_extraction(page_count)
+            # The pool extracts every page in range up front, so only the page
+            # budget (not the character budget) saves work in that mode
+            if parallel:
+                pages = iter_pdf_pages_parallel(self.name, source, page_count)
+            else:
+                pages = self.iter_pages(document, page_count)
+            # Pages were historically concatenated without a separator
+            result = collect_text(pages, '', max_chars=max_chars)
+        finally:
+            self.close(document)
+        result = result._replace(total_pages=total_pages)
+        if not result.truncated and result.pages_read < total_pages:
+            result = result._replace(truncated=True, truncated_by='pages')
+        return result
+
+
+class PyMuPdfExtractor(PdfExtractor):
+    name = 'pymupdf'
+    module = 'pymupdf'
+
+    def open(self, source):
+        import pymupdf
+
+        path = _local_path(source)
+        if path:
+            return pymupdf.open(path)
+        return pymupdf.open(stream=_read_bytes(source), filetype='pdf')
+
+    def page_count(self, document):
+        return document.page_count
+
+    def page_text(self, document, index):
+        return document[index].get_text()
+
+    def close(self, document):
+        document.close()
+
+
+class PyPdf2Extractor(PdfExtractor):
+    name = 'pypdf2'
+    module = 'PyPDF2'
+
+    def open(self, source):
+        import PyPDF2
+
+        return PyPDF2.PdfReader(source)
+
+    def page_count(self, document):
+        return len(document.pages)
+
+    def page_text(self, document, index):
+        return document.pages[index].extract_text() or ''
+
+
+class DocxExtractor(TextExtractor):
+    """
+    Every paragraph of the document body in document order, including those
+    inside tables (resume templates often lay out whole sections as tables).
+    """
+    mime = DOCX_MIME
+
+    @abc.abstractmethod
+    def iter_paragraphs(self, source) -> Iterator[str]:
+        pass
+
+    def extract(self, source, max_pages, max_chars, parallel):
+        return collect_text(self.iter_paragraphs(source), '\n', max_chars=max_chars)._replace(pages_read=0)
+
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+# Run children with a fixed text equivalent, as python-docx renders them
+RUN_TEXT = {W + 'tab': '\t', W + 'ptab': '\t', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        if child.tag == W + 't':
+            parts.append(child.text or '')
+        elif child.tag == W + 'br':
+            # Page and column breaks carry no text
+            if child.get(W + 'type', 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif child.tag in RUN_TEXT:
+            parts.append(RUN_TEXT[child.tag])
+    return ''.join(parts)
+
+
+def _paragraph_text(paragraph) -> str:
+    parts = []
+    for child in paragraph:
+        if child.tag == W + 'r':
+            parts.append(_run_text(child))
+        elif child.tag == W + 'hyperlink':
+            parts.extend(_run_text(run) for run in child if run.tag == W + 'r')
+    return ''.join(parts)
+
+
+class DocxXmlExtractor(DocxExtractor):
+    """Reads ``word/document.xml`` straight from the zip, skipping python-docx's package model"""
+    name = 'docx-xml'
+    module = 'xml.etree.ElementTree'
+
+    def iter_paragraphs(self, source):
+        from xml.etree import ElementTree
+
+        with _open_binary(source) as f, zipfile.ZipFile(f) as archive:
+            xml = archive.read(DOCX_MAIN_PART)
+        # WordprocessingML never declares a DTD; refusing one rules out entity expansion
+        if b'<!DOCTYPE' in xml:
+            raise ValueError(f"{DOCX_MAIN_PART} declares a DTD")
+        body = ElementTree.fromstring(xml).find(W + 'body')
+        if body is None:
+            return
+        for paragraph in body.iter(W + 'p'):
+            yield _paragraph_text(paragraph)
+
+
+class PythonDocxExtractor(DocxExtractor):
+    name = 'python-docx'
+    module = 'docx'
+
+    def iter_paragraphs(self, source):
+        import docx
+        from docx.oxml.ns import qn
+        from docx.text.paragraph import Paragraph
+
+        with _open_binary(source) as f:
+            document = docx.Document(f)
+        for paragraph in document.element.body.iter(qn('w:p')):
+            yield Paragraph(paragraph, document).text
+
+
+class PlainTextExtractor(TextExtractor):
+    name = 'text'
+    mime = TEXT_MIME
+    module = 'codecs'
+
+    def iter_chunks(self, source) -> Iterator[str]:
+        with _open_binary(source) as f:
+            # Universal newlines, as open(path, 'r') gave; detached so an upload stays open
+            reader = io.TextIOWrapper(f, encoding='utf-8')
+            try:
+                while True:
+                    chunk = reader.read(TXT_READ_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+            finally:
+                reader.detach()
+
+    def extract(self, source, max_pages, max_chars, parallel):
+        return collect_text(self.iter_chunks(source), '', max_chars=max_chars)._replace(pages_read=0)
+
+
+EXTRACTORS: Dict[str, TextExtractor] = {
+    extractor.name: extractor
+    for extractor in (PyMuPdfExtractor(), PyPdf2Extractor(), DocxXmlExtractor(), PythonDocxExtractor(),
+                      PlainTextExtractor())
+}
+# Preferred first; benchmark_text_extractors can reorder them for the local hardware
+DEFAULT_EXTRACTOR_ORDER = {
+    PDF_MIME: ['pymupdf', 'pypdf2'],
+    DOCX_MIME: ['docx-xml', 'python-docx'],
+    TEXT_MIME: ['text'],
+}
+SUPPORTED_RESUME_MIMES = tuple(DEFAULT_EXTRACTOR_ORDER)
+
+
+def registered_extractors(mime: str) -> List[TextExtractor]:
+    return [extractor for extractor in EXTRACTORS.values() if extractor.mime == mime]
+
+
+@lru_cache(maxsize=4)
+def _read_order_file(path: str, mtime: float) -> Dict[str, List[str]]:
+    with open(path) as f:
+        return json.load(f).get('order', {})
+
+
+def configured_extractor_order() -> Dict[str, List[str]]:
+    """
+    Backend order per MIME type: the defaults, overridden per type by the
+    order ``benchmark_text_extractors --write`` stored in
+    RESUME_EXTRACTORS_FILE. The file is re-read when it changes.
+    """
+    order = dict(DEFAULT_EXTRACTOR_ORDER)
+    path = getattr(settings, 'RESUME_EXTRACTORS_FILE', None)
+    if path and os.path.exists(path):
+        try:
+            order.update(_read_order_file(path, os.path.getmtime(path)))
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning("Ignoring extractor order in %s: %s", path, e)
+    return order
+
+
+def extractor_order(mime: str) -> List[TextExtractor]:
+    """
+    Installed backends for ``mime``, preferred first. Registered backends the
+    configured order leaves out are still tried last, as fallbacks.
+    """
+    names = list(configured_extractor_order().get(mime, []))
+    names += [extractor.name for extractor in registered_extractors(mime) if extractor.name not in names]
+    extractors = []
+    for name in names:
+        extractor = EXTRACTORS.get(name)
+        if extractor is None or extractor.mime != mime:
+            logger.warning("Unknown %s text extractor %r", mime, name)
+        elif extractor.available():
+            extractors.append(extractor)
+    return extractors
+
+
+def _extract_pdf_pages_in_worker(task) -> List[str]:
+    """Process-pool entry point: text of pages ``start:stop`` of a PDF given by path or bytes"""
+    backend, source, start, stop = task
+    extractor = EXTRACTORS[backend]
+    document = extractor.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    try:
+        return [extractor.page_text(document, index) for index in range(start, stop)]
+    finally:
+        extractor.close(document)
+
+
+def page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    """Contiguous ``(start, stop)`` ranges, about two per worker so a slow range does not idle the rest"""
+    size = max(MIN_PAGES_PER_TASK, math.ceil(page_count / (workers * 2)))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def iter_pdf_pages_parallel(backend: str, source, page_count: int) -> Iterator[str]:
+    """
+    Text of the first ``page_count`` pages, extracted range by range on the
+    shared process pool; ``pool.map`` returns ranges in submission order, so
+    pages come back in document order. Workers open the file by path when
+    it has one and otherwise receive its bytes.
+    """
+    from .worker_pool import pool_size, run_in_pool
+
+    source = _local_path(source) or _read_bytes(source)
+    tasks = [(backend, source, start, stop) for start, stop in page_ranges(page_count, pool_size())]
+    for pages in run_in_pool(_extract_pdf_pages_in_worker, tasks):
+        yield from pages
+
+
+def use_parallel_pdf_extraction(page_count: int) -> bool:
+    """
+    Whether ``page_count`` pages to read justify the process pool. A pool of
+    one worker only adds IPC to the in-process loop, so it never does.
+    """
+    from .worker_pool import pool_size
+
+    threshold = getattr(settings, 'RESUME_PARALLEL_PDF_PAGES', DEFAULT_PARALLEL_PDF_PAGES)
+    return bool(threshold) and page_count >= threshold and pool_size() > 1
+
+
+def resolve_budget(max_pages: int = None, max_chars: int = None) -> Tuple[int, int]:
+    """``(max_pages, max_chars)`` with unset values taken from settings; 0 means unlimited"""
+    if max_pages is None:
+        max_pages = getattr(settings, 'RESUME_MAX_PAGES', DEFAULT_MAX_PAGES)
+    if max_chars is None:
+        max_chars = getattr(settings, 'RESUME_MAX_CHARS', DEFAULT_MAX_CHARS)
+    return max_pages or 0, max_chars or 0
+
+
+def extract_text(source, name: str, max_pages: int = None, max_chars: int = None,
+                 parallel: bool = None, mime: str = None) -> ExtractedText:
+    """
+    Text of the resume in ``source`` (a path or a seekable binary file),
+    bounded by ``max_pages`` PDF pages and ``max_chars`` characters.
+    Defaults come from RESUME_MAX_PAGES / RESUME_MAX_CHARS. The format is
+    sniffed from the content unless ``mime`` is given; ``name`` is only
+    used in messages.
+
+    Each backend for the format is tried in turn until one succeeds (see
+    ``extractor_order``); the result records which one did. PDFs with at
+    least RESUME_PARALLEL_PDF_PAGES pages to read (within the page budget)
+    are split into page ranges extracted on the process pool when it has
+    more than one worker (``parallel`` forces either mode).
+    Raises ValueError for unsupported content.
+    """
+    if mime is None:
+        mime = sniff_path(source) if isinstance(source, str) else sniff_mime(source)
+    extractors = extractor_order(mime) if mime in SUPPORTED_RESUME_MIMES else []
+    if not extractors:
+        raise ValueError(f"Unsupported file type: {name}")
+
+    max_pages, max_chars = resolve_budget(max_pages, max_chars)
+    # 0 disables a budget
+    max_pages, max_chars = max_pages or None, max_chars or None
+
+    for position, extractor in enumerate(extractors):
+        try:
+            result = extractor.extract(source, max_pages, max_chars, parallel)
+        except Exception as e:
+            if position == len(extractors) - 1:
+                raise
+            logger.warning("%s could not extract %s (%s); falling back to %s",
+                           extractor.name, name, e, extractors[position + 1].name)
+            continue
+        break
+
+    if result.truncated:
+        logger.info("Truncated %s by %s budget after %d pages / %d characters",
+                    name, result.truncated_by, result.pages_read, len(result.text))
+    return result._replace(mime=mime, backend=extractor.name)
+
+
+def extract_resume_text(resume_file, max_pages: int = None, max_chars: int = None,
+                        parallel: bool = None, mime: str = None) -> ExtractedText:
+    """
+    Bounded text extraction from an uploaded PDF, DOCX or TXT resume, read
+    straight from the upload (in memory, or the file Django spooled it to).
+    The format is sniffed from the content unless ``mime`` is given.
+    Raises ValueError for unsupported content.
+    """
+    return extract_text(resume_file, resume_file.name, max_pages, max_chars, parallel, mime)
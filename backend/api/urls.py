@@ -2,7 +2,10 @@ from django.urls import path
 from . import views
 from .news_views import get_tech_news, get_news_categories, get_category_news
 from .resume_views import gemini_chat
-from .analysis_core import ResumeAnalysisView, UserResumeAnalysesView
+from .analysis_core import AnalysisJobStatusView, ResumeAnalysisView, UserResumeAnalysesView
+from .analysis_stream_views import analysis_job_events
+from .job_matching_views import JobDescriptionListCreateView, JobDescriptionDetailView, JobMatchView, CandidateSearchView
+from .metrics_views import AnalysisMetricsView
 
 urlpatterns = [
     # Authentication endpoints
@@ -30,7 +33,18 @@ urlpatterns = [
     
     # Resume Analysis endpoints
     path('resume/analyze/', ResumeAnalysisView.as_view(), name='resume_analyze'),
+    path('resume/analyze/jobs/<uuid:job_id>/', AnalysisJobStatusView.as_view(), name='resume_analysis_job'),
+    path('resume/analyze/jobs/<uuid:job_id>/events/', analysis_job_events, name='resume_analysis_job_events'),
     path('resume/analyses/', UserResumeAnalysesView.as_view(), name='user_resume_analyses'),
+    path('resume/match-jobs/', JobMatchView.as_view(), name='resume_match_jobs'),
+    
+    # Job description library endpoints
+    path('jobs/', JobDescriptionListCreateView.as_view(), name='job-description-list'),
+    path('jobs/<int:pk>/', JobDescriptionDetailView.as_view(), name='job-description-detail'),
+    path('candidates/search/', CandidateSearchView.as_view(), name='candidate-search'),
+    
+    # Operational metrics (staff only)
+    path('admin/metrics/analysis/', AnalysisMetricsView.as_view(), name='analysis-metrics'),
     
     # Resume Builder endpoints
     path('resumes/', views.ResumeListCreateView.as_view(), name='resume-list-create'),
@@ -0,0 +1,146 @@
+import heapq
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+def sparse_to_json(row) -> Dict:
+    """Serialize a 1 x dim sparse row into a JSONField-friendly dict"""
+    row = sparse.csr_matrix(row)
+    return {
+        'dim': int(row.shape[1]),
+        'indices': row.indices.tolist(),
+        'data': [round(float(value), 6) for value in row.data],
+    }
+
+
+def sparse_from_json(payload: Dict, dim: int = None) -> sparse.csr_matrix:
+    dim = dim or payload.get('dim', 0)
+    indices = payload.get('indices', [])
+    data = payload.get('data', [])
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), [0, len(indices)]),
+        shape=(1, dim),
+    )
+
+
+class SparseVectorIndex:
+    """
+    Row-stacked sparse TF-IDF vectors keyed by database id.
+
+    Scoring a query against every stored row is one sparse matrix-vector
+    product; rows can be appended or dropped without rebuilding from the
+    database.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.ids: List[int] = []
+        self.matrix = sparse.csr_matrix((0, dim), dtype=np.float32)
+        self._positions: Dict[int, int] = {}
+        self._id_array: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, row_id: int) -> bool:
+        return row_id in self._positions
+
+    def add_many(self, items: Iterable[Tuple[int, sparse.spmatrix]]):
+        new_ids, rows = [], []
+        for row_id, row in items:
+            if row_id in self._positions:
+                self.remove([row_id])
+            new_ids.append(row_id)
+            rows.append(sparse.csr_matrix(row, dtype=np.float32))
+        if not rows:
+            return
+        self.matrix = sparse.vstack([self.matrix] + rows, format='csr')
+        for row_id in new_ids:
+            self._positions[row_id] = len(self.ids)
+            self.ids.append(row_id)
+        self._id_array = None
+
+    def remove(self, row_ids: Iterable[int]):
+        drop = {self._positions[row_id] for row_id in row_ids if row_id in self._positions}
+        if not drop:
+            return
+        keep = [pos for pos in range(len(self.ids)) if pos not in drop]
+        self.matrix = self.matrix[keep]
+        self.ids = [self.ids[pos] for pos in keep]
+        self._positions = {row_id: pos for pos, row_id in enumerate(self.ids)}
+        self._id_array = None
+
+    @property
+    def id_array(self) -> np.ndarray:
+        if self._id_array is None:
+            self._id_array = np.asarray(self.ids, dtype=np.int64)
+        return self._id_array
+
+    def frozen(self) -> 'SparseVectorIndex':
+        """
+        A copy sharing the current matrix, unaffected by later add_many /
+        remove calls on this index (they replace the matrix, never modify it)
+        """
+        copy = SparseVectorIndex(self.dim)
+        copy.matrix = self.matrix
+        copy.ids = list(self.ids)
+        copy._positions = dict(self._positions)
+        copy._id_array = self._id_array
+        return copy
+
+    def scores(self, query) -> np.ndarray:
+        """Dot product of every stored row with ``query`` (rows are L2-normalized, so cosine)"""
+        if not self.ids:
+            return np.zeros(0, dtype=np.float32)
+        query = sparse.csr_matrix(query, dtype=np.float32)
+        return np.asarray((self.matrix @ query.T).todense()).ravel()
+
+    def position(self, row_id: int) -> Optional[int]:
+        return self._positions.get(row_id)
+
+    def save(self, path: str, **meta):
+        """Snapshot to a single .npz so a cold worker does not re-read every row"""
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # A private temp file per writer: workers snapshotting the same index
+        # must not interleave writes before the atomic replace
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    ids=self.id_array,
+                    data=self.matrix.data,
+                    indices=self.matrix.indices,
+                    indptr=self.matrix.indptr,
+                    dim=np.asarray(self.dim),
+                    **{f"meta_{key}": np.asarray(value) for key, value in meta.items()},
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Tuple['SparseVectorIndex', Dict]:
+        with np.load(path, allow_pickle=False) as payload:
+            dim = int(payload['dim'])
+            index = cls(dim)
+            ids = payload['ids'].tolist()
+            index.matrix = sparse.csr_matrix(
+                (payload['data'], payload['indices'], payload['indptr']), shape=(len(ids), dim)
+            )
+            index.ids = ids
+            index._positions = {row_id: pos for pos, row_id in enumerate(ids)}
+            meta = {key[5:]: payload[key].item() for key in payload.files if key.startswith('meta_')}
+        return index, meta
+
+
+def top_k(scores: Sequence[float], k: int, ids: Sequence[int]) -> List[Tuple[float, int]]:
+    """Highest ``k`` (score, id) pairs, ties broken by the larger id (newest first)"""
+    return heapq.nlargest(k, zip(scores, ids))
@@ -14,7 +14,6 @@ from .news_service import NewsService
 import logging
 from django.contrib.auth import authenticate, login, logout
 from django.middleware.csrf import get_token
-from .resume_generator import ResumeGenerator
 from django.http import FileResponse, HttpResponse
 import tempfile
 import os
@@ -301,7 +300,8 @@ def generate_and_store_resumes(request):
         # Prepare data for generator
         processed_data = _prepare_resume_data_for_generator(resume_data)
         
-        # Generate resumes
+        # Generate resumes (the DOCX/PDF/image stack loads on first use)
+        from .resume_generator import ResumeGenerator
         generator = ResumeGenerator(processed_data)
         templates_data = generator.generate_all_templates()
         
@@ -501,6 +501,7 @@ def download_resume(request, template_name):
             resume_data = dict(request.GET.items())
         
         processed_data = _prepare_resume_data_for_generator(resume_data)
+        from .resume_generator import ResumeGenerator
         generator = ResumeGenerator(processed_data)
         
         if template_name == 'modern':
@@ -0,0 +1,64 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool_size() -> int:
+    configured = getattr(settings, 'ANALYSIS_POOL_WORKERS', 0)
+    if configured:
+        return max(1, int(configured))
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Bounded process pool shared by every request in this worker.
+
+    Workers are started lazily on first use and reused afterwards, so CPU
+    heavy fan-out (batch parsing, PDF page extraction) does not pay process
+    start-up per request. ``spawn`` is the default start method because
+    forking a threaded WSGI/ASGI server is unsafe.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                method = getattr(settings, 'ANALYSIS_POOL_START_METHOD', 'spawn')
+                _pool = ProcessPoolExecutor(
+                    max_workers=pool_size(),
+                    mp_context=multiprocessing.get_context(method),
+                )
+                logger.info("Started analysis process pool (%s workers, %s)", pool_size(), method)
+    return _pool
+
+
+def run_in_pool(fn, items, chunksize: int = 1):
+    """``pool.map`` that transparently restarts a pool whose workers died"""
+    try:
+        return list(get_process_pool().map(fn, items, chunksize=chunksize))
+    except BrokenProcessPool:
+        logger.warning("Analysis process pool broke; restarting it")
+        shutdown_process_pool()
+        return list(get_process_pool().map(fn, items, chunksize=chunksize))
+
+
+def shutdown_process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown_process_pool)
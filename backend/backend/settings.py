@@ -151,5 +151,77 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Resume analysis model artifacts (clf.pkl, tfidf.pkl, encoder.pkl and an
+# optional manifest.json with sha256 checksums and a version string)
+RESUME_MODEL_DIR = os.getenv('RESUME_MODEL_DIR', str(BASE_DIR / 'api'))
+RESUME_MODEL_STRICT = os.getenv('RESUME_MODEL_STRICT', 'False') == 'True'
+# Memory-map the .arrays exports (manage.py export_model_arrays) instead of unpickling
+RESUME_MODEL_MMAP = os.getenv('RESUME_MODEL_MMAP', 'True') == 'True'
+# Upload text extraction budget: PDF pages and characters read (0 = unlimited)
+RESUME_MAX_PAGES = int(os.getenv('RESUME_MAX_PAGES', '20'))
+RESUME_MAX_CHARS = int(os.getenv('RESUME_MAX_CHARS', '100000'))
+# PDFs with at least this many pages to read are extracted on the process pool when it has
+# more than one worker (0 = never). Pages to read are capped by RESUME_MAX_PAGES, so a
+# threshold above it never applies: raise both for long documents
+RESUME_PARALLEL_PDF_PAGES = int(os.getenv('RESUME_PARALLEL_PDF_PAGES', '16'))
+# Extracted text kept per upload hash, budget and backend order (database rows, LRU; 0 disables)
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv('EXTRACTION_CACHE_MAX_ENTRIES', '500'))
+# Text extraction backend order per format, written by benchmark_text_extractors --write
+RESUME_EXTRACTORS_FILE = os.getenv('RESUME_EXTRACTORS_FILE', str(BASE_DIR / 'text_extractors.json'))
+# Role -> keywords table behind the keyword-based role prediction fallback
+ROLE_KEYWORDS_FILE = os.getenv('ROLE_KEYWORDS_FILE', str(BASE_DIR / 'api' / 'data' / 'role_keywords.json'))
+
+# Per-owner candidate search index snapshots (sparse resume vectors)
+CANDIDATE_INDEX_DIR = os.getenv('CANDIDATE_INDEX_DIR', str(BASE_DIR / 'indexes'))
+# Seconds between checks for deleted analyses (a COUNT query) when a search refreshes an index
+CANDIDATE_INDEX_DELETE_CHECK_SECONDS = float(os.getenv('CANDIDATE_INDEX_DELETE_CHECK_SECONDS', '30'))
+
+# Shared process pool for CPU-bound fan-out (batch parsing, PDF pages); 0 = auto
+ANALYSIS_POOL_WORKERS = int(os.getenv('ANALYSIS_POOL_WORKERS', '0'))
+ANALYSIS_POOL_START_METHOD = os.getenv('ANALYSIS_POOL_START_METHOD', 'spawn')
+
+# Job-mode analyses (POST /api/resume/analyze/ with async=1), run by manage.py run_analysis_workers:
+# worker processes (0 = auto), queue poll interval, seconds without progress before a running
+# job counts as abandoned, and runs allowed per job
+ANALYSIS_JOB_WORKERS = int(os.getenv('ANALYSIS_JOB_WORKERS', '0'))
+ANALYSIS_JOB_POLL_INTERVAL = float(os.getenv('ANALYSIS_JOB_POLL_INTERVAL', '1.0'))
+ANALYSIS_JOB_TIMEOUT = int(os.getenv('ANALYSIS_JOB_TIMEOUT', '600'))
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.getenv('ANALYSIS_JOB_MAX_ATTEMPTS', '2'))
+
+# Job progress stream (GET /api/resume/analyze/jobs/<id>/events/, served under ASGI): seconds
+# between checks for new events, between keep-alive comments, and before a connection is
+# closed for the client to reconnect
+ANALYSIS_EVENTS_POLL_INTERVAL = float(os.getenv('ANALYSIS_EVENTS_POLL_INTERVAL', '0.5'))
+ANALYSIS_EVENTS_HEARTBEAT = float(os.getenv('ANALYSIS_EVENTS_HEARTBEAT', '15'))
+ANALYSIS_EVENTS_MAX_DURATION = float(os.getenv('ANALYSIS_EVENTS_MAX_DURATION', '300'))
+# Seconds a finished job's progress events (partial resume data) are kept for open streams
+ANALYSIS_EVENTS_RETENTION = int(os.getenv('ANALYSIS_EVENTS_RETENTION', '60'))
+# Lifetime in seconds of the job-scoped token in a job's events_url (clients refetch the status for a new one)
+ANALYSIS_STREAM_TOKEN_MAX_AGE = int(os.getenv('ANALYSIS_STREAM_TOKEN_MAX_AGE', '600'))
+
+# Regex extraction: per-extractor time budget per resume, and pattern mode
+# ('auto' = original patterns, linear-time ones for text without line
+# structure or after a budget hit; 'linear'; 'full')
+EXTRACTION_BUDGET_MS = int(os.getenv('EXTRACTION_BUDGET_MS', '250'))
+EXTRACTION_REGEX_MODE = os.getenv('EXTRACTION_REGEX_MODE', 'auto')
+
+# Completed analyses keyed on (model_version, resume sha256, job description sha256).
+# 'default' keeps Django's usual per-process LocMem cache used by the news views.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'analysis': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'resume-analysis',
+        'TIMEOUT': int(os.getenv('ANALYSIS_CACHE_TIMEOUT', str(7 * 24 * 3600))),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('ANALYSIS_CACHE_MAX_ENTRIES', '2000')),
+            'CULL_FREQUENCY': 4,
+        },
+    },
+}
+
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOWS_CREDENTIALS = True
\ No newline at end of file